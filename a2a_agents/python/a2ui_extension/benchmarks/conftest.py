@@ -0,0 +1,129 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+SPECIFICATION_DIR = Path(__file__).resolve().parents[4] / "specification"
+
+SURFACE_SIZES = [10, 1_000, 10_000]
+
+
+def load_spec_schema(version: str, name: str) -> dict:
+    """Loads a JSON schema from the specification directory."""
+    with open(SPECIFICATION_DIR / version / "json" / name) as f:
+        return json.load(f)
+
+
+def build_v08_messages(count: int) -> list[dict]:
+    """Builds a 0.8 surface of `count` components: a column of text rows."""
+    rows = max(1, (count - 1) // 3)
+    components = [
+        {
+            "id": "root",
+            "component": {
+                "Column": {
+                    "children": {"explicitList": [f"row-{i}" for i in range(rows)]}
+                }
+            },
+        }
+    ]
+    for i in range(rows):
+        components += [
+            {
+                "id": f"row-{i}",
+                "component": {
+                    "Row": {
+                        "children": {"explicitList": [f"label-{i}", f"value-{i}"]},
+                        "distribution": "spaceBetween",
+                    }
+                },
+            },
+            {
+                "id": f"label-{i}",
+                "component": {
+                    "Text": {"text": {"path": f"/items/{i}/label"}, "usageHint": "h4"}
+                },
+            },
+            {
+                "id": f"value-{i}",
+                "component": {"Text": {"text": {"literalString": f"Value {i}"}}},
+            },
+        ]
+    return [
+        {"beginRendering": {"surfaceId": "bench", "root": "root"}},
+        {"surfaceUpdate": {"surfaceId": "bench", "components": components}},
+        {
+            "dataModelUpdate": {
+                "surfaceId": "bench",
+                "path": "/",
+                "contents": [{"key": "title", "valueString": "Benchmark"}],
+            }
+        },
+    ]
+
+
+def build_v09_messages(count: int) -> list[dict]:
+    """Builds the 0.9 equivalent of `build_v08_messages`."""
+    rows = max(1, (count - 1) // 3)
+    components = [
+        {
+            "id": "root",
+            "component": "Column",
+            "children": [f"row-{i}" for i in range(rows)],
+        }
+    ]
+    for i in range(rows):
+        components += [
+            {
+                "id": f"row-{i}",
+                "component": "Row",
+                "children": [f"label-{i}", f"value-{i}"],
+                "distribution": "spaceBetween",
+            },
+            {
+                "id": f"label-{i}",
+                "component": "Text",
+                "text": {"path": f"/items/{i}/label"},
+                "usageHint": "h4",
+            },
+            {"id": f"value-{i}", "component": "Text", "text": f"Value {i}"},
+        ]
+    return [
+        {
+            "createSurface": {
+                "surfaceId": "bench",
+                "catalogId": "https://a2ui.dev/specification/0.9/standard_catalog_definition.json",
+            }
+        },
+        {"updateComponents": {"surfaceId": "bench", "components": components}},
+    ]
+
+
+def build_llm_response(count: int) -> str:
+    """Builds an LLM-style response: text, the delimiter and a fenced JSON list."""
+    return (
+        "Here is the dashboard you asked for.\n---a2ui_JSON---\n```json\n"
+        + json.dumps(build_v08_messages(count), indent=2)
+        + "\n```"
+    )
+
+
+@pytest.fixture(params=SURFACE_SIZES, ids=lambda count: f"{count}_components")
+def surface_size(request) -> int:
+    return request.param
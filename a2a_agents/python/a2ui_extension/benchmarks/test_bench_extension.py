@@ -0,0 +1,104 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pydantic
+import pytest
+from a2a.types import Part
+from conftest import build_v08_messages
+
+from a2ui import a2ui_extension, compact_encoding
+
+MIME_TYPES = [a2ui_extension.A2UI_MIME_TYPE]
+if compact_encoding.is_compact_encoding_available():
+    MIME_TYPES.append(a2ui_extension.A2UI_COMPACT_MIME_TYPE)
+
+
+@pytest.fixture(params=MIME_TYPES)
+def mime_type(request) -> str:
+    return request.param
+
+
+@pytest.fixture
+def surface_update(surface_size):
+    return build_v08_messages(surface_size)[1]
+
+
+def test_create_a2ui_part(benchmark, surface_update, mime_type):
+    benchmark.group = "create_a2ui_part"
+
+    part = benchmark(a2ui_extension.create_a2ui_part, surface_update, mime_type)
+
+    assert a2ui_extension.is_a2ui_part(part)
+
+
+def test_is_a2ui_part(benchmark, surface_update, mime_type):
+    benchmark.group = "is_a2ui_part"
+    part = a2ui_extension.create_a2ui_part(surface_update, mime_type)
+
+    assert benchmark(a2ui_extension.is_a2ui_part, part)
+
+
+def test_get_a2ui_datapart(benchmark, surface_update, mime_type):
+    benchmark.group = "get_a2ui_datapart"
+    part = a2ui_extension.create_a2ui_part(surface_update, mime_type)
+
+    data_part = benchmark(a2ui_extension.get_a2ui_datapart, part)
+
+    assert data_part.data == surface_update
+
+
+def test_part_json_round_trip(benchmark, surface_update, mime_type):
+    """Serializes a part as it is sent over A2A and parses it back."""
+    benchmark.group = "part_json_round_trip"
+    part = a2ui_extension.create_a2ui_part(surface_update, mime_type)
+
+    def round_trip():
+        return a2ui_extension.get_a2ui_datapart(
+            type(part).model_validate_json(part.model_dump_json())
+        )
+
+    assert benchmark(round_trip).data == surface_update
+
+
+@pytest.fixture(params=[1_000, 10_000, 100_000], ids=lambda size: f"{size}_chars")
+def prose(request) -> str:
+    sentence = "The restaurant has great reviews and is open until ten tonight. "
+    return (sentence * (request.param // len(sentence) + 1))[: request.param]
+
+
+def test_parse_a2ui_part_json_prose(benchmark, prose):
+    """Rejects ordinary LLM text mixed in with serialized A2UI parts."""
+    benchmark.group = "parse_a2ui_part_json_prose"
+
+    assert benchmark(a2ui_extension.parse_a2ui_part_json, prose) is None
+
+
+def test_model_validate_json_prose(benchmark, prose):
+    """Baseline for `test_parse_a2ui_part_json_prose`: always validating."""
+    benchmark.group = "parse_a2ui_part_json_prose"
+
+    def validate():
+        try:
+            return Part.model_validate_json(prose)
+        except pydantic.ValidationError:
+            return None
+
+    assert benchmark(validate) is None
+
+
+def test_parse_a2ui_part_json(benchmark, surface_update):
+    benchmark.group = "parse_a2ui_part_json"
+    text = a2ui_extension.create_a2ui_part(surface_update).model_dump_json()
+
+    assert benchmark(a2ui_extension.parse_a2ui_part_json, text) is not None
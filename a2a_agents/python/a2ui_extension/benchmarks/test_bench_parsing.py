@@ -0,0 +1,69 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from conftest import build_llm_response
+
+from a2ui.json_repair import JsonRepairer
+from a2ui.response_assembler import A2uiResponseAssembler
+from a2ui.stream_parser import A2UI_JSON_DELIMITER, A2uiStreamParser, parse_a2ui_response
+
+# Roughly the size of a streamed LLM token batch.
+CHUNK_SIZE = 64
+
+
+def test_parse_a2ui_response(benchmark, surface_size):
+    benchmark.group = "parse_a2ui_response"
+    content = build_llm_response(surface_size)
+
+    _, messages = benchmark(parse_a2ui_response, content)
+
+    assert len(messages) == 3
+
+
+def test_stream_parser_chunked(benchmark, surface_size):
+    benchmark.group = "stream_parser_chunked"
+    content = build_llm_response(surface_size)
+    chunks = [
+        content[i : i + CHUNK_SIZE] for i in range(0, len(content), CHUNK_SIZE)
+    ]
+
+    def parse_stream():
+        parser = A2uiStreamParser()
+        items = []
+        for chunk in chunks:
+            items += parser.feed(chunk)
+        return items + parser.close()
+
+    items = benchmark(parse_stream)
+
+    assert sum(isinstance(item, dict) for item in items) == 3
+
+
+def test_json_repairer_valid_json(benchmark, surface_size):
+    benchmark.group = "json_repairer_valid_json"
+    json_string = build_llm_response(surface_size).split(A2UI_JSON_DELIMITER, 1)[1]
+    repairer = JsonRepairer()
+
+    _, fixes = benchmark(repairer.parse, json_string, expect_array=True)
+
+    assert fixes == []
+
+
+def test_response_assembler_finish(benchmark, surface_size):
+    benchmark.group = "response_assembler_finish"
+    content = build_llm_response(surface_size)
+
+    parts = benchmark(lambda: A2uiResponseAssembler().finish(content))
+
+    assert len(parts) == 4
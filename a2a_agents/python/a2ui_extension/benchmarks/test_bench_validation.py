@@ -0,0 +1,68 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import referencing
+from conftest import build_v08_messages, build_v09_messages, load_spec_schema
+
+from a2ui.integrity import find_integrity_errors
+from a2ui.validator import A2uiValidator
+
+
+@pytest.fixture(scope="module")
+def v08_validator() -> A2uiValidator:
+    return A2uiValidator(
+        load_spec_schema("0.8", "server_to_client_with_standard_catalog.json"),
+        as_array=True,
+    )
+
+
+@pytest.fixture(scope="module")
+def v09_validator() -> A2uiValidator:
+    schemas = [
+        load_spec_schema("0.9", name)
+        for name in (
+            "server_to_client.json",
+            "standard_catalog_definition.json",
+            "common_types.json",
+        )
+    ]
+    registry = referencing.Registry().with_resources(
+        (schema["$id"], referencing.Resource.from_contents(schema))
+        for schema in schemas
+    )
+    return A2uiValidator(schemas[0], as_array=True, registry=registry)
+
+
+def test_validate_v08(benchmark, v08_validator, surface_size):
+    benchmark.group = "validate_v08"
+    messages = build_v08_messages(surface_size)
+
+    benchmark(v08_validator.validate, messages)
+
+
+def test_validate_v09(benchmark, v09_validator, surface_size):
+    benchmark.group = "validate_v09"
+    messages = build_v09_messages(surface_size)
+
+    # 0.9 validation takes milliseconds per component, so large surfaces are
+    # measured over a fixed number of rounds rather than calibrated ones.
+    benchmark.pedantic(v09_validator.validate, args=(messages,), rounds=3)
+
+
+def test_integrity_v08(benchmark, surface_size):
+    benchmark.group = "integrity_v08"
+    messages = build_v08_messages(surface_size)
+
+    assert benchmark(find_integrity_errors, messages) == []
@@ -12,11 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
+import binascii
 import logging
 from typing import Any, Optional
 
+import pydantic
 from a2a.server.agent_execution import RequestContext
-from a2a.types import AgentExtension, Part, DataPart
+from a2a.types import AgentExtension, Part, DataPart, FilePart, FileWithBytes
+
+from . import compact_encoding
 
 logger = logging.getLogger(__name__)
 
@@ -24,22 +29,45 @@ A2UI_EXTENSION_URI = "https://a2ui.org/a2a-extension/a2ui/v0.8"
 
 MIME_TYPE_KEY = "mimeType"
 A2UI_MIME_TYPE = "application/json+a2ui"
+# A2UI messages encoded by `compact_encoding`, sent as base64 FilePart bytes.
+A2UI_COMPACT_MIME_TYPE = "application/msgpack+a2ui"
 
 A2UI_CLIENT_CAPABILITIES_KEY = "a2uiClientCapabilities"
 SUPPORTED_CATALOG_IDS_KEY = "supportedCatalogIds"
 INLINE_CATALOGS_KEY = "inlineCatalogs"
+SUPPORTED_MIME_TYPES_KEY = "supportedMimeTypes"
 
 STANDARD_CATALOG_ID = "https://raw.githubusercontent.com/google/A2UI/refs/heads/main/specification/0.8/json/standard_catalog_definition.json"
 
-def create_a2ui_part(a2ui_data: dict[str, Any]) -> Part:
+def create_a2ui_part(
+    a2ui_data: dict[str, Any], mime_type: str = A2UI_MIME_TYPE
+) -> Part:
     """Creates an A2A Part containing A2UI data.
 
     Args:
         a2ui_data: The A2UI data dictionary.
+        mime_type: The encoding to use, negotiated with
+            `get_a2ui_mime_type`. `A2UI_COMPACT_MIME_TYPE` sends the data as
+            compact binary in a FilePart.
 
     Returns:
-        An A2A Part with a DataPart containing the A2UI data.
+        An A2A Part with a DataPart containing the A2UI data, or a FilePart
+        with the encoded data.
     """
+    if mime_type == A2UI_COMPACT_MIME_TYPE:
+        encoded = compact_encoding.encode_compact(a2ui_data)
+        return Part(
+            root=FilePart(
+                file=FileWithBytes(
+                    bytes=base64.b64encode(encoded).decode("ascii"),
+                    mime_type=A2UI_COMPACT_MIME_TYPE,
+                ),
+                metadata={
+                    MIME_TYPE_KEY: A2UI_COMPACT_MIME_TYPE,
+                },
+            )
+        )
+
     return Part(
         root=DataPart(
             data=a2ui_data,
@@ -57,29 +85,104 @@ def is_a2ui_part(part: Part) -> bool:
         part: The A2A Part to check.
 
     Returns:
-        True if the part contains A2UI data, False otherwise.
+        True if the part contains A2UI data in any supported encoding, False
+        otherwise.
     """
-    return (
-        isinstance(part.root, DataPart)
-        and part.root.metadata
-        and part.root.metadata.get(MIME_TYPE_KEY) == A2UI_MIME_TYPE
-    )
+    return _is_json_a2ui_part(part) or _is_compact_a2ui_part(part)
 
 
 def get_a2ui_datapart(part: Part) -> Optional[DataPart]:
     """Extracts the DataPart containing A2UI data from an A2A Part, if present.
 
+    Compact encoded parts are decoded into an equivalent JSON DataPart.
+
     Args:
         part: The A2A Part to extract A2UI data from.
 
     Returns:
         The DataPart containing A2UI data if present, None otherwise.
+
+    Raises:
+        ValueError: If a compact encoded part cannot be decoded.
     """
-    if is_a2ui_part(part):
+    if _is_json_a2ui_part(part):
         return part.root
+    if _is_compact_a2ui_part(part):
+        try:
+            encoded = base64.b64decode(part.root.file.bytes, validate=True)
+        except binascii.Error as e:
+            raise ValueError(f"Invalid compact A2UI part: {e}") from e
+        return DataPart(
+            data=compact_encoding.decode_compact(encoded),
+            metadata={**part.root.metadata, MIME_TYPE_KEY: A2UI_MIME_TYPE},
+        )
     return None
 
 
+def parse_a2ui_part_json(text: str) -> Optional[Part]:
+    """Parses an A2UI part that was serialized to JSON with `model_dump_json`.
+
+    Bridges that can only carry text, such as ADK events, serialize A2UI parts
+    this way and mix them with ordinary text. Text that does not look like a
+    JSON object is rejected without being parsed, so ordinary text costs a
+    constant-time check rather than a failed validation.
+
+    Args:
+        text: The text to parse.
+
+    Returns:
+        The A2UI part, or None if the text is not a serialized A2UI part.
+    """
+    if not (text.startswith("{") and text.endswith("}")):
+        return None
+    try:
+        part = Part.model_validate_json(text)
+    except pydantic.ValidationError:
+        return None
+    return part if is_a2ui_part(part) else None
+
+
+def get_a2ui_mime_type(client_capabilities: Optional[dict[str, Any]]) -> str:
+    """Chooses the encoding for A2UI parts sent to a client.
+
+    Clients opt into the compact encoding by listing `A2UI_COMPACT_MIME_TYPE`
+    in `supportedMimeTypes` of their `a2uiClientCapabilities`. It is only used
+    if the optional `msgpack` dependency is installed.
+
+    Args:
+        client_capabilities: The `a2uiClientCapabilities` from the message
+            metadata, if any.
+
+    Returns:
+        `A2UI_COMPACT_MIME_TYPE` if negotiated, `A2UI_MIME_TYPE` otherwise.
+    """
+    supported_mime_types = (client_capabilities or {}).get(
+        SUPPORTED_MIME_TYPES_KEY
+    ) or []
+    if (
+        A2UI_COMPACT_MIME_TYPE in supported_mime_types
+        and compact_encoding.is_compact_encoding_available()
+    ):
+        return A2UI_COMPACT_MIME_TYPE
+    return A2UI_MIME_TYPE
+
+
+def _is_json_a2ui_part(part: Part) -> bool:
+    return bool(
+        isinstance(part.root, DataPart)
+        and part.root.metadata
+        and part.root.metadata.get(MIME_TYPE_KEY) == A2UI_MIME_TYPE
+    )
+
+
+def _is_compact_a2ui_part(part: Part) -> bool:
+    return (
+        isinstance(part.root, FilePart)
+        and isinstance(part.root.file, FileWithBytes)
+        and part.root.file.mime_type == A2UI_COMPACT_MIME_TYPE
+    )
+
+
 def get_a2ui_agent_extension(
     accepts_inline_custom_catalog: bool = False,
 ) -> AgentExtension:
@@ -0,0 +1,134 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import zlib
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # Optional dependency, installed with the `compact` extra.
+    msgpack = None
+
+# The first byte of every payload. Bump it whenever the dictionary changes.
+FORMAT_VERSION = 1
+
+# The largest decompressed payload `decode_compact` accepts. Deflate shrinks
+# repetitive data by up to ~1000x, so the input size alone doesn't bound it.
+MAX_DECODED_BYTES = 32 * 1024 * 1024
+
+# Strings that appear in almost every A2UI 0.8 message: message and component
+# property names from the standard catalog, and common enum values. They prime
+# the compressor, so their first occurrence in a message is already cheap.
+# Later entries are cheaper to reference, so the most common strings come last.
+# This tuple is part of the wire format and must never change within a
+# `FORMAT_VERSION`.
+KEY_DICTIONARY = (
+    "h1", "h2", "h3", "h4", "h5", "caption", "body",
+    "start", "center", "end", "stretch", "spaceBetween", "spaceAround",
+    "spaceEvenly", "horizontal", "vertical",
+    "beginRendering", "deleteSurface", "styles", "font", "primaryColor",
+    "Image", "Icon", "Video", "AudioPlayer", "List", "Tabs", "Divider",
+    "Modal", "CheckBox", "TextField", "DateTimeInput", "MultipleChoice",
+    "Slider", "url", "fit", "name", "description", "direction", "tabItems",
+    "title", "axis", "entryPointChild", "contentChild", "primary", "label",
+    "textFieldType", "validationRegexp", "enableDate", "enableTime",
+    "selections", "options", "maxAllowedSelections", "literalArray",
+    "minValue", "maxValue", "action", "context", "value", "literalNumber",
+    "literalBoolean", "template", "componentId", "dataBinding", "weight",
+    "distribution", "alignment", "child", "Button", "Card", "Row", "Column",
+    "Text", "usageHint", "dataModelUpdate", "contents", "valueMap",
+    "valueBoolean", "valueNumber", "valueString", "key", "path",
+    "literalString", "text", "explicitList", "children", "surfaceUpdate",
+    "surfaceId", "root", "components", "component", "id",
+)
+
+_PRESET_DICTIONARY = b"".join(
+    bytes([0xA0 | len(word)]) + word.encode() for word in KEY_DICTIONARY
+)
+
+
+def is_compact_encoding_available() -> bool:
+    """Returns whether the optional `msgpack` dependency is installed."""
+    return msgpack is not None
+
+
+def encode_compact(message: dict[str, Any]) -> bytes:
+    """Encodes an A2UI message as compressed MessagePack.
+
+    The payload is a `FORMAT_VERSION` byte followed by the MessagePack
+    encoding of the message, deflated with `KEY_DICTIONARY` as the preset
+    dictionary. Both steps run in C, so encoding is faster than `json.dumps`,
+    and large `surfaceUpdate` messages shrink by an order of magnitude.
+
+    Args:
+        message: The A2UI message.
+
+    Returns:
+        The encoded message.
+
+    Raises:
+        ImportError: If `msgpack` is not installed.
+    """
+    _require_msgpack()
+    compressor = zlib.compressobj(level=1, zdict=_PRESET_DICTIONARY)
+    return (
+        bytes([FORMAT_VERSION])
+        + compressor.compress(msgpack.packb(message))
+        + compressor.flush()
+    )
+
+
+def decode_compact(data: bytes) -> dict[str, Any]:
+    """Decodes an A2UI message encoded by `encode_compact`.
+
+    Args:
+        data: The encoded message.
+
+    Returns:
+        The A2UI message.
+
+    Raises:
+        ImportError: If `msgpack` is not installed.
+        ValueError: If the data is not a valid encoded A2UI message, or it
+            decompresses to more than `MAX_DECODED_BYTES`.
+    """
+    _require_msgpack()
+    if not data or data[0] != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported compact A2UI format version: {data[:1].hex() or 'empty'}."
+        )
+    try:
+        decompressor = zlib.decompressobj(zdict=_PRESET_DICTIONARY)
+        # One byte over the limit tells an oversized payload from one that fits exactly.
+        packed = decompressor.decompress(data[1:], MAX_DECODED_BYTES + 1)
+        if decompressor.unconsumed_tail or len(packed) > MAX_DECODED_BYTES:
+            raise ValueError(
+                f"Compact A2UI message decompresses to more than {MAX_DECODED_BYTES} bytes."
+            )
+        if not decompressor.eof:
+            raise ValueError("Compact A2UI message is truncated.")
+        message = msgpack.unpackb(packed)
+    except (zlib.error, msgpack.UnpackException, ValueError) as e:
+        raise ValueError(f"Invalid compact A2UI message: {e}") from e
+    if not isinstance(message, dict):
+        raise ValueError("Compact A2UI message is not an object.")
+    return message
+
+
+def _require_msgpack() -> None:
+    if msgpack is None:
+        raise ImportError(
+            "The compact A2UI encoding requires msgpack. "
+            "Install it with `pip install a2ui[compact]`."
+        )
@@ -0,0 +1,294 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from collections import OrderedDict
+from typing import Any, Optional, Union
+
+from .surface_state import DEFAULT_MAX_CONTEXTS
+
+logger = logging.getLogger(__name__)
+
+VALUE_MAP_KEY = "valueMap"
+# The key used to set a primitive value directly at a dataModelUpdate path.
+SELF_KEY = "."
+
+DEFAULT_REPLACE_RATIO = 0.5
+
+# A primitive is stored with its typed value key (e.g. "valueString") so it can
+# be encoded again exactly as the LLM wrote it.
+Leaf = tuple[str, Any]
+Node = Union[dict[str, "Node"], Leaf]
+
+
+def decode_contents(contents: list[dict[str, Any]]) -> Node:
+    """Decodes `dataModelUpdate.contents` into a tree.
+
+    Args:
+        contents: The typed adjacency list, e.g.
+            `[{"key": "title", "valueString": "Hi"}, {"key": "items", "valueMap": [...]}]`.
+
+    Returns:
+        A dict for maps, keyed in entry order, or a `(value_key, value)` tuple for
+        the `[{"key": ".", "valueString": ...}]` primitive-at-path form.
+    """
+    if len(contents) == 1 and contents[0].get("key") == SELF_KEY:
+        node = _decode_entry(contents[0])
+        if node is not None:
+            return node
+
+    decoded: dict[str, Node] = {}
+    for entry in contents:
+        key = entry.get("key")
+        node = _decode_entry(entry)
+        if key is not None and node is not None:
+            decoded[key] = node
+    return decoded
+
+
+def encode_contents(node: Node) -> list[dict[str, Any]]:
+    """Encodes a tree from `decode_contents` back into `contents`."""
+    if isinstance(node, tuple):
+        return [_encode_entry(SELF_KEY, node)]
+    return [_encode_entry(key, child) for key, child in node.items()]
+
+
+def _decode_entry(entry: dict[str, Any]) -> Optional[Node]:
+    # Matches the client, which uses the first property starting with "value".
+    value_key = next((key for key in entry if key.startswith("value")), None)
+    if value_key is None:
+        return None
+    value = entry[value_key]
+    if value_key == VALUE_MAP_KEY and isinstance(value, list):
+        return decode_contents(value) if value else {}
+    return (value_key, value)
+
+
+def _encode_entry(key: str, node: Node) -> dict[str, Any]:
+    if isinstance(node, tuple):
+        value_key, value = node
+        return {"key": key, value_key: value}
+    return {"key": key, VALUE_MAP_KEY: encode_contents(node)}
+
+
+def _path_segments(path: Optional[str]) -> list[str]:
+    return [segment for segment in (path or "/").split("/") if segment]
+
+
+def _is_addressable(key: str) -> bool:
+    # Clients split paths on both "/" and ".", so such keys cannot be targeted.
+    return bool(key) and "/" not in key and "." not in key
+
+
+class DataModelDeltaEngine:
+    """Turns full `dataModelUpdate` messages into narrow, path-scoped updates.
+
+    LLMs rewrite the whole data model at `path: "/"` every turn. The engine keeps
+    the last data model sent for each (context_id, surfaceId) and replaces a new
+    full model with one `dataModelUpdate` per changed subtree, so the client
+    receives O(change) rather than O(model) data.
+
+    A map is replaced as a whole when keys were removed or reordered, because
+    clients cannot delete a single key, or when its entries would need at least
+    `replace_ratio` times as many updates as it has entries, because one message
+    is then cheaper than many.
+
+    Like `SurfaceStateStore`, only use the engine with clients that keep their
+    data model between responses.
+    """
+
+    def __init__(
+        self,
+        max_contexts: int = DEFAULT_MAX_CONTEXTS,
+        replace_ratio: float = DEFAULT_REPLACE_RATIO,
+    ):
+        """Initializes the engine.
+
+        Args:
+            max_contexts: The maximum number of contexts to track. The least
+                recently used context is forgotten when the limit is reached.
+            replace_ratio: The ratio of updates to entries at which a map is
+                replaced in one message instead of updated entry by entry.
+        """
+        self._max_contexts = max_contexts
+        self._replace_ratio = replace_ratio
+        self._contexts: OrderedDict[str, dict[str, Node]] = OrderedDict()
+
+    def diff_messages(
+        self, context_id: str, messages: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Rewrites the `dataModelUpdate`s in a list of A2UI messages.
+
+        Args:
+            context_id: The A2A context the messages are sent in.
+            messages: The A2UI messages, in send order.
+
+        Returns:
+            The messages to send, with each `dataModelUpdate` replaced by zero or
+            more narrower updates.
+        """
+        diffed = []
+        for message in messages:
+            diffed.extend(self.diff_message(context_id, message))
+        return diffed
+
+    def diff_message(
+        self, context_id: str, message: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        """Rewrites a single A2UI message about to be sent to the client.
+
+        The message is recorded as sent, so the result must be delivered to the
+        client.
+
+        Args:
+            context_id: The A2A context the message is sent in.
+            message: The A2UI message.
+
+        Returns:
+            The messages to send in its place. Messages other than
+            `dataModelUpdate` are returned unchanged.
+        """
+        if (delete_surface := message.get("deleteSurface")) is not None:
+            self.forget(context_id, delete_surface.get("surfaceId"))
+            return [message]
+
+        update = message.get("dataModelUpdate")
+        if (
+            update is None
+            or "surfaceId" not in update
+            or not isinstance(update.get("contents"), list)
+        ):
+            return [message]
+
+        surface_id = update["surfaceId"]
+        segments = _path_segments(update.get("path"))
+        new_node = decode_contents(update["contents"])
+        if not segments and isinstance(new_node, tuple):
+            # A primitive cannot be the root of the data model.
+            return [message]
+
+        surfaces = self._get_surfaces(context_id)
+        root = surfaces.get(surface_id)
+        if root is None:
+            if segments:
+                # The rest of the client's data model is unknown.
+                return [message]
+            surfaces[surface_id] = new_node
+            return [message]
+
+        old_node = self._get_node(root, segments)
+        updates: list[tuple[list[str], Node]] = []
+        self._diff(old_node, new_node, segments, updates)
+        surfaces[surface_id] = self._set_node(root, segments, new_node)
+
+        if len(updates) == 1 and updates[0][0] == segments:
+            return [message]
+        logger.info(
+            f"Replaced dataModelUpdate for surface {surface_id} with "
+            f"{len(updates)} path-scoped updates."
+        )
+        return [
+            {
+                "dataModelUpdate": {
+                    "surfaceId": surface_id,
+                    "path": "/" + "/".join(path),
+                    "contents": encode_contents(node),
+                }
+            }
+            for path, node in updates
+        ]
+
+    def forget(self, context_id: str, surface_id: Optional[str] = None) -> None:
+        """Forgets the recorded data models for a context or one of its surfaces.
+
+        Args:
+            context_id: The A2A context.
+            surface_id: The surface to forget. All surfaces in the context are
+                forgotten if not set.
+        """
+        if surface_id is None:
+            self._contexts.pop(context_id, None)
+        elif (surfaces := self._contexts.get(context_id)) is not None:
+            surfaces.pop(surface_id, None)
+
+    def _diff(
+        self,
+        old: Optional[Node],
+        new: Node,
+        path: list[str],
+        updates: list[tuple[list[str], Node]],
+    ) -> None:
+        if old == new:
+            return
+        if (
+            not isinstance(old, dict)
+            or not isinstance(new, dict)
+            or list(new)[: len(old)] != list(old)
+        ):
+            # Type changes, removed keys and reordered keys need a replacement.
+            updates.append((path, new))
+            return
+
+        child_updates: list[tuple[list[str], Node]] = []
+        for key, child in new.items():
+            old_child = old.get(key)
+            if old_child == child:
+                continue
+            if not _is_addressable(key):
+                updates.append((path, new))
+                return
+            self._diff(old_child, child, path + [key], child_updates)
+
+        # The root is never replaced this way; that would resend the whole model.
+        if (
+            path
+            and len(child_updates) > 1
+            and len(child_updates) >= self._replace_ratio * len(new)
+        ):
+            updates.append((path, new))
+        else:
+            updates.extend(child_updates)
+
+    def _get_node(self, root: Node, segments: list[str]) -> Optional[Node]:
+        node: Optional[Node] = root
+        for segment in segments:
+            if not isinstance(node, dict):
+                return None
+            node = node.get(segment)
+        return node
+
+    def _set_node(self, root: Node, segments: list[str], value: Node) -> Node:
+        if not segments:
+            return value
+        # Copy the maps along the path so previously recorded trees are not
+        # mutated; the client creates missing maps the same way.
+        new_root = dict(root) if isinstance(root, dict) else {}
+        parent = new_root
+        for segment in segments[:-1]:
+            child = parent.get(segment)
+            child = dict(child) if isinstance(child, dict) else {}
+            parent[segment] = child
+            parent = child
+        parent[segments[-1]] = value
+        return new_root
+
+    def _get_surfaces(self, context_id: str) -> dict[str, Node]:
+        surfaces = self._contexts.get(context_id)
+        if surfaces is None:
+            surfaces = self._contexts[context_id] = {}
+            while len(self._contexts) > self._max_contexts:
+                self._contexts.popitem(last=False)
+        else:
+            self._contexts.move_to_end(context_id)
+        return surfaces
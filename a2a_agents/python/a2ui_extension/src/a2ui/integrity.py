@@ -0,0 +1,182 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any
+
+_UNVISITED, _VISITING, _VISITED = range(3)
+
+
+class A2uiIntegrityError(ValueError):
+    """Raised when A2UI messages describe a component tree that cannot render."""
+
+    def __init__(self, errors: list[str]):
+        super().__init__(" ".join(errors))
+        self.errors = errors
+
+
+def _collect_references(value: Any, references: list[tuple[str, str]]) -> None:
+    """Collects (kind, component id) references from a component's properties.
+
+    References are `child` and `*Child` IDs (Card, Button, Modal, Tabs),
+    `children.explicitList` IDs, and `children.template.componentId`. Custom
+    catalogs that follow the same naming are covered as well.
+    """
+    if isinstance(value, list):
+        for item in value:
+            _collect_references(item, references)
+        return
+    if not isinstance(value, dict):
+        return
+
+    for key, child in value.items():
+        if isinstance(child, str):
+            if key == "child" or key.endswith("Child"):
+                references.append((key, child))
+        elif key == "explicitList" and isinstance(child, list):
+            references.extend((key, item) for item in child if isinstance(item, str))
+        elif (
+            key == "template"
+            and isinstance(child, dict)
+            and isinstance(child.get("componentId"), str)
+        ):
+            references.append(("template", child["componentId"]))
+        else:
+            _collect_references(child, references)
+
+
+def _find_cycles(surface_id: str, edges: dict[str, list[str]]) -> list[str]:
+    """Finds reference cycles with an iterative depth-first search."""
+    errors = []
+    state = dict.fromkeys(edges, _UNVISITED)
+    for start in edges:
+        if state[start] != _UNVISITED:
+            continue
+        state[start] = _VISITING
+        path = [start]
+        path_index = {start: 0}
+        stack = [iter(edges[start])]
+        while stack:
+            next_id = next(stack[-1], None)
+            if next_id is None:
+                stack.pop()
+                finished = path.pop()
+                del path_index[finished]
+                state[finished] = _VISITED
+                continue
+            next_state = state.get(next_id)
+            if next_state == _UNVISITED:
+                state[next_id] = _VISITING
+                path_index[next_id] = len(path)
+                path.append(next_id)
+                stack.append(iter(edges[next_id]))
+            elif next_state == _VISITING:
+                cycle = path[path_index[next_id] :] + [next_id]
+                errors.append(
+                    f"Component cycle in surface '{surface_id}': {' -> '.join(cycle)}."
+                )
+    return errors
+
+
+def find_integrity_errors(messages: list[dict[str, Any]]) -> list[str]:
+    """Finds component tree errors that JSON Schema validation cannot catch.
+
+    The messages are treated as the complete description of every surface that
+    has a `surfaceUpdate` among them. For each such surface this reports, in a
+    single pass over an ID index:
+
+    * components without an `id` and duplicate `id`s,
+    * `child`, `children.explicitList` and `template.componentId` references
+      to components that do not exist,
+    * a `beginRendering.root` that names no component,
+    * reference cycles.
+
+    The check is linear in the total size of the components.
+
+    Args:
+        messages: The A2UI messages, e.g. the parsed list from an LLM response.
+
+    Returns:
+        A list of human readable error messages, empty if the tree is sound.
+    """
+    if isinstance(messages, dict):
+        messages = [messages]
+
+    errors: list[str] = []
+    surface_edges: dict[str, dict[str, list[str]]] = {}
+    roots: list[tuple[str, str]] = []
+
+    for message in messages:
+        if not isinstance(message, dict):
+            continue
+        if isinstance(begin := message.get("beginRendering"), dict):
+            if isinstance(begin.get("root"), str):
+                roots.append((begin.get("surfaceId"), begin["root"]))
+            continue
+        update = message.get("surfaceUpdate")
+        if not isinstance(update, dict):
+            continue
+
+        surface_id = update.get("surfaceId")
+        edges = surface_edges.setdefault(surface_id, {})
+        seen_in_message = set()
+        for index, component in enumerate(update.get("components") or []):
+            component_id = component.get("id") if isinstance(component, dict) else None
+            if not isinstance(component_id, str):
+                errors.append(
+                    f"Component at index {index} in surface '{surface_id}' has no id."
+                )
+                continue
+            if component_id in seen_in_message:
+                errors.append(
+                    f"Duplicate component id '{component_id}' in surface '{surface_id}'."
+                )
+                continue
+            seen_in_message.add(component_id)
+
+            references: list[tuple[str, str]] = []
+            _collect_references(component.get("component"), references)
+            edges[component_id] = references
+
+    for surface_id, edges in surface_edges.items():
+        for component_id, references in edges.items():
+            for kind, reference in references:
+                if reference not in edges:
+                    errors.append(
+                        f"Component '{component_id}' in surface '{surface_id}' has a "
+                        f"'{kind}' reference to missing component '{reference}'."
+                    )
+            edges[component_id] = [reference for _, reference in references]
+        errors.extend(_find_cycles(surface_id, edges))
+
+    for surface_id, root in roots:
+        if (edges := surface_edges.get(surface_id)) is not None and root not in edges:
+            errors.append(
+                f"beginRendering root '{root}' for surface '{surface_id}' is not a "
+                "component."
+            )
+
+    return errors
+
+
+def check_integrity(messages: list[dict[str, Any]]) -> None:
+    """Checks the component trees described by A2UI messages.
+
+    Args:
+        messages: The A2UI messages, e.g. the parsed list from an LLM response.
+
+    Raises:
+        A2uiIntegrityError: With all errors found by `find_integrity_errors`.
+    """
+    if errors := find_integrity_errors(messages):
+        raise A2uiIntegrityError(errors)
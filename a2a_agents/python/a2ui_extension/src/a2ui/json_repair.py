@@ -0,0 +1,244 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Names of the fixes reported by `repair_json` and counted by `JsonRepairer`.
+# Removing a Markdown code fence is not a fix, since LLMs usually add one.
+FIX_TRAILING_COMMA = "trailing_comma"
+FIX_CONTROL_CHARACTER = "control_character"
+FIX_MISMATCHED_BRACKET = "mismatched_bracket"
+FIX_UNCLOSED_STRING = "unclosed_string"
+FIX_INCOMPLETE_VALUE = "incomplete_value"
+FIX_UNCLOSED_BRACKET = "unclosed_bracket"
+FIX_TRAILING_TEXT = "trailing_text"
+FIX_WRAPPED_OBJECT = "wrapped_object"
+
+_OPENERS = {"{": "}", "[": "]"}
+_CLOSERS = {"}": "{", "]": "["}
+_ESCAPED_CONTROL_CHARACTERS = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+_CODE_FENCE_START_RE = re.compile(r"^\s*```[A-Za-z]*[ \t]*\n?")
+_CODE_FENCE_END_RE = re.compile(r"\n?[ \t]*```\s*$")
+_TRAILING_COMMA_RE = re.compile(r",\s*$")
+# A value that was cut off: a partial literal or a number ending in a sign,
+# point or exponent.
+_PARTIAL_VALUE_RE = re.compile(
+    r"(?:\b(?:t|tr|tru|f|fa|fal|fals|n|nu|nul)|-?\d+(?:\.\d*)?[eE][+-]?|-?\d+\.|-)$"
+)
+# An object key without a value, optionally followed by its colon.
+_DANGLING_KEY_RE = re.compile(r'(?<=[{,])\s*"(?:[^"\\]|\\.)*"\s*:?\s*$')
+
+
+def strip_code_fences(text: str) -> str:
+    """Removes a Markdown code fence around a JSON payload.
+
+    Unlike `str.lstrip("```json")`, which strips any leading run of those
+    characters, only a complete fence line such as "```json" is removed.
+    """
+    text = _CODE_FENCE_START_RE.sub("", text, count=1)
+    return _CODE_FENCE_END_RE.sub("", text, count=1).strip()
+
+
+def repair_json(text: str) -> tuple[str, list[str]]:
+    """Repairs the syntax errors LLMs commonly make when writing JSON.
+
+    The text is scanned once, tracking strings and open brackets, to:
+
+    * remove Markdown code fences,
+    * remove trailing commas before `}` and `]`,
+    * escape raw newlines, carriage returns and tabs inside strings,
+    * close brackets that were closed with the wrong bracket,
+    * complete output that was cut off, by closing the open string, dropping
+      an incomplete value or key, and closing all open brackets,
+    * drop text after the end of the top-level value.
+
+    Args:
+        text: The JSON text written by the LLM.
+
+    Returns:
+        A tuple of the repaired text and the names of the fixes applied, in the
+        order they were first applied. The text is returned unchanged, with no
+        fixes, if there was nothing to repair beyond a code fence. The repaired
+        text is not guaranteed to be valid JSON.
+    """
+    fixes: list[str] = []
+
+    def fix(name: str) -> None:
+        if name not in fixes:
+            fixes.append(name)
+
+    stripped = strip_code_fences(text)
+
+    out: list[str] = []
+    stack: list[str] = []
+    in_string = False
+    escaped = False
+    finished = False
+    # The index in `out` of a comma followed only by whitespace so far.
+    comma_index = None
+    end = len(stripped)
+
+    for index, char in enumerate(stripped):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            elif char in _ESCAPED_CONTROL_CHARACTERS:
+                fix(FIX_CONTROL_CHARACTER)
+                char = _ESCAPED_CONTROL_CHARACTERS[char]
+            out.append(char)
+            continue
+        if char.isspace():
+            out.append(char)
+            continue
+        if finished:
+            fix(FIX_TRAILING_TEXT)
+            end = index
+            break
+
+        if char == '"':
+            in_string = True
+        elif char in _OPENERS:
+            stack.append(char)
+        elif char in _CLOSERS:
+            if comma_index is not None:
+                fix(FIX_TRAILING_COMMA)
+                del out[comma_index]
+            if _CLOSERS[char] not in stack:
+                # A closer without an opener is dropped.
+                fix(FIX_MISMATCHED_BRACKET)
+                continue
+            while stack[-1] != _CLOSERS[char]:
+                fix(FIX_MISMATCHED_BRACKET)
+                out.append(_OPENERS[stack.pop()])
+            stack.pop()
+            finished = not stack
+        comma_index = len(out) if char == "," else None
+        out.append(char)
+
+    if in_string:
+        fix(FIX_UNCLOSED_STRING)
+        if escaped:
+            out.pop()
+        out.append('"')
+
+    if stack:
+        fix(FIX_UNCLOSED_BRACKET)
+        repaired = "".join(out).rstrip()
+        while True:
+            trimmed = _TRAILING_COMMA_RE.sub("", repaired)
+            trimmed = _PARTIAL_VALUE_RE.sub("", trimmed).rstrip()
+            if stack[-1] == "{":
+                trimmed = _DANGLING_KEY_RE.sub("", trimmed)
+            if trimmed == repaired:
+                break
+            fix(FIX_INCOMPLETE_VALUE)
+            repaired = trimmed
+        out = [repaired] + [_OPENERS[opener] for opener in reversed(stack)]
+
+    if not fixes:
+        return text, []
+    if end < len(stripped):
+        logger.debug(f"Dropped trailing text after JSON: {stripped[end:][:100]}")
+    return "".join(out), fixes
+
+
+class JsonRepairer:
+    """Parses LLM JSON output, repairing it locally when it is malformed.
+
+    Agents ask the LLM again when its A2UI JSON does not parse, which roughly
+    doubles the latency and cost of the request. `JsonRepairer` first tries
+    `repair_json`, so the LLM only needs to be asked again when local repair
+    fails. Attempts and outcomes are counted so the repair rate can be
+    monitored.
+
+    Instances are thread safe and are meant to be shared by an agent across
+    requests.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Counter[str] = Counter()
+
+    @property
+    def counters(self) -> dict[str, int]:
+        """A snapshot of the counters.
+
+        `parsed` counts all successful parses, `attempts` the parses that needed
+        a repair, and `repaired` and `failed` their outcomes. Each applied fix is
+        counted under its name, e.g. `trailing_comma`.
+        """
+        with self._lock:
+            return dict(self._counters)
+
+    def reset_counters(self) -> None:
+        """Resets all counters to zero."""
+        with self._lock:
+            self._counters.clear()
+
+    def parse(self, text: str, expect_array: bool = False) -> tuple[Any, list[str]]:
+        """Parses JSON text, repairing it if needed.
+
+        Args:
+            text: The JSON text written by the LLM.
+            expect_array: Whether the value must be a list. A single object is
+                then wrapped in a list.
+
+        Returns:
+            A tuple of the parsed value and the names of the fixes applied.
+            Text that parses once its code fence is removed reports no fixes.
+
+        Raises:
+            json.JSONDecodeError: If the text could not be repaired. The error
+                refers to the original text.
+            ValueError: If the text is empty.
+        """
+        stripped = strip_code_fences(text)
+        if not stripped:
+            raise ValueError("JSON string is empty.")
+
+        fixes = []
+        try:
+            value = json.loads(stripped)
+        except json.JSONDecodeError as original_error:
+            repaired, fixes = repair_json(text)
+            try:
+                value = json.loads(repaired)
+            except json.JSONDecodeError:
+                self._count("attempts", "failed")
+                raise original_error
+            self._count("attempts", "repaired", *fixes)
+            logger.info(f"Repaired malformed JSON locally with fixes: {fixes}")
+
+        if expect_array and isinstance(value, dict):
+            fixes.append(FIX_WRAPPED_OBJECT)
+            self._count(FIX_WRAPPED_OBJECT)
+            value = [value]
+        self._count("parsed")
+        return value, fixes
+
+    def _count(self, *names: str) -> None:
+        with self._lock:
+            self._counters.update(names)
@@ -0,0 +1,235 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from collections.abc import Callable, Sequence
+from typing import Any, Optional
+
+import jsonschema
+from a2a.types import DataPart, Part, TextPart
+
+from .a2ui_extension import A2UI_MIME_TYPE, create_a2ui_part
+from .stream_parser import A2UI_JSON_DELIMITER, A2uiStreamParser, parse_a2ui_response
+
+logger = logging.getLogger(__name__)
+
+Messages = list[dict[str, Any]]
+# Raises ValueError or jsonschema.ValidationError if the messages must not be sent.
+A2uiValidateFn = Callable[[Messages], None]
+# Returns the messages to send in place of the given ones.
+A2uiTransformFn = Callable[[Messages], Messages]
+
+
+class A2uiResponseAssembler:
+    """Turns a delimited A2UI LLM response into the A2A parts sent to the client.
+
+    The response is conversational text, the `---a2ui_JSON---` delimiter and a
+    JSON list of A2UI messages. The assembler produces a `TextPart` for the text
+    and one A2UI `DataPart` per message, falling back to text parts when the
+    JSON cannot be parsed or fails validation.
+
+    For a finished response, call `finish` with the content. For a streaming
+    response, pass each chunk to `feed`, which returns the parts for the A2UI
+    messages it completed, and then call `finish` for the rest. Either way the
+    response is parsed in a single pass.
+
+    Each batch of messages is passed to `validate` and then through
+    `transforms`, in order, before it is turned into parts. When streaming, a
+    batch is the messages completed by one chunk, so `validate` must not rely
+    on seeing every message at once.
+
+    An assembler handles a single response.
+    """
+
+    def __init__(
+        self,
+        validate: Optional[A2uiValidateFn] = None,
+        transforms: Sequence[A2uiTransformFn] = (),
+        delimiter: str = A2UI_JSON_DELIMITER,
+        mime_type: str = A2UI_MIME_TYPE,
+    ):
+        """Initializes the assembler.
+
+        Args:
+            validate: Checks each batch of messages, e.g.
+                `A2uiValidator.validate`.
+            transforms: Rewrite each batch of messages, e.g.
+                `SurfaceStateStore.minimize_messages` bound to a context.
+            delimiter: The delimiter between the text and the JSON.
+            mime_type: The encoding of the A2UI parts, see
+                `get_a2ui_mime_type`.
+        """
+        self._validate = validate
+        self._transforms = list(transforms)
+        self._delimiter = delimiter
+        self._mime_type = mime_type
+        self._parser: Optional[A2uiStreamParser] = A2uiStreamParser(delimiter)
+        self._fed_chunks: list[str] = []
+        self._finished = False
+        self.streamed_message_count = 0
+
+    def feed(self, chunk: str) -> list[Part]:
+        """Feeds the next chunk of a streaming response.
+
+        If a message fails to parse or validate, streaming stops and the rest of
+        the response is handled by `finish`.
+
+        Args:
+            chunk: The next piece of the response text.
+
+        Returns:
+            The A2UI parts for the messages completed by this chunk. Text is
+            returned by `finish`.
+
+        Raises:
+            ValueError: If the assembler has already finished.
+        """
+        if self._finished:
+            raise ValueError("Cannot feed a finished A2uiResponseAssembler.")
+        self._fed_chunks.append(chunk)
+        if self._parser is None:
+            return []
+        try:
+            messages = [
+                item for item in self._parser.feed(chunk) if isinstance(item, dict)
+            ]
+            parts = self._create_a2ui_parts(messages)
+        except (ValueError, jsonschema.exceptions.ValidationError) as e:
+            logger.warning(f"Stopped streaming A2UI messages: {e}")
+            self._parser = None
+            return []
+
+        if parts:
+            logger.info(f"Streaming {len(parts)} A2UI messages.")
+        self.streamed_message_count += len(messages)
+        return parts
+
+    def finish(self, content: str) -> list[Part]:
+        """Assembles the parts for the rest of the response.
+
+        Args:
+            content: The complete response. When chunks were streamed, it is
+                only parsed if streaming stopped early, and messages that were
+                already streamed are not sent again. Content that is not the
+                streamed text, e.g. an error fallback sent after a partial
+                stream, is parsed as a response of its own.
+
+        Returns:
+            A text part for the conversational text, if any, followed by the
+            A2UI parts for the messages that were not streamed.
+
+        Raises:
+            ValueError: If the assembler has already finished.
+        """
+        if self._finished:
+            raise ValueError("A2uiResponseAssembler has already finished.")
+        self._finished = True
+
+        if self._fed_chunks and not self._is_streamed_text(content):
+            logger.warning("Final response differs from the streamed text, parsing it on its own.")
+            self._parser = None
+            self._fed_chunks = []
+            self.streamed_message_count = 0
+
+        if self._delimiter not in content and self.streamed_message_count == 0:
+            parts = [Part(root=TextPart(text=content.strip()))]
+            _log_parts(parts)
+            return parts
+
+        logger.info("Splitting final response into text and UI parts.")
+        try:
+            text_content, messages = self._parse_rest(content)
+            parts = []
+            if text_content.strip():
+                parts.append(Part(root=TextPart(text=text_content.strip())))
+            parts.extend(self._create_a2ui_parts(messages))
+        except (ValueError, jsonschema.exceptions.ValidationError) as e:
+            logger.error(f"Failed to parse UI JSON: {e}")
+            text_content, _, json_string = content.partition(self._delimiter)
+            parts = []
+            if text_content.strip():
+                parts.append(Part(root=TextPart(text=text_content.strip())))
+            parts.append(Part(root=TextPart(text=json_string)))
+
+        _log_parts(parts)
+        return parts
+
+    def finish_messages(self, text: str, messages: Messages) -> list[Part]:
+        """Assembles the parts for a response that is already parsed.
+
+        Use this for responses built without an LLM, e.g. from an
+        `A2uiTemplate`.
+
+        Args:
+            text: The conversational text.
+            messages: The A2UI messages.
+
+        Returns:
+            A text part for the text, if any, followed by the A2UI parts.
+
+        Raises:
+            ValueError: If the assembler has already finished, or `validate`
+                rejects the messages.
+            jsonschema.exceptions.ValidationError: If `validate` rejects the
+                messages.
+        """
+        if self._finished:
+            raise ValueError("A2uiResponseAssembler has already finished.")
+        self._finished = True
+
+        parts = []
+        if text.strip():
+            parts.append(Part(root=TextPart(text=text.strip())))
+        parts.extend(self._create_a2ui_parts(messages))
+        _log_parts(parts)
+        return parts
+
+    def _is_streamed_text(self, content: str) -> bool:
+        streamed_text = "".join(self._fed_chunks)
+        # Final responses may join the streamed parts with whitespace
+        return content == streamed_text or "".join(content.split()) == "".join(streamed_text.split())
+
+    def _parse_rest(self, content: str) -> tuple[str, Messages]:
+        if self._fed_chunks and self._parser is not None:
+            try:
+                items = self._parser.close()
+                return self._parser.text, [
+                    item for item in items if isinstance(item, dict)
+                ]
+            except ValueError as e:
+                logger.warning(f"Streamed response was incomplete, parsing it again: {e}")
+
+        text_content, messages = parse_a2ui_response(content)
+        return text_content, messages[self.streamed_message_count :]
+
+    def _create_a2ui_parts(self, messages: Messages) -> list[Part]:
+        if not messages:
+            return []
+        if self._validate:
+            self._validate(messages)
+        for transform in self._transforms:
+            messages = transform(messages)
+        logger.info(f"Found {len(messages)} messages. Creating individual DataParts.")
+        return [create_a2ui_part(message, self._mime_type) for message in messages]
+
+
+def _log_parts(parts: list[Part]) -> None:
+    logger.info("--- FINAL PARTS TO BE SENT ---")
+    for i, part in enumerate(parts):
+        logger.info(f"  - Part {i}: Type = {type(part.root)}")
+        if isinstance(part.root, TextPart):
+            logger.info(f"    - Text: {part.root.text[:200]}...")
+        elif isinstance(part.root, DataPart):
+            logger.info(f"    - Data: {str(part.root.data)[:200]}...")
+    logger.info("-----------------------------")
@@ -0,0 +1,212 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import re
+from typing import Any, Union
+
+A2UI_JSON_DELIMITER = "---a2ui_JSON---"
+
+# Characters that change the scanner state inside and outside of strings.
+_OBJECT_TOKEN_RE = re.compile(r'[{}"]')
+_STRING_TOKEN_RE = re.compile(r'["\\]')
+
+StreamItem = Union[str, dict[str, Any]]
+
+
+class A2uiStreamParser:
+    """A push-style incremental parser for delimited A2UI LLM responses.
+
+    Agents prompt the LLM to answer with conversational text, the
+    `---a2ui_JSON---` delimiter, and a (possibly code-fenced) JSON list of A2UI
+    messages. Chunks of that response are passed to `feed` as they arrive. The
+    parser returns the leading text as soon as it is known not to be part of the
+    delimiter, and each A2UI message as soon as its closing brace arrives, so
+    callers can forward `beginRendering` and `surfaceUpdate` while the model is
+    still writing the rest of the list.
+
+    Every input character is scanned once, so parsing a response is linear in
+    its length regardless of how it is chunked.
+    """
+
+    def __init__(self, delimiter: str = A2UI_JSON_DELIMITER):
+        self._delimiter = delimiter
+        self._text_buffer = ""
+        self._found_delimiter = False
+        # Pieces of the pending message from earlier chunks.
+        self._message_parts: list[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._closed = False
+        self.text = ""
+        self.message_count = 0
+
+    @property
+    def found_delimiter(self) -> bool:
+        """Whether the A2UI delimiter has been seen."""
+        return self._found_delimiter
+
+    def feed(self, chunk: str) -> list[StreamItem]:
+        """Feeds the next chunk of the LLM response.
+
+        Args:
+            chunk: The next piece of the response text.
+
+        Returns:
+            The items completed by this chunk, in order. Strings are pieces of
+            the leading conversational text and dicts are A2UI messages.
+
+        Raises:
+            json.JSONDecodeError: If a completed A2UI message is not valid JSON.
+            ValueError: If the parser has already been closed.
+        """
+        if self._closed:
+            raise ValueError("Cannot feed a closed A2uiStreamParser.")
+        if not chunk:
+            return []
+
+        items: list[StreamItem] = []
+        if not self._found_delimiter:
+            self._text_buffer += chunk
+            index = self._text_buffer.find(self._delimiter)
+            if index == -1:
+                # Hold back a suffix that could be the start of the delimiter.
+                split = len(self._text_buffer) - self._partial_delimiter_length(
+                    self._text_buffer
+                )
+                self._emit_text(self._text_buffer[:split], items)
+                self._text_buffer = self._text_buffer[split:]
+                return items
+
+            self._emit_text(self._text_buffer[:index], items)
+            chunk = self._text_buffer[index + len(self._delimiter) :]
+            self._text_buffer = ""
+            self._found_delimiter = True
+
+        self._scan(chunk, items)
+        return items
+
+    def close(self) -> list[StreamItem]:
+        """Signals the end of the response and flushes any remaining text.
+
+        Returns:
+            Any leading text that was held back while waiting for the delimiter.
+
+        Raises:
+            ValueError: If the response ended in the middle of an A2UI message.
+        """
+        if self._closed:
+            return []
+        self._closed = True
+
+        items: list[StreamItem] = []
+        if not self._found_delimiter:
+            self._emit_text(self._text_buffer, items)
+            self._text_buffer = ""
+        elif self._depth > 0:
+            raise ValueError(
+                "A2UI JSON ended before the message starting with "
+                f"{''.join(self._message_parts)[:100]!r} was complete."
+            )
+        return items
+
+    def _emit_text(self, text: str, items: list[StreamItem]) -> None:
+        if text:
+            self.text += text
+            items.append(text)
+
+    def _partial_delimiter_length(self, text: str) -> int:
+        for length in range(min(len(self._delimiter) - 1, len(text)), 0, -1):
+            if text.endswith(self._delimiter[:length]):
+                return length
+        return 0
+
+    def _scan(self, chunk: str, items: list[StreamItem]) -> None:
+        # Chunks are scanned on their own, with the state carried over, so the
+        # pending message is never copied until it is complete.
+        pos = 0
+        end = len(chunk)
+        message_start = 0
+
+        while pos < end:
+            if self._escaped:
+                # Skip the character following a backslash inside a string.
+                self._escaped = False
+                pos += 1
+                continue
+
+            if self._in_string:
+                match = _STRING_TOKEN_RE.search(chunk, pos)
+                if match is None:
+                    pos = end
+                    break
+                pos = match.end()
+                if match.group() == "\\":
+                    self._escaped = True
+                else:
+                    self._in_string = False
+                continue
+
+            if self._depth == 0:
+                # Between messages: skip code fences, list brackets and commas.
+                start = chunk.find("{", pos)
+                if start == -1:
+                    pos = end
+                    break
+                message_start = start
+                self._depth = 1
+                pos = start + 1
+                continue
+
+            match = _OBJECT_TOKEN_RE.search(chunk, pos)
+            if match is None:
+                pos = end
+                break
+            pos = match.end()
+            token = match.group()
+            if token == '"':
+                self._in_string = True
+            elif token == "{":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._message_parts.append(chunk[message_start:pos])
+                    message = json.loads("".join(self._message_parts))
+                    self._message_parts = []
+                    self.message_count += 1
+                    items.append(message)
+
+        if self._depth > 0:
+            self._message_parts.append(chunk[message_start:])
+
+
+def parse_a2ui_response(content: str) -> tuple[str, list[dict[str, Any]]]:
+    """Parses a complete delimited A2UI LLM response in a single pass.
+
+    Args:
+        content: The full LLM response.
+
+    Returns:
+        A tuple of the leading conversational text and the list of A2UI
+        messages. The list is empty if the response has no delimiter.
+
+    Raises:
+        json.JSONDecodeError: If an A2UI message is not valid JSON.
+        ValueError: If the response ended in the middle of an A2UI message.
+    """
+    parser = A2uiStreamParser()
+    items = parser.feed(content) + parser.close()
+    return parser.text, [item for item in items if isinstance(item, dict)]
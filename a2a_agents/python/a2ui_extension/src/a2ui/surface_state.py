@@ -0,0 +1,146 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONTEXTS = 1024
+
+
+class SurfaceStateStore:
+    """Tracks the components sent to the client and minimizes `surfaceUpdate`s.
+
+    Clients merge `surfaceUpdate` components into the surface by component `id`,
+    so once a component has been sent it only needs to be sent again when it
+    changes. The store records the last component sent for each
+    (context_id, surfaceId, component id) and rewrites a full `surfaceUpdate`
+    into one that carries only added or changed components.
+
+    Only use the store with clients that keep surfaces between responses. A
+    client that clears its surfaces before processing each response needs the
+    full component list every time.
+    """
+
+    def __init__(self, max_contexts: int = DEFAULT_MAX_CONTEXTS):
+        """Initializes the store.
+
+        Args:
+            max_contexts: The maximum number of contexts to track. The least
+                recently used context is forgotten when the limit is reached,
+                and its next `surfaceUpdate`s are sent in full.
+        """
+        self._max_contexts = max_contexts
+        self._contexts: OrderedDict[
+            str, dict[str, dict[str, dict[str, Any]]]
+        ] = OrderedDict()
+
+    def minimize_messages(
+        self, context_id: str, messages: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Minimizes a list of A2UI messages about to be sent to the client.
+
+        Args:
+            context_id: The A2A context the messages are sent in.
+            messages: The A2UI messages, in send order.
+
+        Returns:
+            The messages to send. `surfaceUpdate`s only carry added or changed
+            components and are dropped entirely if nothing changed.
+        """
+        minimized = []
+        for message in messages:
+            message = self.minimize_message(context_id, message)
+            if message is not None:
+                minimized.append(message)
+        return minimized
+
+    def minimize_message(
+        self, context_id: str, message: dict[str, Any]
+    ) -> Optional[dict[str, Any]]:
+        """Minimizes a single A2UI message about to be sent to the client.
+
+        The message is recorded as sent, so it must be delivered to the client.
+
+        Args:
+            context_id: The A2A context the message is sent in.
+            message: The A2UI message.
+
+        Returns:
+            The message to send, or None if it is a `surfaceUpdate` with no
+            added or changed components.
+        """
+        if (delete_surface := message.get("deleteSurface")) is not None:
+            self.forget(context_id, delete_surface.get("surfaceId"))
+            return message
+
+        surface_update = message.get("surfaceUpdate")
+        if surface_update is None or "surfaceId" not in surface_update:
+            return message
+
+        surfaces = self._get_surfaces(context_id)
+        sent_components = surfaces.setdefault(surface_update["surfaceId"], {})
+
+        changed = []
+        for component in surface_update.get("components", []):
+            component_id = component.get("id")
+            if component_id is None:
+                # Leave malformed components for the validator to report.
+                changed.append(component)
+            elif sent_components.get(component_id) != component:
+                sent_components[component_id] = component
+                changed.append(component)
+
+        if not changed:
+            logger.info(
+                f"Dropping surfaceUpdate for surface {surface_update['surfaceId']} "
+                "with no changed components."
+            )
+            return None
+        if len(changed) == len(surface_update.get("components", [])):
+            return message
+
+        logger.info(
+            f"Minimized surfaceUpdate for surface {surface_update['surfaceId']} "
+            f"from {len(surface_update['components'])} to {len(changed)} components."
+        )
+        return {"surfaceUpdate": {**surface_update, "components": changed}}
+
+    def forget(self, context_id: str, surface_id: Optional[str] = None) -> None:
+        """Forgets the recorded components for a context or one of its surfaces.
+
+        Call this when the client has lost its surfaces, so the next
+        `surfaceUpdate` is sent in full.
+
+        Args:
+            context_id: The A2A context.
+            surface_id: The surface to forget. All surfaces in the context are
+                forgotten if not set.
+        """
+        if surface_id is None:
+            self._contexts.pop(context_id, None)
+        elif (surfaces := self._contexts.get(context_id)) is not None:
+            surfaces.pop(surface_id, None)
+
+    def _get_surfaces(self, context_id: str) -> dict[str, dict[str, dict[str, Any]]]:
+        surfaces = self._contexts.get(context_id)
+        if surfaces is None:
+            surfaces = self._contexts[context_id] = {}
+            while len(self._contexts) > self._max_contexts:
+                self._contexts.popitem(last=False)
+        else:
+            self._contexts.move_to_end(context_id)
+        return surfaces
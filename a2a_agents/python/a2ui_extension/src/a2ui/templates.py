@@ -0,0 +1,156 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import re
+import string
+from collections.abc import Mapping
+from typing import Any, Optional
+
+_EXAMPLE_RE = re.compile(r"---BEGIN (\w+)---\s*(.*?)\s*---END \1---", re.DOTALL)
+
+
+def extract_examples(examples: str) -> dict[str, str]:
+    """Extracts the named examples from a prompt examples string.
+
+    Args:
+        examples: Text with examples delimited by `---BEGIN NAME---` and
+            `---END NAME---`, as used in the sample agents' prompts.
+
+    Returns:
+        The example bodies by name.
+    """
+    return {name: body for name, body in _EXAMPLE_RE.findall(examples)}
+
+
+class A2uiTemplate:
+    """A compiled A2UI response that is filled from a user action's context.
+
+    Some user actions always produce the same UI with different data, e.g. a
+    booking form for the restaurant that was clicked. Asking an LLM to rebuild
+    that UI from a prompt example takes seconds; rendering a template takes
+    microseconds.
+
+    The template is built from the prompt example once. Rendering only formats
+    the bound `dataModelUpdate` values and the text, and shares the
+    `beginRendering` and `surfaceUpdate` messages between renders, so callers
+    must not mutate the returned messages.
+    """
+
+    def __init__(
+        self,
+        messages: list[dict[str, Any]],
+        data: Optional[Mapping[str, str]] = None,
+        defaults: Optional[Mapping[str, Any]] = None,
+        text: str = "",
+    ):
+        """Compiles the template.
+
+        Args:
+            messages: The A2UI messages of the example. The first
+                `dataModelUpdate` for the root path is the one that is bound.
+            data: Format strings for the string values of the data model by
+                key, e.g. `{"title": "Book a Table at {restaurantName}"}`.
+                Fields are filled from the action context. Keys that are not
+                bound keep the example's value.
+            defaults: Values for context fields that may be missing.
+            text: A format string for the conversational text.
+
+        Raises:
+            ValueError: If `data` is set and the messages have no
+                `dataModelUpdate` for the root path, or a format string is
+                invalid.
+        """
+        self._messages = messages
+        self._defaults = dict(defaults or {})
+        self._text = text
+        self._data_model_index = next(
+            (
+                index
+                for index, message in enumerate(messages)
+                if (update := message.get("dataModelUpdate")) is not None
+                and update.get("path", "/") == "/"
+            ),
+            None,
+        )
+        if data and self._data_model_index is None:
+            raise ValueError("Template has no dataModelUpdate for the root path.")
+
+        # (key, entry, format string) per data model entry, in example order;
+        # entries without a format string are shared as is.
+        self._contents: list[tuple[str, dict[str, Any], Optional[str]]] = []
+        if self._data_model_index is not None:
+            update = messages[self._data_model_index]["dataModelUpdate"]
+            bound = dict(data or {})
+            for entry in update.get("contents", []):
+                key = entry.get("key")
+                self._contents.append((key, entry, bound.pop(key, None)))
+            self._contents.extend((key, {}, value) for key, value in bound.items())
+
+        formats = [text] + [value for _, _, value in self._contents if value]
+        self.fields = frozenset(
+            field
+            for value in formats
+            for _, field, _, _ in string.Formatter().parse(value)
+            if field
+        )
+        self.required_fields = self.fields - self._defaults.keys()
+
+    @classmethod
+    def from_example(cls, example: str, **kwargs: Any) -> "A2uiTemplate":
+        """Compiles a template from a prompt example.
+
+        Args:
+            example: The example JSON list. Braces doubled for `str.format`
+                prompts, as in the sample agents' examples, are accepted.
+            **kwargs: The remaining `A2uiTemplate` arguments.
+
+        Returns:
+            The compiled template.
+        """
+        messages = json.loads(example.replace("{{", "{").replace("}}", "}"))
+        return cls(messages, **kwargs)
+
+    def render(self, context: Mapping[str, Any]) -> tuple[str, list[dict[str, Any]]]:
+        """Renders the template for a user action.
+
+        Args:
+            context: The resolved `userAction.context`.
+
+        Returns:
+            The conversational text and the A2UI messages.
+
+        Raises:
+            KeyError: If a field without a default is missing from the context.
+        """
+        values = {**self._defaults, **context}
+        if missing := self.required_fields - values.keys():
+            raise KeyError(", ".join(sorted(missing)))
+
+        text = self._text.format_map(values)
+        if self._data_model_index is None:
+            return text, list(self._messages)
+
+        update = self._messages[self._data_model_index]["dataModelUpdate"]
+        contents = [
+            {"key": key, "valueString": value.format_map(values)}
+            if value is not None
+            else entry
+            for key, entry, value in self._contents
+        ]
+        messages = list(self._messages)
+        messages[self._data_model_index] = {
+            "dataModelUpdate": {**update, "contents": contents}
+        }
+        return text, messages
@@ -0,0 +1,185 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Optional
+
+import jsonschema
+from jsonschema.exceptions import best_match
+
+if TYPE_CHECKING:
+    import referencing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CACHED_VALIDATORS = 32
+
+
+class A2uiValidator:
+    """A JSON Schema validator that is compiled once for an A2UI schema.
+
+    `jsonschema.validate` checks the schema and builds a new validator on every
+    call. This class does that work once, so each validation is a single walk
+    over the instance.
+    """
+
+    def __init__(
+        self,
+        schema: dict[str, Any],
+        as_array: bool = False,
+        registry: Optional["referencing.Registry"] = None,
+    ):
+        """Compiles the validator.
+
+        Args:
+            schema: The A2UI JSON schema for a single message.
+            as_array: Whether instances are a list of messages rather than a
+                single message.
+            registry: Resolves `$ref`s to other schema documents, e.g. the
+                0.9 catalog and common types referenced by the 0.9 message
+                schema.
+
+        Raises:
+            jsonschema.exceptions.SchemaError: If the schema itself is invalid.
+        """
+        self.schema = {"type": "array", "items": schema} if as_array else schema
+        validator_cls = jsonschema.validators.validator_for(self.schema)
+        validator_cls.check_schema(self.schema)
+        if registry is None:
+            self._validator = validator_cls(self.schema)
+        else:
+            self._validator = validator_cls(self.schema, registry=registry)
+
+    def validate(self, instance: Any) -> None:
+        """Validates an instance against the compiled schema.
+
+        Args:
+            instance: The parsed A2UI JSON to validate.
+
+        Raises:
+            jsonschema.exceptions.ValidationError: If the instance is invalid.
+        """
+        error = best_match(self._validator.iter_errors(instance))
+        if error is not None:
+            raise error
+
+    def is_valid(self, instance: Any) -> bool:
+        """Returns True if the instance is valid against the compiled schema."""
+        return self._validator.is_valid(instance)
+
+
+def get_schema_cache_key(
+    schema: dict[str, Any], catalog_id: Optional[str] = None
+) -> str:
+    """Returns the cache key for a schema.
+
+    Args:
+        schema: The A2UI JSON schema.
+        catalog_id: The ID of the catalog the schema was built from, if known.
+            Inline catalogs have no ID and are keyed by a hash of their content.
+
+    Returns:
+        The catalog ID if given, otherwise a SHA-256 hash of the schema.
+    """
+    if catalog_id:
+        return catalog_id
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+    return "sha256:" + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ValidatorCache:
+    """A thread-safe LRU cache of compiled A2UI validators."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_CACHED_VALIDATORS):
+        self._max_size = max_size
+        self._validators: OrderedDict[tuple[str, bool], A2uiValidator] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        schema: dict[str, Any],
+        catalog_id: Optional[str] = None,
+        as_array: bool = False,
+    ) -> A2uiValidator:
+        """Returns the cached validator for a schema, compiling it if needed.
+
+        Args:
+            schema: The A2UI JSON schema for a single message.
+            catalog_id: The ID of the catalog the schema was built from. It must
+                uniquely identify the schema; leave it unset for inline catalogs.
+            as_array: Whether instances are a list of messages.
+
+        Returns:
+            The compiled validator.
+        """
+        key = (get_schema_cache_key(schema, catalog_id), as_array)
+        with self._lock:
+            validator = self._validators.get(key)
+            if validator is not None:
+                self._validators.move_to_end(key)
+                return validator
+
+        # Compile outside the lock; a concurrent compile of the same schema is
+        # harmless and only the first result is kept.
+        logger.info(f"Compiling A2UI validator for schema {key[0]}")
+        validator = A2uiValidator(schema, as_array=as_array)
+
+        with self._lock:
+            validator = self._validators.setdefault(key, validator)
+            self._validators.move_to_end(key)
+            while len(self._validators) > self._max_size:
+                self._validators.popitem(last=False)
+        return validator
+
+    def clear(self) -> None:
+        """Removes all cached validators."""
+        with self._lock:
+            self._validators.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._validators)
+
+
+_default_cache = ValidatorCache()
+
+
+def get_validator(
+    schema: dict[str, Any],
+    catalog_id: Optional[str] = None,
+    as_array: bool = False,
+) -> A2uiValidator:
+    """Returns a compiled validator for a schema from the process-wide cache.
+
+    Args:
+        schema: The A2UI JSON schema for a single message.
+        catalog_id: The ID of the catalog the schema was built from. It must
+            uniquely identify the schema; leave it unset for inline catalogs.
+        as_array: Whether instances are a list of messages.
+
+    Returns:
+        The compiled validator.
+    """
+    return _default_cache.get(schema, catalog_id=catalog_id, as_array=as_array)
+
+
+def clear_validator_cache() -> None:
+    """Removes all validators from the process-wide cache."""
+    _default_cache.clear()
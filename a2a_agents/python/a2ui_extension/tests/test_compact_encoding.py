@@ -0,0 +1,125 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import json
+import zlib
+
+import pytest
+
+pytest.importorskip("msgpack")
+
+from a2ui import compact_encoding
+
+
+def _dashboard(count):
+    components = [
+        {
+            "id": "root",
+            "component": {
+                "Column": {"children": {"explicitList": [f"row-{i}" for i in range(count)]}}
+            },
+        }
+    ]
+    for i in range(count):
+        components += [
+            {
+                "id": f"row-{i}",
+                "component": {
+                    "Row": {
+                        "children": {"explicitList": [f"label-{i}", f"value-{i}"]},
+                        "distribution": "spaceBetween",
+                    }
+                },
+            },
+            {
+                "id": f"label-{i}",
+                "component": {
+                    "Text": {"text": {"path": f"/metrics/m{i}/label"}, "usageHint": "h4"}
+                },
+            },
+            {
+                "id": f"value-{i}",
+                "component": {"Text": {"text": {"literalString": f"{i * 3.7:.1f}%"}}},
+            },
+        ]
+    return {"surfaceUpdate": {"surfaceId": "dashboard", "components": components}}
+
+
+def test_round_trip():
+    message = _dashboard(3)
+    message["dataModelUpdate"] = {"contents": [{"key": "n", "valueNumber": 1.5}]}
+
+    encoded = compact_encoding.encode_compact(message)
+
+    assert encoded[0] == compact_encoding.FORMAT_VERSION
+    assert compact_encoding.decode_compact(encoded) == message
+
+
+def test_large_surface_update_is_at_least_three_times_smaller():
+    message = _dashboard(500)
+    json_size = len(json.dumps(message, separators=(",", ":")))
+
+    # Measured as sent, i.e. base64 encoded in a FilePart.
+    compact_size = len(base64.b64encode(compact_encoding.encode_compact(message)))
+
+    assert json_size / compact_size >= 3
+
+
+def test_large_surface_update_is_smaller_than_json():
+    message = _dashboard(500)
+
+    compact_size = len(compact_encoding.encode_compact(message))
+
+    assert compact_size * 3 <= len(json.dumps(message))
+
+
+@pytest.mark.parametrize("data", [b"", b"\x00abc", b"\x01not deflate"])
+def test_invalid_data_is_rejected(data):
+    with pytest.raises(ValueError):
+        compact_encoding.decode_compact(data)
+
+
+def test_oversized_payload_is_rejected(monkeypatch):
+    message = _dashboard(50)
+    encoded = compact_encoding.encode_compact(message)
+    monkeypatch.setattr(compact_encoding, "MAX_DECODED_BYTES", 1024)
+
+    with pytest.raises(ValueError, match="more than 1024 bytes"):
+        compact_encoding.decode_compact(encoded)
+
+
+def test_decompression_bomb_is_rejected():
+    compressor = zlib.compressobj(zdict=compact_encoding._PRESET_DICTIONARY)
+    bomb = compressor.compress(
+        bytes(compact_encoding.MAX_DECODED_BYTES + 1)
+    ) + compressor.flush()
+
+    with pytest.raises(ValueError, match="decompresses to more than"):
+        compact_encoding.decode_compact(bytes([compact_encoding.FORMAT_VERSION]) + bomb)
+
+
+def test_truncated_payload_is_rejected():
+    encoded = compact_encoding.encode_compact(_dashboard(3))
+
+    with pytest.raises(ValueError, match="truncated"):
+        compact_encoding.decode_compact(encoded[:-4])
+
+
+def test_missing_msgpack_is_reported(monkeypatch):
+    monkeypatch.setattr(compact_encoding, "msgpack", None)
+
+    assert not compact_encoding.is_compact_encoding_available()
+    with pytest.raises(ImportError, match="a2ui\\[compact\\]"):
+        compact_encoding.encode_compact({})
@@ -0,0 +1,194 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from a2ui import data_model_delta
+from a2ui.data_model_delta import DataModelDeltaEngine
+
+
+def _item(name, rating):
+    return [
+        {"key": "name", "valueString": name},
+        {"key": "rating", "valueNumber": rating},
+        {"key": "open", "valueBoolean": True},
+    ]
+
+
+def _restaurants(title, items, path="/"):
+    return {
+        "dataModelUpdate": {
+            "surfaceId": "default",
+            "path": path,
+            "contents": [
+                {"key": "title", "valueString": title},
+                {
+                    "key": "items",
+                    "valueMap": [
+                        {"key": f"item{i}", "valueMap": item}
+                        for i, item in enumerate(items)
+                    ],
+                },
+            ],
+        }
+    }
+
+
+ITEMS = [_item(f"Restaurant {i}", 4.0) for i in range(10)]
+
+
+def test_decode_and_encode_round_trip():
+    contents = _restaurants("Top", ITEMS[:2])["dataModelUpdate"]["contents"]
+
+    decoded = data_model_delta.decode_contents(contents)
+
+    assert decoded["title"] == ("valueString", "Top")
+    assert decoded["items"]["item1"]["rating"] == ("valueNumber", 4.0)
+    assert data_model_delta.encode_contents(decoded) == contents
+
+
+def test_decode_primitive_at_path():
+    decoded = data_model_delta.decode_contents([{"key": ".", "valueNumber": 3}])
+
+    assert decoded == ("valueNumber", 3)
+    assert data_model_delta.encode_contents(decoded) == [
+        {"key": ".", "valueNumber": 3}
+    ]
+
+
+def test_first_update_is_sent_in_full():
+    engine = DataModelDeltaEngine()
+    message = _restaurants("Top", ITEMS)
+
+    assert engine.diff_message("ctx", message) == [message]
+
+
+def test_unchanged_model_sends_nothing():
+    engine = DataModelDeltaEngine()
+    engine.diff_message("ctx", _restaurants("Top", ITEMS))
+
+    assert engine.diff_message("ctx", _restaurants("Top", ITEMS)) == []
+
+
+def test_changed_leaf_is_sent_at_its_path():
+    engine = DataModelDeltaEngine()
+    engine.diff_message("ctx", _restaurants("Top", ITEMS))
+    items = list(ITEMS)
+    items[3] = _item("Restaurant 3", 4.5)
+
+    assert engine.diff_message("ctx", _restaurants("Top", items)) == [
+        {
+            "dataModelUpdate": {
+                "surfaceId": "default",
+                "path": "/items/item3/rating",
+                "contents": [{"key": ".", "valueNumber": 4.5}],
+            }
+        }
+    ]
+
+
+def test_mostly_changed_map_is_replaced_in_one_update():
+    engine = DataModelDeltaEngine()
+    engine.diff_message("ctx", _restaurants("Top", ITEMS))
+    items = list(ITEMS)
+    items[3] = _item("Renamed", 1.0)
+
+    assert engine.diff_message("ctx", _restaurants("New title", items)) == [
+        {
+            "dataModelUpdate": {
+                "surfaceId": "default",
+                "path": "/title",
+                "contents": [{"key": ".", "valueString": "New title"}],
+            }
+        },
+        {
+            "dataModelUpdate": {
+                "surfaceId": "default",
+                "path": "/items/item3",
+                "contents": _item("Renamed", 1.0),
+            }
+        },
+    ]
+
+
+def test_removed_keys_replace_the_parent_map():
+    engine = DataModelDeltaEngine()
+    engine.diff_message("ctx", _restaurants("Top", ITEMS))
+
+    updates = engine.diff_message("ctx", _restaurants("Top", ITEMS[:5]))
+
+    assert updates == [
+        {
+            "dataModelUpdate": {
+                "surfaceId": "default",
+                "path": "/items",
+                "contents": _restaurants("Top", ITEMS[:5])["dataModelUpdate"][
+                    "contents"
+                ][1]["valueMap"],
+            }
+        }
+    ]
+
+
+def test_appended_keys_are_added_individually():
+    engine = DataModelDeltaEngine()
+    engine.diff_message("ctx", _restaurants("Top", ITEMS[:9]))
+
+    updates = engine.diff_message("ctx", _restaurants("Top", ITEMS))
+
+    assert [update["dataModelUpdate"]["path"] for update in updates] == [
+        "/items/item9"
+    ]
+
+
+def test_subpath_update_is_diffed_against_recorded_model():
+    engine = DataModelDeltaEngine()
+    engine.diff_message("ctx", _restaurants("Top", ITEMS))
+    item = _item("Restaurant 0", 3.0)
+
+    updates = engine.diff_message(
+        "ctx",
+        {
+            "dataModelUpdate": {
+                "surfaceId": "default",
+                "path": "/items/item0",
+                "contents": item,
+            }
+        },
+    )
+
+    assert [update["dataModelUpdate"]["path"] for update in updates] == [
+        "/items/item0/rating"
+    ]
+    assert engine.diff_message("ctx", _restaurants("Top", ITEMS)) == [
+        {
+            "dataModelUpdate": {
+                "surfaceId": "default",
+                "path": "/items/item0/rating",
+                "contents": [{"key": ".", "valueNumber": 4.0}],
+            }
+        }
+    ]
+
+
+def test_delete_surface_and_other_messages_pass_through():
+    engine = DataModelDeltaEngine()
+    message = _restaurants("Top", ITEMS)
+    engine.diff_message("ctx", message)
+    begin_rendering = {"beginRendering": {"surfaceId": "default", "root": "root"}}
+    delete_surface = {"deleteSurface": {"surfaceId": "default"}}
+
+    assert engine.diff_messages("ctx", [begin_rendering, delete_surface]) == [
+        begin_rendering,
+        delete_surface,
+    ]
+    assert engine.diff_message("ctx", message) == [message]
@@ -14,11 +14,13 @@
 
 
 from a2a.server.agent_execution import RequestContext
-from a2a.types import DataPart, TextPart, Part
+from a2a.types import DataPart, FilePart, FileWithBytes, TextPart, Part
 from a2ui import a2ui_extension
 
 from unittest.mock import MagicMock
 
+import pytest
+
 
 def test_a2ui_part_serialization():
     a2ui_data = {"beginRendering": {"surfaceId": "test-surface", "root": "root-column"}}
@@ -88,3 +90,63 @@ def test_try_activate_a2ui_extension_not_requested():
 
     assert not a2ui_extension.try_activate_a2ui_extension(context)
     context.add_activated_extension.assert_not_called()
+
+
+def test_compact_a2ui_part_is_decoded_transparently():
+    pytest.importorskip("msgpack")
+    a2ui_data = {"beginRendering": {"surfaceId": "test-surface", "root": "root-column"}}
+
+    part = a2ui_extension.create_a2ui_part(
+        a2ui_data, a2ui_extension.A2UI_COMPACT_MIME_TYPE
+    )
+
+    assert isinstance(part.root, FilePart)
+    assert a2ui_extension.is_a2ui_part(part)
+    data_part = a2ui_extension.get_a2ui_datapart(part)
+    assert data_part.data == a2ui_data
+    assert data_part.metadata["mimeType"] == a2ui_extension.A2UI_MIME_TYPE
+
+
+def test_non_a2ui_file_part():
+    part = Part(
+        root=FilePart(file=FileWithBytes(bytes="AAAA", mime_type="image/png"))
+    )
+
+    assert not a2ui_extension.is_a2ui_part(part)
+    assert a2ui_extension.get_a2ui_datapart(part) is None
+
+
+def test_get_a2ui_mime_type(monkeypatch):
+    compact = a2ui_extension.A2UI_COMPACT_MIME_TYPE
+    capabilities = {"supportedCatalogIds": [], "supportedMimeTypes": [compact]}
+    monkeypatch.setattr(
+        a2ui_extension.compact_encoding, "is_compact_encoding_available", lambda: True
+    )
+
+    assert a2ui_extension.get_a2ui_mime_type(capabilities) == compact
+    assert (
+        a2ui_extension.get_a2ui_mime_type({"supportedCatalogIds": []})
+        == a2ui_extension.A2UI_MIME_TYPE
+    )
+    assert a2ui_extension.get_a2ui_mime_type(None) == a2ui_extension.A2UI_MIME_TYPE
+
+    monkeypatch.setattr(
+        a2ui_extension.compact_encoding, "is_compact_encoding_available", lambda: False
+    )
+    assert a2ui_extension.get_a2ui_mime_type(capabilities) == a2ui_extension.A2UI_MIME_TYPE
+
+
+def test_parse_a2ui_part_json():
+    part = a2ui_extension.create_a2ui_part({"beginRendering": {"surfaceId": "s"}})
+
+    parsed = a2ui_extension.parse_a2ui_part_json(part.model_dump_json())
+
+    assert parsed == part
+
+
+def test_parse_a2ui_part_json_rejects_other_text():
+    data_part = Part(root=DataPart(data={"foo": "bar"}))
+
+    assert a2ui_extension.parse_a2ui_part_json("Here are some restaurants.") is None
+    assert a2ui_extension.parse_a2ui_part_json('{"not": "a part"}') is None
+    assert a2ui_extension.parse_a2ui_part_json(data_part.model_dump_json()) is None
@@ -0,0 +1,130 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import pytest
+
+from a2ui import integrity
+
+
+def _column(component_id, *children):
+    return {
+        "id": component_id,
+        "component": {"Column": {"children": {"explicitList": list(children)}}},
+    }
+
+
+def _text(component_id):
+    return {
+        "id": component_id,
+        "component": {"Text": {"text": {"literalString": component_id}}},
+    }
+
+
+def _messages(root, *components):
+    return [
+        {"beginRendering": {"surfaceId": "s1", "root": root}},
+        {"surfaceUpdate": {"surfaceId": "s1", "components": list(components)}},
+    ]
+
+
+def test_valid_tree_has_no_errors():
+    messages = _messages(
+        "root",
+        _column("root", "card", "list"),
+        {"id": "card", "component": {"Card": {"child": "title"}}},
+        _text("title"),
+        {
+            "id": "list",
+            "component": {
+                "List": {
+                    "children": {
+                        "template": {"componentId": "title", "dataBinding": "/items"}
+                    }
+                }
+            },
+        },
+    )
+
+    assert integrity.find_integrity_errors(messages) == []
+    integrity.check_integrity(messages)
+
+
+def test_reports_all_errors_in_one_pass():
+    messages = _messages(
+        "missing-root",
+        _column("root", "title", "dangling"),
+        _text("title"),
+        _text("title"),
+        {"component": {"Text": {}}},
+        {"id": "modal", "component": {"Modal": {"entryPointChild": "button", "contentChild": "title"}}},
+        {
+            "id": "list",
+            "component": {
+                "List": {
+                    "children": {
+                        "template": {"componentId": "row", "dataBinding": "/items"}
+                    }
+                }
+            },
+        },
+    )
+
+    errors = integrity.find_integrity_errors(messages)
+
+    assert errors == [
+        "Duplicate component id 'title' in surface 's1'.",
+        "Component at index 3 in surface 's1' has no id.",
+        "Component 'root' in surface 's1' has a 'explicitList' reference to missing component 'dangling'.",
+        "Component 'modal' in surface 's1' has a 'entryPointChild' reference to missing component 'button'.",
+        "Component 'list' in surface 's1' has a 'template' reference to missing component 'row'.",
+        "beginRendering root 'missing-root' for surface 's1' is not a component.",
+    ]
+    with pytest.raises(integrity.A2uiIntegrityError) as error_info:
+        integrity.check_integrity(messages)
+    assert error_info.value.errors == errors
+
+
+def test_reports_cycles():
+    messages = _messages(
+        "a",
+        _column("a", "b"),
+        {"id": "b", "component": {"Card": {"child": "c"}}},
+        _column("c", "a"),
+    )
+
+    assert integrity.find_integrity_errors(messages) == [
+        "Component cycle in surface 's1': a -> b -> c -> a."
+    ]
+
+
+def test_root_of_surface_without_components_is_not_checked():
+    assert integrity.find_integrity_errors(
+        [{"beginRendering": {"surfaceId": "s1", "root": "root"}}]
+    ) == []
+
+
+def test_linear_on_large_surfaces():
+    # A deep chain and a wide column, both far beyond recursion limits.
+    count = 20000
+    chain = [_column(f"c{i}", f"c{i + 1}") for i in range(count)] + [_text(f"c{count}")]
+    wide = [_column("root", *[f"t{i}" for i in range(count)])] + [
+        _text(f"t{i}") for i in range(count)
+    ]
+
+    start = time.perf_counter()
+    assert integrity.find_integrity_errors(_messages("c0", *chain)) == []
+    assert integrity.find_integrity_errors(_messages("root", *wide)) == []
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,138 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+
+from a2ui import json_repair
+from a2ui.json_repair import JsonRepairer
+
+
+MESSAGES = [
+    {"beginRendering": {"surfaceId": "s1", "root": "root"}},
+    {
+        "dataModelUpdate": {
+            "surfaceId": "s1",
+            "contents": [{"key": "title", "valueString": "Line 1\nLine 2"}],
+        }
+    },
+]
+
+
+def _repair(text):
+    repaired, fixes = json_repair.repair_json(text)
+    return json.loads(repaired), fixes
+
+
+def test_strip_code_fences_keeps_json_characters():
+    # lstrip("```json") would also strip the leading "j" and "s" characters.
+    assert json_repair.strip_code_fences('```json\n"json"\n```') == '"json"'
+    assert json_repair.strip_code_fences("```\n[1]\n```") == "[1]"
+    assert json_repair.strip_code_fences("[1]") == "[1]"
+
+
+def test_valid_json_is_unchanged():
+    text = json.dumps(MESSAGES)
+
+    assert json_repair.repair_json(text) == (text, [])
+
+
+@pytest.mark.parametrize(
+    "text, expected, fixes",
+    [
+        ('[{"a": 1,}, 2, ]', [{"a": 1}, 2], ["trailing_comma"]),
+        ('{"a": [1, 2}', {"a": [1, 2]}, ["mismatched_bracket"]),
+        ('[{"a": 1}}]', [{"a": 1}], ["mismatched_bracket"]),
+        ('[{"a": "b"}] Hope this helps!', [{"a": "b"}], ["trailing_text"]),
+        ('```json\n[1,]\n```', [1], ["trailing_comma"]),
+        ('{"a": "x\ty"}', {"a": "x\ty"}, ["control_character"]),
+    ],
+)
+def test_repairs_syntax_errors(text, expected, fixes):
+    assert _repair(text) == (expected, fixes)
+
+
+def test_escapes_newlines_in_strings():
+    text = json.dumps(MESSAGES).replace("\\n", "\n")
+
+    assert _repair(text) == (MESSAGES, ["control_character"])
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('[{"a": [1, 2', [{"a": [1, 2]}]),
+        ('[{"a": "trunc', [{"a": "trunc"}]),
+        ('[{"a": 1, "b": tr', [{"a": 1}]),
+        ('[{"a": 1, "b": 1.', [{"a": 1}]),
+        ('[{"a": 1, "b":', [{"a": 1}]),
+        ('[{"a": 1, "key', [{"a": 1}]),
+        ('[{"a": 1}, ', [{"a": 1}]),
+        ('[{"a": "x\\', [{"a": "x"}]),
+    ],
+)
+def test_completes_truncated_output(text, expected):
+    value, fixes = _repair(text)
+
+    assert value == expected
+    assert "unclosed_bracket" in fixes
+
+
+def test_repairer_parses_valid_json_without_fixes():
+    repairer = JsonRepairer()
+
+    assert repairer.parse(json.dumps(MESSAGES)) == (MESSAGES, [])
+    assert repairer.counters == {"parsed": 1}
+
+
+def test_repairer_does_not_count_code_fence_as_repair():
+    repairer = JsonRepairer()
+
+    text = "```json\n" + json.dumps(MESSAGES) + "\n```"
+
+    assert repairer.parse(text) == (MESSAGES, [])
+    assert repairer.counters == {"parsed": 1}
+
+
+def test_repairer_wraps_single_object():
+    repairer = JsonRepairer()
+
+    value, fixes = repairer.parse(json.dumps(MESSAGES[0]), expect_array=True)
+
+    assert value == [MESSAGES[0]]
+    assert fixes == ["wrapped_object"]
+
+
+def test_repairer_counts_attempts_and_results():
+    repairer = JsonRepairer()
+
+    assert repairer.parse('[{"a": 1,},]')[0] == [{"a": 1}]
+    with pytest.raises(json.JSONDecodeError):
+        repairer.parse('[{"a" 1}]')
+
+    assert repairer.counters == {
+        "attempts": 2,
+        "repaired": 1,
+        "failed": 1,
+        "trailing_comma": 1,
+        "parsed": 1,
+    }
+    repairer.reset_counters()
+    assert repairer.counters == {}
+
+
+def test_repairer_rejects_empty_text():
+    with pytest.raises(ValueError):
+        JsonRepairer().parse("```json\n```")
@@ -0,0 +1,137 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from a2a.types import DataPart, TextPart
+
+from a2ui.a2ui_extension import is_a2ui_part
+from a2ui.response_assembler import A2uiResponseAssembler
+from a2ui.validator import A2uiValidator
+
+MESSAGES = [
+    {"beginRendering": {"surfaceId": "s1", "root": "root"}},
+    {"surfaceUpdate": {"surfaceId": "s1", "components": []}},
+    {"dataModelUpdate": {"surfaceId": "s1", "contents": []}},
+]
+CONTENT = "Here you go.\n---a2ui_JSON---\n```json\n" + json.dumps(MESSAGES) + "\n```"
+
+
+def _summary(parts):
+    return [
+        part.root.data if is_a2ui_part(part) else part.root.text for part in parts
+    ]
+
+
+def test_finish_plain_text():
+    parts = A2uiResponseAssembler().finish("  Just text.  ")
+
+    assert _summary(parts) == ["Just text."]
+
+
+def test_finish_splits_text_and_messages():
+    parts = A2uiResponseAssembler().finish(CONTENT)
+
+    assert _summary(parts) == ["Here you go."] + MESSAGES
+    assert all(isinstance(part.root, DataPart) for part in parts[1:])
+
+
+def test_invalid_json_falls_back_to_text():
+    parts = A2uiResponseAssembler().finish("Hi---a2ui_JSON---[{]")
+
+    assert _summary(parts) == ["Hi", "[{]"]
+    assert all(isinstance(part.root, TextPart) for part in parts)
+
+
+def test_validation_failure_falls_back_to_text():
+    validator = A2uiValidator({"type": "object", "required": ["beginRendering"]}, as_array=True)
+
+    parts = A2uiResponseAssembler(validate=validator.validate).finish(CONTENT)
+
+    assert len(parts) == 2
+    assert all(isinstance(part.root, TextPart) for part in parts)
+
+
+def test_transforms_are_applied_in_order():
+    calls = []
+
+    def drop_first(messages):
+        calls.append("drop_first")
+        return messages[1:]
+
+    def reverse(messages):
+        calls.append("reverse")
+        return messages[::-1]
+
+    parts = A2uiResponseAssembler(transforms=[drop_first, reverse]).finish(CONTENT)
+
+    assert _summary(parts) == ["Here you go.", MESSAGES[2], MESSAGES[1]]
+    assert calls == ["drop_first", "reverse"]
+
+
+def test_streamed_messages_are_not_sent_again():
+    assembler = A2uiResponseAssembler()
+    split = CONTENT.index("surfaceUpdate") + 10
+
+    streamed = assembler.feed(CONTENT[:split]) + assembler.feed(CONTENT[split:])
+    final = assembler.finish(CONTENT)
+
+    assert _summary(streamed) == MESSAGES
+    assert assembler.streamed_message_count == 3
+    assert _summary(final) == ["Here you go."]
+
+
+def test_different_final_content_is_parsed_on_its_own():
+    assembler = A2uiResponseAssembler()
+    fallback = [{"beginRendering": {"surfaceId": "main", "root": "card"}}]
+    split = CONTENT.index("surfaceUpdate") - 3
+
+    streamed = assembler.feed(CONTENT[:split])
+    final = assembler.finish(
+        "Sorry, try again.\n---a2ui_JSON---\n" + json.dumps(fallback)
+    )
+
+    assert _summary(streamed) == MESSAGES[:1]
+    assert _summary(final) == ["Sorry, try again."] + fallback
+
+
+def test_different_final_text_is_sent_after_a_partial_stream():
+    assembler = A2uiResponseAssembler()
+
+    assembler.feed(CONTENT[: CONTENT.index("surfaceUpdate") - 3])
+
+    assert _summary(assembler.finish("Sorry, try again.")) == ["Sorry, try again."]
+
+
+def test_streaming_failure_defers_to_finish():
+    assembler = A2uiResponseAssembler()
+    content = "Hi---a2ui_JSON---[" + json.dumps(MESSAGES[0]) + ", {bad}]"
+
+    assert _summary(assembler.feed(content)) == []
+    parts = assembler.finish(content)
+
+    assert all(isinstance(part.root, TextPart) for part in parts)
+    with pytest.raises(ValueError):
+        assembler.feed("more")
+
+
+def test_finish_messages_skips_parsing():
+    assembler = A2uiResponseAssembler(transforms=[lambda messages: messages[:1]])
+
+    parts = assembler.finish_messages(" Done. ", MESSAGES)
+
+    assert _summary(parts) == ["Done.", MESSAGES[0]]
+    with pytest.raises(ValueError):
+        assembler.finish_messages("", MESSAGES)
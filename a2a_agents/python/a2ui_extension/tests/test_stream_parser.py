@@ -0,0 +1,131 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+
+from a2ui import stream_parser
+
+MESSAGES = [
+    {"beginRendering": {"surfaceId": "default", "root": "root-column"}},
+    {
+        "surfaceUpdate": {
+            "surfaceId": "default",
+            "components": [
+                {
+                    "id": "title",
+                    "component": {
+                        "Text": {"text": {"literalString": 'Braces } { and "quotes" \\'}}
+                    },
+                }
+            ],
+        }
+    },
+    {
+        "dataModelUpdate": {
+            "surfaceId": "default",
+            "path": "/",
+            "contents": [{"key": "title", "valueString": "Top 5\nrestaurants"}],
+        }
+    },
+]
+
+RESPONSE = (
+    "Here are some restaurants.\n---a2ui_JSON---\n```json\n"
+    + json.dumps(MESSAGES, indent=2)
+    + "\n```"
+)
+
+
+def _feed_in_chunks(parser, content, size):
+    items = []
+    for i in range(0, len(content), size):
+        items.extend(parser.feed(content[i : i + size]))
+    items.extend(parser.close())
+    return items
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, len(RESPONSE)])
+def test_feed_chunks_yields_text_then_messages(chunk_size):
+    parser = stream_parser.A2uiStreamParser()
+
+    items = _feed_in_chunks(parser, RESPONSE, chunk_size)
+
+    text = "".join(item for item in items if isinstance(item, str))
+    messages = [item for item in items if isinstance(item, dict)]
+    assert text == "Here are some restaurants.\n"
+    assert parser.text == text
+    assert messages == MESSAGES
+    assert parser.message_count == len(MESSAGES)
+    assert parser.found_delimiter
+
+
+def test_message_emitted_when_closing_brace_arrives():
+    parser = stream_parser.A2uiStreamParser()
+    first = json.dumps(MESSAGES[0])
+
+    assert parser.feed("Text---a2ui_JSON---[" + first[:-1]) == ["Text"]
+    assert parser.feed(first[-1]) == [MESSAGES[0]]
+    assert parser.feed(", {") == []
+
+
+def test_text_is_held_back_only_while_it_may_be_the_delimiter():
+    parser = stream_parser.A2uiStreamParser()
+
+    assert parser.feed("Hello ---a2") == ["Hello "]
+    assert parser.feed("ui") == []
+    assert parser.feed("!") == ["---a2ui!"]
+
+
+def test_response_without_delimiter_is_text():
+    parser = stream_parser.A2uiStreamParser()
+
+    items = _feed_in_chunks(parser, "Just text, no UI ---a2ui", 5)
+
+    assert "".join(items) == "Just text, no UI ---a2ui"
+    assert not parser.found_delimiter
+
+
+def test_single_object_and_empty_list():
+    assert stream_parser.parse_a2ui_response(
+        "Text---a2ui_JSON---" + json.dumps(MESSAGES[0])
+    ) == ("Text", [MESSAGES[0]])
+    assert stream_parser.parse_a2ui_response("No results.---a2ui_JSON---[]") == (
+        "No results.",
+        [],
+    )
+
+
+def test_truncated_message_raises_on_close():
+    parser = stream_parser.A2uiStreamParser()
+    parser.feed('---a2ui_JSON---[{"beginRendering": {"surfaceId": "s"')
+
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_invalid_message_raises():
+    parser = stream_parser.A2uiStreamParser()
+
+    with pytest.raises(json.JSONDecodeError):
+        parser.feed("---a2ui_JSON---[{'beginRendering': {}}]")
+
+
+def test_feed_after_close_raises():
+    parser = stream_parser.A2uiStreamParser()
+    parser.close()
+
+    with pytest.raises(ValueError):
+        parser.feed("text")
@@ -0,0 +1,103 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from a2ui.surface_state import SurfaceStateStore
+
+
+def _text(component_id, text):
+    return {
+        "id": component_id,
+        "component": {"Text": {"text": {"literalString": text}}},
+    }
+
+
+def _surface_update(surface_id, *components):
+    return {"surfaceUpdate": {"surfaceId": surface_id, "components": list(components)}}
+
+
+BEGIN_RENDERING = {"beginRendering": {"surfaceId": "s1", "root": "title"}}
+
+
+def test_first_surface_update_is_sent_in_full():
+    store = SurfaceStateStore()
+    messages = [BEGIN_RENDERING, _surface_update("s1", _text("title", "Hi"))]
+
+    assert store.minimize_messages("ctx", messages) == messages
+
+
+def test_only_changed_and_added_components_are_sent():
+    store = SurfaceStateStore()
+    store.minimize_message(
+        "ctx", _surface_update("s1", _text("title", "Hi"), _text("body", "One"))
+    )
+
+    minimized = store.minimize_message(
+        "ctx",
+        _surface_update(
+            "s1", _text("title", "Hi"), _text("body", "Two"), _text("footer", "New")
+        ),
+    )
+
+    assert minimized == _surface_update(
+        "s1", _text("body", "Two"), _text("footer", "New")
+    )
+
+
+def test_unchanged_surface_update_is_dropped():
+    store = SurfaceStateStore()
+    message = _surface_update("s1", _text("title", "Hi"))
+    store.minimize_message("ctx", message)
+
+    assert store.minimize_messages("ctx", [BEGIN_RENDERING, message]) == [
+        BEGIN_RENDERING
+    ]
+
+
+def test_contexts_and_surfaces_are_independent():
+    store = SurfaceStateStore()
+    message = _surface_update("s1", _text("title", "Hi"))
+    store.minimize_message("ctx", message)
+
+    assert store.minimize_message("other-ctx", message) == message
+    other_surface = _surface_update("s2", _text("title", "Hi"))
+    assert store.minimize_message("ctx", other_surface) == other_surface
+
+
+def test_delete_surface_forgets_components():
+    store = SurfaceStateStore()
+    message = _surface_update("s1", _text("title", "Hi"))
+    store.minimize_message("ctx", message)
+
+    delete_surface = {"deleteSurface": {"surfaceId": "s1"}}
+    assert store.minimize_message("ctx", delete_surface) == delete_surface
+    assert store.minimize_message("ctx", message) == message
+
+
+def test_forget_context():
+    store = SurfaceStateStore()
+    message = _surface_update("s1", _text("title", "Hi"))
+    store.minimize_message("ctx", message)
+
+    store.forget("ctx")
+
+    assert store.minimize_message("ctx", message) == message
+
+
+def test_least_recently_used_context_is_evicted():
+    store = SurfaceStateStore(max_contexts=1)
+    message = _surface_update("s1", _text("title", "Hi"))
+    store.minimize_message("ctx-1", message)
+    store.minimize_message("ctx-2", message)
+
+    assert store.minimize_message("ctx-1", message) == message
@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from a2ui.templates import A2uiTemplate, extract_examples
+
+EXAMPLES = """
+Intro text.
+---BEGIN FORM_EXAMPLE---
+[
+  {{ "beginRendering": {{ "surfaceId": "form", "root": "title" }} }},
+  {{ "surfaceUpdate": {{ "surfaceId": "form", "components": [
+    {{ "id": "title", "component": {{ "Text": {{ "text": {{ "path": "title" }} }} }} }}
+  ] }} }},
+  {{ "dataModelUpdate": {{ "surfaceId": "form", "path": "/", "contents": [
+    {{ "key": "title", "valueString": "Book [Name]" }},
+    {{ "key": "partySize", "valueString": "2" }}
+  ] }} }}
+]
+---END FORM_EXAMPLE---
+---BEGIN OTHER_EXAMPLE---
+[]
+---END OTHER_EXAMPLE---
+"""
+
+
+def _form_template(**kwargs):
+    return A2uiTemplate.from_example(
+        extract_examples(EXAMPLES)["FORM_EXAMPLE"],
+        data={"title": "Book {name}", "address": "{address}"},
+        **kwargs,
+    )
+
+
+def test_extract_examples():
+    examples = extract_examples(EXAMPLES)
+
+    assert list(examples) == ["FORM_EXAMPLE", "OTHER_EXAMPLE"]
+    assert examples["OTHER_EXAMPLE"] == "[]"
+
+
+def test_render_fills_bound_values_and_keeps_the_rest():
+    template = _form_template(defaults={"address": "Unknown"}, text="Booking {name}.")
+
+    text, messages = template.render({"name": "Pizzeria", "ignored": 1})
+
+    assert text == "Booking Pizzeria."
+    assert messages[2]["dataModelUpdate"] == {
+        "surfaceId": "form",
+        "path": "/",
+        "contents": [
+            {"key": "title", "valueString": "Book Pizzeria"},
+            {"key": "partySize", "valueString": "2"},
+            {"key": "address", "valueString": "Unknown"},
+        ],
+    }
+
+
+def test_renders_share_static_messages_but_not_data():
+    template = _form_template(defaults={"address": ""})
+
+    _, first = template.render({"name": "A"})
+    _, second = template.render({"name": "B"})
+
+    assert first[1] is second[1]
+    assert first[2]["dataModelUpdate"]["contents"][0]["valueString"] == "Book A"
+    assert second[2]["dataModelUpdate"]["contents"][0]["valueString"] == "Book B"
+
+
+def test_missing_fields_raise_key_error():
+    template = _form_template()
+
+    assert template.required_fields == {"name", "address"}
+    with pytest.raises(KeyError, match="address, name"):
+        template.render({})
+
+
+def test_data_requires_a_data_model_update():
+    with pytest.raises(ValueError):
+        A2uiTemplate([{"deleteSurface": {"surfaceId": "s"}}], data={"a": "{a}"})
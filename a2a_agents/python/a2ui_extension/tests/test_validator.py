@@ -0,0 +1,120 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import jsonschema
+import pytest
+
+from a2ui import validator
+
+MESSAGE_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "properties": {
+        "beginRendering": {
+            "type": "object",
+            "properties": {
+                "surfaceId": {"type": "string"},
+                "root": {"type": "string"},
+            },
+            "required": ["surfaceId", "root"],
+        },
+    },
+}
+
+VALID_MESSAGE = {"beginRendering": {"surfaceId": "s1", "root": "root-column"}}
+INVALID_MESSAGE = {"beginRendering": {"surfaceId": "s1"}}
+
+
+def test_validate_single_message():
+    a2ui_validator = validator.A2uiValidator(MESSAGE_SCHEMA)
+
+    a2ui_validator.validate(VALID_MESSAGE)
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        a2ui_validator.validate(INVALID_MESSAGE)
+
+
+def test_validate_message_list():
+    a2ui_validator = validator.A2uiValidator(MESSAGE_SCHEMA, as_array=True)
+
+    assert a2ui_validator.is_valid([VALID_MESSAGE, VALID_MESSAGE])
+    assert not a2ui_validator.is_valid([VALID_MESSAGE, INVALID_MESSAGE])
+    assert not a2ui_validator.is_valid(VALID_MESSAGE)
+
+
+def test_invalid_schema_raises_schema_error():
+    with pytest.raises(jsonschema.exceptions.SchemaError):
+        validator.A2uiValidator({"type": 12})
+
+
+def test_cache_key_prefers_catalog_id():
+    assert (
+        validator.get_schema_cache_key(MESSAGE_SCHEMA, catalog_id="my-catalog")
+        == "my-catalog"
+    )
+    assert validator.get_schema_cache_key(
+        MESSAGE_SCHEMA
+    ) == validator.get_schema_cache_key(dict(reversed(MESSAGE_SCHEMA.items())))
+
+
+def test_cache_returns_same_validator():
+    cache = validator.ValidatorCache()
+
+    first = cache.get(MESSAGE_SCHEMA, as_array=True)
+    assert cache.get(MESSAGE_SCHEMA, as_array=True) is first
+    assert cache.get(MESSAGE_SCHEMA, as_array=False) is not first
+    assert cache.get(MESSAGE_SCHEMA, catalog_id="my-catalog") is not first
+    assert len(cache) == 3
+
+
+def test_cache_evicts_least_recently_used():
+    cache = validator.ValidatorCache(max_size=2)
+
+    first = cache.get(MESSAGE_SCHEMA, catalog_id="a")
+    cache.get(MESSAGE_SCHEMA, catalog_id="b")
+    cache.get(MESSAGE_SCHEMA, catalog_id="a")
+    cache.get(MESSAGE_SCHEMA, catalog_id="c")
+
+    assert len(cache) == 2
+    assert cache.get(MESSAGE_SCHEMA, catalog_id="a") is first
+
+
+def test_get_validator_uses_process_cache():
+    validator.clear_validator_cache()
+
+    first = validator.get_validator(MESSAGE_SCHEMA, as_array=True)
+    assert validator.get_validator(MESSAGE_SCHEMA, as_array=True) is first
+
+    validator.clear_validator_cache()
+    assert validator.get_validator(MESSAGE_SCHEMA, as_array=True) is not first
+
+
+def test_validator_resolves_refs_with_registry():
+    referencing = pytest.importorskip("referencing")
+    catalog = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "$id": "https://example.com/catalog.json",
+        "$defs": {"Text": {"type": "object", "required": ["text"]}},
+    }
+    schema = {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "$ref": "https://example.com/catalog.json#/$defs/Text",
+    }
+    registry = referencing.Registry().with_resource(
+        catalog["$id"], referencing.Resource.from_contents(catalog)
+    )
+
+    a2ui_validator = validator.A2uiValidator(schema, registry=registry)
+
+    assert a2ui_validator.is_valid({"text": "hi"})
+    assert not a2ui_validator.is_valid({})
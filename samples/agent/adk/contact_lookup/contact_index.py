@@ -0,0 +1,252 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import bisect
+import json
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# The base URL the image URLs in the data file are written with.
+DEFAULT_BASE_URL = "http://localhost:10002"
+
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+
+
+def _normalize(text: str) -> str:
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def _intersect(postings: list[list[int]]) -> list[int]:
+    """Intersects sorted postings lists, starting with the shortest."""
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        matched = []
+        lo = 0
+        for doc in result:
+            lo = bisect.bisect_left(other, doc, lo)
+            if lo == len(other):
+                break
+            if other[lo] == doc:
+                matched.append(doc)
+        result = matched
+        if not result:
+            break
+    return result
+
+
+class _TrigramIndex:
+    """Sorted postings lists of document ids by trigram of a field."""
+
+    def __init__(self):
+        self.texts: dict[int, str] = {}
+        self.postings: dict[str, list[int]] = {}
+
+    def add(self, doc: int, text: str) -> None:
+        # Document ids only grow, so appending keeps the postings sorted.
+        text = _normalize(text)
+        self.texts[doc] = text
+        for trigram in _trigrams(f" {text} "):
+            self.postings.setdefault(trigram, []).append(doc)
+
+    def remove(self, doc: int) -> None:
+        text = self.texts.pop(doc)
+        for trigram in _trigrams(f" {text} "):
+            posting = self.postings[trigram]
+            del posting[bisect.bisect_left(posting, doc)]
+            if not posting:
+                del self.postings[trigram]
+
+    def find(self, query: str) -> Iterable[int]:
+        """Returns the documents whose text contains the query, in id order."""
+        trigrams = _trigrams(query)
+        if not trigrams:
+            # Too short for trigrams; check every document.
+            candidates: Iterable[int] = self.texts
+        elif any(trigram not in self.postings for trigram in trigrams):
+            return []
+        else:
+            candidates = _intersect([self.postings[t] for t in trigrams])
+        return [doc for doc in candidates if query in self.texts[doc]]
+
+    def find_similar(self, query: str, min_score: float) -> list[tuple[float, int]]:
+        """Returns (score, document) pairs for texts sharing trigrams with the query.
+
+        The score is the share of the query's trigrams, with word boundaries,
+        that the text contains.
+        """
+        trigrams = _trigrams(f" {query} ")
+        shared: Counter[int] = Counter()
+        for trigram in trigrams:
+            shared.update(self.postings.get(trigram, ()))
+        return [
+            (count / len(trigrams), doc)
+            for doc, count in shared.items()
+            if count / len(trigrams) >= min_score
+        ]
+
+
+class ContactIndex:
+    """A trigram index over the names and departments of contacts.
+
+    Each name and department is indexed by its character trigrams. A query's
+    trigrams select candidates by intersecting sorted postings lists, which
+    are then checked for the substring, so lookups only touch contacts that
+    share every trigram with the query.
+
+    Substring matches are ranked exact name first, then names with a word
+    starting with the query, then the rest. When no name contains the query,
+    names sharing most of its trigrams are returned instead, so typos such as
+    "Alx Jordan" still find "Alex Jordan". Ties keep the order the contacts
+    were added in.
+
+    Contacts can be added and removed without rebuilding the index. Instances
+    are thread safe.
+    """
+
+    def __init__(
+        self,
+        contacts: Iterable[dict[str, Any]] = (),
+        min_fuzzy_score: float = 0.5,
+        max_fuzzy_results: int = 10,
+    ):
+        """Builds the index.
+
+        Args:
+            contacts: The contacts. Each has an `id`, a `name` and a
+                `department`.
+            min_fuzzy_score: The share of the query's trigrams a name must
+                contain to be a fuzzy match.
+            max_fuzzy_results: The maximum number of fuzzy matches returned.
+        """
+        self._min_fuzzy_score = min_fuzzy_score
+        self._max_fuzzy_results = max_fuzzy_results
+        self._lock = threading.Lock()
+        self._next_doc = 0
+        self._docs: dict[str, int] = {}
+        self._contacts: dict[int, dict[str, Any]] = {}
+        self._names = _TrigramIndex()
+        self._departments = _TrigramIndex()
+        # Serialized contacts by base URL, filled on demand.
+        self._serialized: dict[str, dict[int, str]] = {}
+        for contact in contacts:
+            self._add(contact)
+
+    @classmethod
+    def from_file(cls, file_path: str, **kwargs: Any) -> "ContactIndex":
+        """Builds the index from a JSON list of contacts."""
+        with open(file_path) as f:
+            contacts = json.load(f)
+        logger.info(f"Indexing {len(contacts)} contacts from {file_path}")
+        return cls(contacts, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._contacts)
+
+    def add(self, contact: dict[str, Any]) -> None:
+        """Adds a contact, replacing the contact with the same id."""
+        with self._lock:
+            self._add(contact)
+
+    def remove(self, contact_id: str) -> bool:
+        """Removes a contact. Returns whether it was in the index."""
+        with self._lock:
+            return self._remove(contact_id)
+
+    def search(self, name: str, department: str = "") -> list[dict[str, Any]]:
+        """Returns the contacts matching the name and, if set, the department."""
+        with self._lock:
+            return [self._contacts[doc] for doc in self._search(name, department)]
+
+    def search_json(
+        self, name: str, department: str = "", base_url: Optional[str] = None
+    ) -> str:
+        """Like `search`, but returns the contacts as a JSON list with image URLs
+        rewritten for the base URL."""
+        base_url = base_url or DEFAULT_BASE_URL
+        with self._lock:
+            serialized = self._serialized.setdefault(base_url, {})
+            items = []
+            for doc in self._search(name, department):
+                if doc not in serialized:
+                    serialized[doc] = json.dumps(self._contacts[doc]).replace(
+                        DEFAULT_BASE_URL, base_url
+                    )
+                items.append(serialized[doc])
+        return "[" + ", ".join(items) + "]"
+
+    def _add(self, contact: dict[str, Any]) -> None:
+        contact_id = str(contact["id"])
+        self._remove(contact_id)
+        doc = self._next_doc
+        self._next_doc += 1
+        self._docs[contact_id] = doc
+        self._contacts[doc] = contact
+        self._names.add(doc, contact.get("name", ""))
+        self._departments.add(doc, contact.get("department", ""))
+
+    def _remove(self, contact_id: str) -> bool:
+        doc = self._docs.pop(str(contact_id), None)
+        if doc is None:
+            return False
+        del self._contacts[doc]
+        self._names.remove(doc)
+        self._departments.remove(doc)
+        for serialized in self._serialized.values():
+            serialized.pop(doc, None)
+        return True
+
+    def _search(self, name: str, department: str) -> list[int]:
+        name = _normalize(name)
+        department = _normalize(department)
+
+        # Name matches are few, so their departments are checked directly.
+        def in_department(doc: int) -> bool:
+            return department in self._departments.texts[doc]
+
+        if name:
+            docs = [doc for doc in self._names.find(name) if in_department(doc)]
+        else:
+            docs = list(self._departments.find(department))
+        if docs:
+            return sorted(docs, key=lambda doc: self._rank(name, doc))
+
+        if not name:
+            return []
+        similar = [
+            (score, doc)
+            for score, doc in self._names.find_similar(name, self._min_fuzzy_score)
+            if in_department(doc)
+        ]
+        similar.sort(key=lambda item: (-item[0], item[1]))
+        if similar:
+            logger.info(f"No contact named '{name}', returning fuzzy matches.")
+        return [doc for _, doc in similar[: self._max_fuzzy_results]]
+
+    def _rank(self, name: str, doc: int) -> tuple[int, int]:
+        text = self._names.texts[doc]
+        if text == name:
+            return 0, doc
+        if text.startswith(name) or f" {name}" in text:
+            return 1, doc
+        return 2, doc
@@ -0,0 +1,129 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+
+import pytest
+
+import tools
+from contact_index import DEFAULT_BASE_URL, ContactIndex, _intersect
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "contact_data.json")
+
+CONTACTS = [
+    {"id": "1", "name": "Jordan Taylor", "department": "Engineering"},
+    {"id": "2", "name": "Alex Jordan", "department": "Marketing"},
+    {"id": "3", "name": "Jordan", "department": "Sales"},
+    {"id": "4", "name": "Casey Smith", "department": "Marketing"},
+    {"id": "5", "name": "Sam Ajordana", "department": "Marketing"},
+]
+
+
+def names(contacts):
+    return [contact["name"] for contact in contacts]
+
+
+@pytest.fixture
+def index():
+    return ContactIndex(CONTACTS)
+
+
+def assert_postings_consistent(index):
+    for field in (index._names, index._departments):
+        for trigram, posting in field.postings.items():
+            assert posting == sorted(set(posting))
+            for doc in posting:
+                assert trigram in f" {field.texts[doc]} "
+        assert set(field.texts) == set(index._contacts)
+
+
+def test_intersect():
+    assert _intersect([[1, 3, 5, 7], [3, 4, 5], [0, 3, 5, 9]]) == [3, 5]
+    assert _intersect([[1, 2], [3, 4]]) == []
+    assert _intersect([[2, 4, 6]]) == [2, 4, 6]
+
+
+def test_finds_substring_matches(index):
+    assert set(names(index.search("jord"))) == {
+        "Jordan Taylor",
+        "Alex Jordan",
+        "Jordan",
+        "Sam Ajordana",
+    }
+    assert names(index.search("smith")) == ["Casey Smith"]
+
+
+def test_ranks_exact_then_word_prefix_then_substring(index):
+    assert names(index.search("Jordan")) == [
+        "Jordan",
+        "Jordan Taylor",
+        "Alex Jordan",
+        "Sam Ajordana",
+    ]
+
+
+def test_falls_back_to_fuzzy_matches_for_typos(index):
+    assert names(index.search("Alx Jordan"))[0] == "Alex Jordan"
+    assert index.search("Zzzz Qqqq") == []
+
+
+def test_filters_by_department(index):
+    assert names(index.search("jordan", department="marketing")) == [
+        "Alex Jordan",
+        "Sam Ajordana",
+    ]
+    assert names(index.search("", department="Engineering")) == ["Jordan Taylor"]
+    assert index.search("Casey", department="Sales") == []
+
+
+def test_add_and_remove_keep_postings_consistent(index):
+    index.add({"id": "6", "name": "Jordan Lee", "department": "Sales"})
+    assert_postings_consistent(index)
+    assert "Jordan Lee" in names(index.search("jordan"))
+
+    # Replacing a contact re-indexes it under its new name.
+    index.add({"id": "1", "name": "Taylor Brooks", "department": "Engineering"})
+    assert_postings_consistent(index)
+    assert "Jordan Taylor" not in names(index.search("jordan"))
+    assert names(index.search("brooks")) == ["Taylor Brooks"]
+
+    assert index.remove("2")
+    assert not index.remove("2")
+    assert_postings_consistent(index)
+    assert "Alex Jordan" not in names(index.search("jordan"))
+    assert len(index) == 5
+
+
+def test_search_json_rewrites_base_url():
+    index = ContactIndex.from_file(DATA_FILE)
+
+    default = json.loads(index.search_json("Alex Jordan"))
+    assert default[0]["imageUrl"].startswith(DEFAULT_BASE_URL)
+
+    rewritten = json.loads(index.search_json("Alex Jordan", base_url="https://contacts.example.com"))
+    assert rewritten[0]["imageUrl"] == "https://contacts.example.com/static/profile1.png"
+    assert names(rewritten) == names(default)
+
+
+def test_index_is_built_on_first_lookup(monkeypatch, tmp_path):
+    monkeypatch.setattr(tools, "_index", None)
+    monkeypatch.setattr(tools, "_DATA_FILE", str(tmp_path / "contact_data.json"))
+
+    # A missing data file isn't cached, so a later lookup retries.
+    assert tools._get_index() is None
+    (tmp_path / "contact_data.json").write_text(json.dumps(CONTACTS))
+    index = tools._get_index()
+    assert len(index) == len(CONTACTS)
+    assert tools._get_index() is index
@@ -15,11 +15,36 @@
 import json
 import logging
 import os
+import threading
+from typing import Optional
 
+from contact_index import ContactIndex
 from google.adk.tools.tool_context import ToolContext
 
 logger = logging.getLogger(__name__)
 
+_DATA_FILE = os.path.join(os.path.dirname(__file__), "contact_data.json")
+_index_lock = threading.Lock()
+# Built on the first lookup. Use `_get_index().add` and `.remove` to keep it current.
+_index: Optional[ContactIndex] = None
+
+
+def _get_index() -> Optional[ContactIndex]:
+    """Returns the contact index, building it on first use, or None if the data file can't be loaded."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                try:
+                    _index = ContactIndex.from_file(_DATA_FILE)
+                except FileNotFoundError:
+                    logger.error(f"  - Error: contact_data.json not found at {_DATA_FILE}")
+                except OSError as e:
+                    logger.error(f"  - Error: Failed to read {_DATA_FILE}: {e}")
+                except json.JSONDecodeError:
+                    logger.error(f"  - Error: Failed to decode JSON from {_DATA_FILE}")
+    return _index
+
 
 def get_contact_info(name: str, tool_context: ToolContext, department: str = "") -> str:
     """Call this tool to get a list of contacts based on a name and optional department.
@@ -30,39 +55,10 @@ def get_contact_info(name: str, tool_context: ToolContext, department: str = "")
     logger.info(f"  - Name: {name}")
     logger.info(f"  - Department: {department}")
 
-    results = []
-    try:
-        script_dir = os.path.dirname(__file__)
-        file_path = os.path.join(script_dir, "contact_data.json")
-        with open(file_path) as f:
-            contact_data_str = f.read()
-            if base_url := tool_context.state.get("base_url"):                
-                contact_data_str = contact_data_str.replace("http://localhost:10002", base_url)
-                logger.info(f'Updated base URL from tool context: {base_url}')
-            all_contacts = json.loads(contact_data_str)        
-
-        name_lower = name.lower()
-
-        dept_lower = department.lower() if department else ""
-
-        # Filter by name
-        results = [
-            contact for contact in all_contacts if name_lower in contact["name"].lower()
-        ]
-
-        # If department is provided, filter results further
-        if dept_lower:
-            results = [
-                contact
-                for contact in results
-                if dept_lower in contact["department"].lower()
-            ]
-
-        logger.info(f"  - Success: Found {len(results)} matching contacts.")
-
-    except FileNotFoundError:
-        logger.error(f"  - Error: contact_data.json not found at {file_path}")
-    except json.JSONDecodeError:
-        logger.error(f"  - Error: Failed to decode JSON from {file_path}")
+    if (index := _get_index()) is None:
+        return json.dumps([])
 
-    return json.dumps(results)
+    base_url = tool_context.state.get("base_url")
+    results = index.search_json(name, department, base_url=base_url)
+    logger.info(f"  - Success: Searched {len(index)} contacts.")
+    return results
@@ -13,13 +13,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import json
 import logging
 import os
-from collections.abc import AsyncIterable
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 from google.adk.agents.llm_agent import LlmAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.models.lite_llm import LiteLlm
@@ -28,6 +33,7 @@ from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
 from .prompt_builder import get_generator_prompt, get_selector_prompt
+from .utils.intent_classifier import DEFAULT_MODEL_PATH, IntentClassifier, decision_label
 from .utils.searcher import TemplateSearcher
 
 logger = logging.getLogger(__name__)
@@ -38,14 +44,19 @@ class GenericChatAgent:
 
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, max_runners: int = 64):
         self.base_url = base_url
         self._user_id = "generic_agent_user"
-        
-        # We will spin up a fresh runner/agent for each turn in this PoC to strictly separate instructions
-        # calling it "multi-turn within one request" style
-        # We will spin up a fresh runner/agent for each turn in this PoC to strictly separate instructions
-        # calling it "multi-turn within one request" style
+
+        # Each instruction (selector prompt per candidate set, generator prompt per template)
+        # gets its own runner to strictly separate instructions. Runners are pooled by
+        # instruction and share one set of services; each turn runs in a fresh session
+        # that is deleted afterwards, so turns never see each other's history.
+        self._max_runners = max_runners
+        self._runners: OrderedDict[str, Runner] = OrderedDict()
+        self._session_service = InMemorySessionService()
+        self._artifact_service = InMemoryArtifactService()
+        self._memory_service = InMemoryMemoryService()
         self.model_name = os.getenv("LITELLM_MODEL", "gemini/gemini-2.0-flash-exp")
         
         # Initialize the searcher (computes embeddings on startup)
@@ -55,6 +66,22 @@ class GenericChatAgent:
             logger.error(f"Failed to initialize TemplateSearcher: {e}")
             self.searcher = None
 
+        # Start generating with the top search candidate while the selector runs, and skip
+        # the selector entirely when the top candidate's similarity reaches the threshold.
+        self.speculative = os.getenv("SPECULATIVE_GENERATION", "false").lower() == "true"
+        skip_selector_score = os.getenv("SKIP_SELECTOR_SCORE")
+        self.skip_selector_score = float(skip_selector_score) if skip_selector_score else None
+
+        # A local classifier trained on logged selector decisions answers instead of the
+        # selector when it is confident. Train it with scripts/train_intent_classifier.py
+        # from the log written to SELECTOR_DECISION_LOG.
+        self.intent_classifier = IntentClassifier.load(os.getenv("INTENT_CLASSIFIER_PATH", DEFAULT_MODEL_PATH))
+        if self.intent_classifier and self.searcher and self.intent_classifier.model_name != self.searcher.model_name:
+            logger.warning("Intent classifier was trained with a different embedding model, not using it.")
+            self.intent_classifier = None
+        self.intent_threshold = float(os.getenv("INTENT_CLASSIFIER_THRESHOLD", "0.9"))
+        self.decision_log_path = os.getenv("SELECTOR_DECISION_LOG")
+
     def _create_runner(self, instruction: str) -> Runner:
         agent = LlmAgent(
             model=LiteLlm(model=self.model_name),
@@ -66,101 +93,185 @@ class GenericChatAgent:
         return Runner(
             app_name=agent.name,
             agent=agent,
-            artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
-            memory_service=InMemoryMemoryService(),
+            artifact_service=self._artifact_service,
+            session_service=self._session_service,
+            memory_service=self._memory_service,
         )
 
+    def _get_runner(self, instruction: str) -> Runner:
+        """Returns the pooled runner for the instruction, evicting the least recently used."""
+        runner = self._runners.get(instruction)
+        if runner is not None:
+            self._runners.move_to_end(instruction)
+            return runner
+        runner = self._create_runner(instruction)
+        self._runners[instruction] = runner
+        if len(self._runners) > self._max_runners:
+            self._runners.popitem(last=False)
+        logger.info(f"Created runner {len(self._runners)}/{self._max_runners} for a new instruction.")
+        return runner
+
+    @asynccontextmanager
+    async def _scoped_session(self, runner: Runner, session_id: str) -> AsyncIterator[str]:
+        """Creates a single-use session for one run and deletes it afterwards."""
+        scoped_session_id = f"{session_id}_{uuid.uuid4().hex}"
+        await runner.session_service.create_session(
+            app_name=runner.app_name,
+            user_id=self._user_id,
+            session_id=scoped_session_id
+        )
+        try:
+            yield scoped_session_id
+        finally:
+            await runner.session_service.delete_session(
+                app_name=runner.app_name,
+                user_id=self._user_id,
+                session_id=scoped_session_id
+            )
+
     async def stream(self, query, session_id) -> AsyncIterable[dict[str, Any]]:
         logger.info(f"--- Processing query: {query} ---")
         
         # Step 1: Decision (UI vs Text)
         
         # 1.1 Search for relevant templates
-        candidate_templates = None
+        query_embedding = None
+        scored_candidates = []
         if self.searcher:
-            candidate_templates = self.searcher.search(query)
-            
+            query_embedding = await self.searcher.aembed_query(query)
+            if query_embedding is not None:
+                scored_candidates = await self.searcher.asearch_scored(query, query_embedding=query_embedding)
+        candidate_templates = [template_id for template_id, _ in scored_candidates] or None
+
+        # 1.2 Let the local intent classifier decide when it is confident
+        if self.intent_classifier and query_embedding is not None:
+            decision_data, probability = self.intent_classifier.predict(query_embedding)
+            if probability >= self.intent_threshold:
+                logger.info(f"--- Intent classifier decision ({probability:.3f}): {decision_data} ---")
+                template_id, is_dynamic = _resolve_decision(decision_data)
+                async for item in self._generate(query, session_id, template_id, is_dynamic=is_dynamic):
+                    yield item
+                return
+
+        # 1.3 Skip the selector when the top candidate is a near-certain match
+        if scored_candidates and self.skip_selector_score is not None:
+            top_template_id, top_score = scored_candidates[0]
+            if top_score >= self.skip_selector_score:
+                logger.info(f"--- Skipping selector: '{top_template_id}' scored {top_score:.3f} ---")
+                async for item in self._generate(query, session_id, top_template_id, is_dynamic=False):
+                    yield item
+                return
+
+        # 1.4 Speculatively generate with the top candidate while the selector decides
+        speculation = None
+        if self.speculative and candidate_templates:
+            speculative_template_id = candidate_templates[0]
+            speculation = _Prefetch(
+                self._generate(query, session_id, speculative_template_id, is_dynamic=False)
+            )
+
+        try:
+            try:
+                decision_response_text = await self._select(query, session_id, candidate_templates)
+            except Exception as e:
+                logger.error(f"Selector LLM failed: {e}")
+                yield {
+                    "is_task_complete": True,
+                    "content": f"I'm sorry, I'm having trouble connecting to my brain right now (Rate Limit or Error). Please try again in 30 seconds.\n\n---a2ui_JSON---\n```json\n[\n  {{ \"beginRendering\": {{ \"surfaceId\": \"main\", \"root\": \"root-column\" }} }},\n  {{ \"surfaceUpdate\": {{\n    \"surfaceId\": \"main\",\n    \"components\": [\n      {{ \"id\": \"root-column\", \"component\": {{ \"Column\": {{ \"children\": {{ \"explicitList\": [\"message-card\"] }} }} }} }},\n      {{ \"id\": \"message-card\", \"component\": {{ \"Card\": {{ \"child\": \"message-text\" }} }} }},\n      {{ \"id\": \"message-text\", \"component\": {{ \"Text\": {{ \"text\": {{ \"literal\": \"I'm sorry, I'm having trouble connecting to my brain right now. Please try again in a few moments.\" }} }} }} }}\n    ]\n  }} }}\n]\n```"
+                }
+                return
+
+            logger.info(f"--- Selector Decision: {decision_response_text} ---")
+
+            decision_data = {}
+            try:
+                # Clean up potential markdown code blocks
+                clean_json = decision_response_text.strip().removeprefix("```json").removesuffix("```").strip()
+                decision_data = json.loads(clean_json)
+                self._log_decision(query, decision_data)
+            except json.JSONDecodeError:
+                logger.error("Failed to parse selector decision JSON. Fallback to TEXT.")
+                decision_data = {"decision": "TEXT"}
+
+            # Step 2: Generation
+            template_id, is_dynamic = _resolve_decision(decision_data)
+
+            if speculation:
+                if not is_dynamic and template_id == speculative_template_id:
+                    logger.info(f"--- Selector confirmed speculative template '{template_id}' ---")
+                    async for item in speculation:
+                        yield item
+                    return
+                logger.info(f"--- Selector chose '{template_id}', cancelling speculative '{speculative_template_id}' ---")
+                await speculation.cancel()
+
+            async for item in self._generate(query, session_id, template_id, is_dynamic=is_dynamic):
+                yield item
+        finally:
+            if speculation:
+                await speculation.cancel()
+
+    def _log_decision(self, query: str, decision_data: dict):
+        """Appends a selector decision to the decision log used to train the intent classifier."""
+        if not self.decision_log_path:
+            return
+        try:
+            with open(self.decision_log_path, "a") as f:
+                f.write(json.dumps({"query": query, "label": decision_label(decision_data)}) + "\n")
+        except OSError as e:
+            logger.error(f"Failed to log selector decision: {e}")
+
+    async def _select(self, query: str, session_id: str, candidate_templates: list | None) -> str:
+        """Runs the selector and returns its raw decision text."""
         selector_prompt = get_selector_prompt(candidate_templates)
-        selector_runner = self._create_runner(instruction=selector_prompt)
-        
-        # Create session for selector
-        selector_session_id = f"{session_id}_selector"
-        await selector_runner.session_service.create_session(
-            app_name=selector_runner.agent.name,
-            user_id=self._user_id,
-            session_id=selector_session_id
-        )
+        selector_runner = self._get_runner(instruction=selector_prompt)
 
         decision_message = types.Content(role="user", parts=[types.Part.from_text(text=query)])
-        
-        decision_response_text = ""
+
         decision_response_text = ""
-        try:
+        async with self._scoped_session(selector_runner, f"{session_id}_selector") as selector_session_id:
             async for event in selector_runner.run_async(
                 user_id=self._user_id, session_id=selector_session_id, new_message=decision_message
             ):
-                 if event.is_final_response() and event.content:
+                if event.is_final_response() and event.content:
                     decision_response_text = "\n".join([p.text for p in event.content.parts if p.text])
-        except Exception as e:
-            logger.error(f"Selector LLM failed: {e}")
-            yield {
-                "is_task_complete": True,
-                "content": f"I'm sorry, I'm having trouble connecting to my brain right now (Rate Limit or Error). Please try again in 30 seconds.\n\n---a2ui_JSON---\n```json\n[\n  {{ \"beginRendering\": {{ \"surfaceId\": \"main\", \"root\": \"root-column\" }} }},\n  {{ \"surfaceUpdate\": {{\n    \"surfaceId\": \"main\",\n    \"components\": [\n      {{ \"id\": \"root-column\", \"component\": {{ \"Column\": {{ \"children\": {{ \"explicitList\": [\"message-card\"] }} }} }} }},\n      {{ \"id\": \"message-card\", \"component\": {{ \"Card\": {{ \"child\": \"message-text\" }} }} }},\n      {{ \"id\": \"message-text\", \"component\": {{ \"Text\": {{ \"text\": {{ \"literal\": \"I'm sorry, I'm having trouble connecting to my brain right now. Please try again in a few moments.\" }} }} }} }}\n    ]\n  }} }}\n]\n```"
-            }
-            return
-
-        logger.info(f"--- Selector Decision: {decision_response_text} ---")
-        
-        decision_data = {}
-        try:
-            # Clean up potential markdown code blocks
-            clean_json = decision_response_text.strip().removeprefix("```json").removesuffix("```").strip()
-            decision_data = json.loads(clean_json)
-        except json.JSONDecodeError:
-            logger.error("Failed to parse selector decision JSON. Fallback to TEXT.")
-            decision_data = {"decision": "TEXT"}
-
-        # Step 2: Generation
-        template_id = decision_data.get("template_id")
-        decision = decision_data.get("decision", "TEXT")
-        
-        is_dynamic = (decision == "DYNAMIC_UI")
-        
-        if not is_dynamic and not template_id:
-             # Default fallback if regular UI but missing ID
-             template_id = "SIMPLE_MESSAGE"
+        return decision_response_text
 
+    async def _generate(self, query: str, session_id: str, template_id: str, is_dynamic: bool) -> AsyncIterator[dict[str, Any]]:
+        """Runs the generator for the chosen template and streams its output."""
         generator_prompt = get_generator_prompt(template_id, is_dynamic=is_dynamic)
-        generator_runner = self._create_runner(instruction=generator_prompt)
-        
-        # Create session for generator
-        generator_session_id = f"{session_id}_generator"
-        await generator_runner.session_service.create_session(
-            app_name=generator_runner.agent.name,
-            user_id=self._user_id,
-            session_id=generator_session_id
-        )
-        
+        generator_runner = self._get_runner(instruction=generator_prompt)
+
         # Pass the original query to the generator
         generator_message = types.Content(role="user", parts=[types.Part.from_text(text=query)])
         
         try:
-            async for event in generator_runner.run_async(
-                user_id=self._user_id, session_id=generator_session_id, new_message=generator_message
-            ):
-                if event.is_final_response():
-                    if event.content and event.content.parts:
-                        final_content = "\n".join([p.text for p in event.content.parts if p.text])
+            # Stream the generator so the executor can forward each A2UI message as soon as it is complete
+            async with self._scoped_session(generator_runner, f"{session_id}_generator") as generator_session_id:
+                async for event in generator_runner.run_async(
+                    user_id=self._user_id,
+                    session_id=generator_session_id,
+                    new_message=generator_message,
+                    run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+                ):
+                    if event.partial:
+                        if event.content and event.content.parts:
+                            yield {
+                                "is_task_complete": False,
+                                "partial_content": "".join([p.text for p in event.content.parts if p.text]),
+                            }
+                    elif event.is_final_response():
+                        if event.content and event.content.parts:
+                            final_content = "\n".join([p.text for p in event.content.parts if p.text])
+                            yield {
+                                "is_task_complete": True,
+                                "content": final_content,
+                            }
+                    else:
                         yield {
-                            "is_task_complete": True,
-                            "content": final_content,
+                            "is_task_complete": False,
+                            "updates": "Thinking...",
                         }
-                else:
-                    yield {
-                        "is_task_complete": False,
-                        "updates": "Thinking...",
-                    }
         except Exception as e:
             logger.error(f"Generator LLM failed: {e}")
             yield {
@@ -168,3 +279,50 @@ class GenericChatAgent:
                 "content": f"I'm sorry, I encountered an error generating the response (Rate Limit or Error). Please try again later.\n\n---a2ui_JSON---\n```json\n[\n  {{ \"beginRendering\": {{ \"surfaceId\": \"main\", \"root\": \"root-column\" }} }},\n  {{ \"surfaceUpdate\": {{\n    \"surfaceId\": \"main\",\n    \"components\": [\n      {{ \"id\": \"root-column\", \"component\": {{ \"Column\": {{ \"children\": {{ \"explicitList\": [\"message-card\"] }} }} }} }},\n      {{ \"id\": \"message-card\", \"component\": {{ \"Card\": {{ \"child\": \"message-text\" }} }} }},\n      {{ \"id\": \"message-text\", \"component\": {{ \"Text\": {{ \"text\": {{ \"literal\": \"I'm sorry, I'm having trouble generating the response right now. Please try again in a few moments.\" }} }} }} }}\n    ]\n  }} }}\n]\n```"
             }
 
+
+def _resolve_decision(decision_data: dict) -> tuple[str | None, bool]:
+    """Returns the template ID and whether to generate a dynamic UI for a selector decision."""
+    template_id = decision_data.get("template_id")
+    decision = decision_data.get("decision", "TEXT")
+
+    is_dynamic = (decision == "DYNAMIC_UI")
+
+    if not is_dynamic and not template_id:
+         # Default fallback if regular UI but missing ID
+         template_id = "SIMPLE_MESSAGE"
+    return template_id, is_dynamic
+
+
+class _Prefetch:
+    """Consumes an async iterator in a background task, buffering its items.
+
+    Used to start the generator before the selector has confirmed its template.
+    Iterating yields the buffered items and then the rest as they arrive;
+    `cancel` stops the background task and discards the items.
+    """
+
+    _DONE = object()
+
+    def __init__(self, items: AsyncIterator[dict[str, Any]]):
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._fill(items))
+
+    async def _fill(self, items: AsyncIterator[dict[str, Any]]) -> None:
+        try:
+            async for item in items:
+                self._queue.put_nowait(item)
+        finally:
+            self._queue.put_nowait(self._DONE)
+
+    async def __aiter__(self) -> AsyncIterator[dict[str, Any]]:
+        while (item := await self._queue.get()) is not self._DONE:
+            yield item
+
+    async def cancel(self) -> None:
+        if self._task.done():
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
@@ -21,7 +21,6 @@ from a2a.server.events import EventQueue
 from a2a.server.tasks import TaskUpdater
 from a2a.types import (
     DataPart,
-    Part,
     Task,
     TaskState,
     TextPart,
@@ -33,7 +32,12 @@ from a2a.utils import (
     new_task,
 )
 from a2a.utils.errors import ServerError
-from a2ui.a2ui_extension import create_a2ui_part, try_activate_a2ui_extension
+from a2ui.a2ui_extension import (
+    A2UI_CLIENT_CAPABILITIES_KEY,
+    get_a2ui_mime_type,
+    try_activate_a2ui_extension,
+)
+from a2ui.response_assembler import A2uiResponseAssembler
 from .agent import GenericChatAgent
 
 logger = logging.getLogger(__name__)
@@ -80,6 +84,13 @@ class GenericChatAgentExecutor(AgentExecutor):
 
         logger.info(f"--- AGENT_EXECUTOR: Final query for LLM: '{query}' ---")
 
+        # Use the compact A2UI encoding for clients that support it
+        a2ui_mime_type = get_a2ui_mime_type(
+            context.message.metadata.get(A2UI_CLIENT_CAPABILITIES_KEY)
+            if context.message and context.message.metadata
+            else None
+        )
+
         task = context.current_task
 
         if not task:
@@ -87,10 +98,25 @@ class GenericChatAgentExecutor(AgentExecutor):
             await event_queue.enqueue_event(task)
         updater = TaskUpdater(event_queue, task.id, task.context_id)
 
+        # Sends A2UI messages from streamed generator output as they complete
+        assembler = A2uiResponseAssembler(
+            transforms=[self._fix_surface_updates], mime_type=a2ui_mime_type
+        )
+
         # Reuse session_id from task.context_id
         async for item in self.agent.stream(query, task.context_id):
             is_task_complete = item["is_task_complete"]
             if not is_task_complete:
+                if (partial_content := item.get("partial_content")) is not None:
+                    if streamed_parts := assembler.feed(partial_content):
+                        await updater.update_status(
+                            TaskState.working,
+                            new_agent_parts_message(
+                                streamed_parts, task.context_id, task.id
+                            ),
+                        )
+                    continue
+
                 await updater.update_status(
                     TaskState.working,
                     new_agent_text_message(item["updates"], task.context_id, task.id),
@@ -100,38 +126,8 @@ class GenericChatAgentExecutor(AgentExecutor):
             # Assuming single turn for simplicity in this PoC
             final_state = TaskState.completed 
             
-            content = item["content"]
-            final_parts = []
-            if "---a2ui_JSON---" in content:
-                logger.info("Splitting final response into text and UI parts.")
-                text_content, json_string = content.split("---a2ui_JSON---", 1)
-
-                if text_content.strip():
-                    final_parts.append(Part(root=TextPart(text=text_content.strip())))
-
-                if json_string.strip():
-                    logger.info(f"Raw UI JSON received: {json_string}")
-                    try:
-                        json_string_cleaned = (
-                            json_string.strip().lstrip("```json").rstrip("```").strip()
-                        )
-                        json_data = json.loads(json_string_cleaned)
-
-                        if isinstance(json_data, list):
-                            for message in json_data:
-                                # Auto-fix for common LLM error: missing wrapper key for surfaceUpdate
-                                if "surfaceId" in message and "components" in message and "surfaceUpdate" not in message:
-                                    logger.warning("Auto-fixing malformed surfaceUpdate message (missing wrapper)")
-                                    message = {"surfaceUpdate": message}
-                                final_parts.append(create_a2ui_part(message))
-                        else:
-                            final_parts.append(create_a2ui_part(json_data))
-
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse UI JSON: {e}")
-                        final_parts.append(Part(root=TextPart(text=json_string)))
-            else:
-                final_parts.append(Part(root=TextPart(text=content.strip())))
+            # Messages already streamed to the client are not sent again
+            final_parts = assembler.finish(item["content"])
 
             await updater.update_status(
                 final_state,
@@ -140,6 +136,16 @@ class GenericChatAgentExecutor(AgentExecutor):
             )
             break
 
+    def _fix_surface_updates(self, messages: list[dict]) -> list[dict]:
+        fixed = []
+        for message in messages:
+            # Auto-fix for common LLM error: missing wrapper key for surfaceUpdate
+            if "surfaceId" in message and "components" in message and "surfaceUpdate" not in message:
+                logger.warning("Auto-fixing malformed surfaceUpdate message (missing wrapper)")
+                message = {"surfaceUpdate": message}
+            fixed.append(message)
+        return fixed
+
     async def cancel(
         self, request: RequestContext, event_queue: EventQueue
     ) -> Task | None:
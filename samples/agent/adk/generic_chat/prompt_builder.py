@@ -13,8 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .templates import TEMPLATES
 from .a2ui_schema import A2UI_SCHEMA
+from .utils.template_registry import TEMPLATE_REGISTRY
 
 def get_selector_prompt(candidate_templates: list = None) -> str:
     """
@@ -22,13 +22,14 @@ def get_selector_prompt(candidate_templates: list = None) -> str:
     """
     
     template_descriptions = []
+    templates = TEMPLATE_REGISTRY.templates()
     
     # If no candidates provided, use all templates (legacy behavior)
-    templates_to_use = candidate_templates if candidate_templates else TEMPLATES.keys()
+    templates_to_use = candidate_templates if candidate_templates else templates.keys()
 
     for key in templates_to_use:
-        if key in TEMPLATES:
-            template_descriptions.append(f"- {key}: {TEMPLATES[key]['description']}")
+        if key in templates:
+            template_descriptions.append(f"- {key}: {templates[key]['description']}")
     
     template_list_str = "\n".join(template_descriptions)
 
@@ -81,13 +82,15 @@ def get_generator_prompt(template_id: str = None, is_dynamic: bool = False) -> s
         {A2UI_SCHEMA}
         """
 
-    if not template_id or template_id not in TEMPLATES:
+    template = TEMPLATE_REGISTRY.get(template_id) if template_id else None
+    if not template:
         # Fallback to generic text agent if no valid template
         return """
         You are a helpful assistant. Please respond to the user's request with a clear and concise text response.
         """
     
-    selected_template = TEMPLATES[template_id]["json"]
+    # Already de-escaped by the registry, so it is shown to the LLM as plain JSON
+    selected_template = template["json"]
     
     return f"""
     You are a helpful assistant. Your goal is to generate a response using a specific UI template.
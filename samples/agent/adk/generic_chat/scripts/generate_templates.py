@@ -1,10 +1,15 @@
 import os
-import time
+import re
 import json
+import random
+import asyncio
 import logging
+from concurrent.futures import ProcessPoolExecutor
 import click
+import litellm
 from dotenv import load_dotenv
-from ..utils.generator import TemplateGenerator
+from ..utils.generator import TemplateGenerator, validate_template
+from ..utils.rate_limiter import AsyncTokenBucket
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -13,16 +18,96 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Rough number of tokens a generation uses (prompt with schema plus template), acquired
+# from the TPM bucket before each call and settled against the reported usage after it
+ESTIMATED_TOKENS_PER_TEMPLATE = 12000
+
+
+def _topic_filename(topic: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", topic.lower()).strip("_") + ".json"
+
+
+def _completed_topics(output_dir: str) -> set:
+    """Returns the topics that already have a template in the output directory."""
+    completed = set()
+    for filename in os.listdir(output_dir):
+        if not filename.endswith(".json"):
+            continue
+        completed.add(filename)
+        try:
+            with open(os.path.join(output_dir, filename)) as f:
+                if topic := json.load(f).get("topic"):
+                    completed.add(_topic_filename(topic))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable template {filename}: {e}")
+    return completed
+
+
+async def _generate_one(topic, generator, requests, tokens, semaphore, pool, output_dir, max_retries):
+    async with semaphore:
+        for attempt in range(max_retries + 1):
+            await requests.acquire()
+            await tokens.acquire(ESTIMATED_TOKENS_PER_TEMPLATE)
+            try:
+                result, used_tokens = await generator.agenerate(topic)
+                tokens.adjust(used_tokens - ESTIMATED_TOKENS_PER_TEMPLATE if used_tokens else 0)
+                break
+            except litellm.RateLimitError as e:
+                if attempt == max_retries:
+                    logger.error(f"Giving up on {topic} after {max_retries} retries: {e}")
+                    return False
+                # Exponential backoff with full jitter so concurrent workers don't retry in lockstep
+                delay = random.uniform(0, min(60.0, 2.0 * 2 ** attempt))
+                logger.warning(f"Rate limited on {topic}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    if not result:
+        logger.error(f"Failed to generate {topic}")
+        return False
+
+    # Validation is CPU-bound, so it runs in the process pool and never stalls generation
+    error = await asyncio.get_running_loop().run_in_executor(pool, validate_template, result["template_json"])
+    if error:
+        logger.error(f"Generated template for {topic} failed schema validation: {error}")
+        return False
+
+    result["topic"] = topic
+    filename = f"{result['id'].lower()}.json"
+    filepath = os.path.join(output_dir, filename)
+    with open(filepath, 'w') as f:
+        json.dump(result, f, indent=2)
+    logger.info(f"Saved {result['id']} to {filepath}")
+    return True
+
+
+async def _generate_all(topics, output_dir, rpm, tpm, concurrency, max_retries, validation_workers):
+    generator = TemplateGenerator()
+    requests = AsyncTokenBucket(rpm)
+    tokens = AsyncTokenBucket(tpm)
+    semaphore = asyncio.Semaphore(concurrency)
+    with ProcessPoolExecutor(max_workers=validation_workers) as pool:
+        results = await asyncio.gather(*[
+            _generate_one(t, generator, requests, tokens, semaphore, pool, output_dir, max_retries)
+            for t in topics
+        ])
+    return sum(results)
+
+
 @click.command()
 @click.option('--topic', multiple=True, help='Specific topic to generate (can be used multiple times).')
 @click.option('--count', default=0, help='Number of random templates to generate if no topics provided.')
 @click.option('--output-dir', default='generic_chat/templates', help='Directory to save generated templates.')
-def main(topic, count, output_dir):
+@click.option('--rpm', default=15, help='Maximum LLM requests per minute.')
+@click.option('--tpm', default=1_000_000, help='Maximum LLM tokens per minute.')
+@click.option('--concurrency', default=4, help='Maximum number of generations in flight.')
+@click.option('--max-retries', default=5, help='Retries per topic after a rate limit error.')
+@click.option('--validation-workers', default=2, help='Processes used for schema validation.')
+def main(topic, count, output_dir, rpm, tpm, concurrency, max_retries, validation_workers):
     """
     Auto-generates A2UI templates using an LLM.
+    Topics that already have a template in the output directory are skipped, so an
+    interrupted run can be resumed by running the same command again.
     """
-    generator = TemplateGenerator()
-    
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
     
@@ -41,26 +126,17 @@ def main(topic, count, output_dir):
         click.echo("Please provide --topic or --count > 0.")
         return
 
-    logger.info(f"Starting generation for {len(topics_to_process)} topics...")
+    completed = _completed_topics(output_dir)
+    skipped = [t for t in topics_to_process if _topic_filename(t) in completed]
+    if skipped:
+        logger.info(f"Skipping {len(skipped)} topics that already have templates: {skipped}")
+    topics_to_process = [t for t in topics_to_process if _topic_filename(t) not in completed]
 
-    for t in topics_to_process:
-        logger.info(f"Generating: {t}")
-        result = generator.generate(t)
-        
-        if result:
-            filename = f"{result['id'].lower()}.json"
-            filepath = os.path.join(output_dir, filename)
-            
-            with open(filepath, 'w') as f:
-                json.dump(result, f, indent=2)
-                
-            logger.info(f"Saved {result['id']} to {filepath}")
-        else:
-            logger.error(f"Failed to generate {t}")
-            
-        # Modest sleep to respect rate limits (e.g. 15 RPM = one every 4s, but safer to do 10s)
-        logger.info("Sleeping for 10s to respect Rate Limits...")
-        time.sleep(10)
+    logger.info(f"Starting generation for {len(topics_to_process)} topics...")
+    saved = asyncio.run(_generate_all(
+        topics_to_process, output_dir, rpm, tpm, concurrency, max_retries, validation_workers
+    ))
+    logger.info(f"Saved {saved} of {len(topics_to_process)} templates.")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,66 @@
+import os
+import json
+import logging
+import click
+import litellm
+import numpy as np
+from dotenv import load_dotenv
+from ..utils.intent_classifier import DEFAULT_MODEL_PATH, IntentClassifier
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+@click.command()
+@click.option('--decision-log', required=True, help='JSONL log of selector decisions written via SELECTOR_DECISION_LOG.')
+@click.option('--output', default=DEFAULT_MODEL_PATH, help='Where to save the trained classifier.')
+@click.option('--embedding-model', default=lambda: os.getenv("EMBEDDING_MODEL", "gemini/text-embedding-004"), help='Must match the model used by TemplateSearcher.')
+@click.option('--batch-size', default=100, help='Number of queries to embed per request.')
+@click.option('--holdout', default=0.2, help='Share of the decisions held out to report accuracy.')
+def main(decision_log, output, embedding_model, batch_size, holdout):
+    """
+    Trains the local intent classifier from logged selector decisions.
+    """
+    decisions = {}
+    with open(decision_log) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                # The latest decision for a query wins
+                decisions[entry["query"]] = entry["label"]
+
+    queries = list(decisions)
+    labels = [decisions[query] for query in queries]
+    if len(set(labels)) < 2:
+        click.echo("Need decisions for at least two different labels to train.")
+        return
+    logger.info(f"Embedding {len(queries)} logged queries with {embedding_model}...")
+
+    embeddings = []
+    for start in range(0, len(queries), batch_size):
+        response = litellm.embedding(model=embedding_model, input=queries[start:start + batch_size])
+        embeddings.extend(item["embedding"] for item in response.data)
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    # Match TemplateSearcher, which hands the classifier normalized query embeddings
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    order = np.random.default_rng(0).permutation(len(queries))
+    held_out = order[:int(len(order) * holdout)]
+    if len(held_out):
+        train_rows = order[int(len(order) * holdout):]
+        classifier = IntentClassifier.train(embeddings[train_rows], [labels[i] for i in train_rows], embedding_model)
+        correct = sum(
+            classifier.labels[int(np.argmax(embeddings[i] @ classifier.weights + classifier.bias))] == labels[i]
+            for i in held_out
+        )
+        logger.info(f"Held-out accuracy: {correct / len(held_out):.1%} on {len(held_out)} decisions")
+
+    classifier = IntentClassifier.train(embeddings, labels, embedding_model)
+    classifier.save(output)
+    logger.info(f"Saved intent classifier with {len(classifier.labels)} classes to {output}")
+
+if __name__ == '__main__':
+    main()
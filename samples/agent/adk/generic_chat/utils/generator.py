@@ -2,7 +2,9 @@ import json
 import logging
 import os
 import re
+import jsonschema
 import litellm
+from a2ui.validator import get_validator
 from ..a2ui_schema import A2UI_SCHEMA
 
 logger = logging.getLogger(__name__)
@@ -18,8 +20,46 @@ class TemplateGenerator:
         Returns a dict with 'id', 'description', 'keywords', and 'json' (string).
         """
         logger.info(f"Generating template for topic: {topic}")
-        
-        prompt = f"""
+
+        try:
+            response = litellm.completion(
+                model=self.model_name,
+                messages=[{"role": "user", "content": self.build_prompt(topic)}]
+            )
+            return self.parse_response(topic, response.choices[0].message.content)
+        except Exception as e:
+            logger.error(f"Failed to generate template for {topic}: {e}")
+            return None
+
+    async def agenerate(self, topic: str) -> tuple:
+        """
+        Async variant of `generate` for concurrent generation.
+        Returns the template dict (or None) and the total tokens the call used.
+        Rate limit errors are raised so the caller can back off and retry.
+        """
+        logger.info(f"Generating template for topic: {topic}")
+
+        try:
+            response = await litellm.acompletion(
+                model=self.model_name,
+                messages=[{"role": "user", "content": self.build_prompt(topic)}]
+            )
+        except litellm.RateLimitError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to generate template for {topic}: {e}")
+            return None, 0
+
+        usage = getattr(response, "usage", None)
+        total_tokens = getattr(usage, "total_tokens", 0) or 0
+        try:
+            return self.parse_response(topic, response.choices[0].message.content), total_tokens
+        except Exception as e:
+            logger.error(f"Failed to generate template for {topic}: {e}")
+            return None, total_tokens
+
+    def build_prompt(self, topic: str) -> str:
+        return f"""
         You are an expert UI designer and A2UI protocol specialist.
         Your goal is to create a reusable, high-quality A2UI JSON template for a "{topic}" interface.
 
@@ -42,34 +82,43 @@ class TemplateGenerator:
         {A2UI_SCHEMA}
         """
 
-        try:
-            response = litellm.completion(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            content = response.choices[0].message.content
+    def parse_response(self, topic: str, content: str) -> dict:
+        """Parses the LLM output into a template dict, or returns None if the template JSON is invalid."""
+        # Extract JSON from markdown code block if present
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0].strip()
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0].strip()
             
-            # Extract JSON from markdown code block if present
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-                
-            data = json.loads(content)
-            
-            # Basic validation of the inner JSON string
-            try:
-                inner_json = json.loads(data["template_json"])
-                # Simple check for required message types
-                types = [list(msg.keys())[0] for msg in inner_json]
-                if "beginRendering" not in types or "surfaceUpdate" not in types:
-                    logger.warning(f"Generated template for {topic} missing standard messages: {types}")
-            except json.JSONDecodeError:
-                logger.error(f"Generated template_json for {topic} is not valid JSON string.")
-                return None
-
-            return data
-
-        except Exception as e:
-            logger.error(f"Failed to generate template for {topic}: {e}")
+        data = json.loads(content)
+        
+        # Basic validation of the inner JSON string
+        try:
+            inner_json = json.loads(data["template_json"])
+            # Simple check for required message types
+            types = [list(msg.keys())[0] for msg in inner_json]
+            if "beginRendering" not in types or "surfaceUpdate" not in types:
+                logger.warning(f"Generated template for {topic} missing standard messages: {types}")
+        except json.JSONDecodeError:
+            logger.error(f"Generated template_json for {topic} is not valid JSON string.")
             return None
+
+        return data
+
+
+# Parsed once per process; the ID keys the validator cache without hashing the schema.
+_A2UI_SCHEMA = json.loads(A2UI_SCHEMA)
+_A2UI_SCHEMA_ID = "generic_chat/a2ui_schema"
+
+
+def validate_template(template_json: str) -> str:
+    """
+    Validates a template's A2UI messages against A2UI_SCHEMA.
+    Returns the error message, or None if the template is valid.
+    This is a module-level function so it can run in a process pool.
+    """
+    try:
+        get_validator(_A2UI_SCHEMA, catalog_id=_A2UI_SCHEMA_ID, as_array=True).validate(json.loads(template_json))
+    except (json.JSONDecodeError, jsonschema.exceptions.ValidationError) as e:
+        return str(e).splitlines()[0]
+    return None
@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "intent_classifier.npz")
+
+
+def decision_label(decision_data: dict) -> str:
+    """Maps a selector decision to a class label, e.g. "UI:FORM" or "DYNAMIC_UI"."""
+    decision = decision_data.get("decision", "TEXT")
+    if decision == "UI":
+        return f"UI:{decision_data.get('template_id') or 'SIMPLE_MESSAGE'}"
+    return decision
+
+
+def label_decision(label: str) -> dict:
+    """Maps a class label back to a selector decision."""
+    decision, _, template_id = label.partition(":")
+    return {"decision": decision, "template_id": template_id or None}
+
+
+class IntentClassifier:
+    """A multinomial logistic regression over query embeddings that predicts the selector's decision.
+
+    It is trained offline from logged selector decisions with
+    `scripts/train_intent_classifier.py` and uses the normalized query embedding
+    `TemplateSearcher` already computed, so a prediction is one small
+    matrix-vector product.
+    """
+
+    def __init__(self, labels: list, weights: np.ndarray, bias: np.ndarray, model_name: str):
+        self.labels = list(labels)
+        self.weights = weights
+        self.bias = bias
+        self.model_name = model_name
+
+    @classmethod
+    def train(
+        cls,
+        embeddings: np.ndarray,
+        labels: list,
+        model_name: str,
+        epochs: int = 500,
+        learning_rate: float = 1.0,
+        l2: float = 1e-3,
+    ) -> "IntentClassifier":
+        """Trains the classifier with full-batch gradient descent on the cross-entropy loss.
+
+        Args:
+            embeddings: Normalized query embeddings, one row per logged decision.
+            labels: The `decision_label` of each decision.
+            model_name: The embedding model, which queries must be embedded with.
+        """
+        classes = sorted(set(labels))
+        targets = np.zeros((len(labels), len(classes)), dtype=np.float32)
+        targets[np.arange(len(labels)), [classes.index(label) for label in labels]] = 1.0
+
+        weights = np.zeros((embeddings.shape[1], len(classes)), dtype=np.float32)
+        bias = np.zeros(len(classes), dtype=np.float32)
+        for _ in range(epochs):
+            gradient = (_softmax(embeddings @ weights + bias) - targets) / len(labels)
+            weights -= learning_rate * (embeddings.T @ gradient + l2 * weights)
+            bias -= learning_rate * gradient.sum(axis=0)
+        return cls(classes, weights, bias, model_name)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> "IntentClassifier | None":
+        """Loads a trained classifier, or returns None if there is none."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                classifier = cls(
+                    json.loads(str(data["labels"])),
+                    data["weights"],
+                    data["bias"],
+                    str(data["model_name"]),
+                )
+        except (OSError, KeyError, ValueError) as e:
+            logger.error(f"Failed to load intent classifier from {path}: {e}")
+            return None
+        logger.info(f"Loaded intent classifier with {len(classifier.labels)} classes from {path}")
+        return classifier
+
+    def save(self, path: str = DEFAULT_MODEL_PATH):
+        np.savez(
+            path,
+            labels=json.dumps(self.labels),
+            weights=self.weights,
+            bias=self.bias,
+            model_name=self.model_name,
+        )
+
+    def predict(self, embedding: np.ndarray) -> tuple:
+        """Returns the most likely selector decision for a normalized query embedding, and its probability."""
+        probabilities = _softmax(embedding @ self.weights + self.bias)
+        best = int(np.argmax(probabilities))
+        return label_decision(self.labels[best]), float(probabilities[best])
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """A token bucket that refills continuously at a per-minute rate.
+
+    `acquire` waits until enough tokens are available, so callers sharing a
+    bucket stay under the rate without fixed sleeps. `adjust` settles the
+    difference once the real cost of a call is known, e.g. the tokens an LLM
+    reported using versus the estimate that was acquired; the balance may go
+    negative, which delays later callers.
+    """
+
+    def __init__(self, per_minute: float, capacity: float = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        # Never wait for more than the bucket can hold
+        amount = min(amount, self.capacity)
+        # The lock keeps callers in FIFO order, so large requests are not starved
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+    def adjust(self, amount: float):
+        """Takes `amount` more tokens from the bucket, or returns them if negative."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
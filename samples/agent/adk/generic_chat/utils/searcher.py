@@ -1,68 +1,319 @@
+import hashlib
+import json
 import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import NamedTuple
 import numpy as np
 import litellm
-from ..templates import TEMPLATES
+from .template_registry import TEMPLATE_REGISTRY, TemplateRegistry
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".embedding_cache")
+
+
 class TemplateSearcher:
-    def __init__(self, model_name: str = "gemini/text-embedding-004"):
+    """Semantic search over the template descriptions and keywords.
+
+    Template embeddings are normalized and cached on disk in a `.npy` file per
+    embedding model, next to a JSON list of the hashes of the embedded texts.
+    At startup the cache is memory-mapped and only templates whose description
+    or keywords changed are embedded, in a single batched request. Templates the
+    registry picks up later are embedded and added on the next search.
+
+    Query embeddings are kept in a bounded LRU cache keyed by the normalized
+    query, so repeated queries and ones differing only in case, punctuation or
+    spacing (e.g. "Top 5 movies?" and "top 5 movies") skip the embedding call.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "gemini/text-embedding-004",
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        query_cache_size: int = 1024,
+        query_cache_ttl: float = 3600.0,
+        registry: TemplateRegistry = TEMPLATE_REGISTRY,
+    ):
         self.model_name = model_name
+        self.cache_dir = cache_dir
+        self.registry = registry
         self.templates = []
-        self.embeddings = []
+        self.embeddings = np.empty((0, 0), dtype=np.float32)
+        self._hashes = []
+        self._indexed_version = None
+        # Set while a search updates the index, so concurrent searches don't embed the same templates
+        self._indexing = False
+        self._query_cache_size = query_cache_size
+        self._query_cache_ttl = query_cache_ttl
+        # Normalized query -> (normalized embedding, time it was cached).
+        self._query_cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = Counter()
         self._index_templates()
 
+    @property
+    def counters(self) -> dict:
+        """A snapshot of the query cache counters: hits, misses, expired and evicted."""
+        with self._lock:
+            return dict(self._counters)
+
     def _index_templates(self):
-        """Indexes all available templates by computing their embeddings."""
+        """Indexes all available templates, embedding only the ones not in the cache."""
         logger.info("Indexing templates for semantic search...")
-        for key, data in TEMPLATES.items():
+        self._hashes, self.embeddings = self._load_cache()
+        self._update_index()
+
+    def _update_index(self):
+        """Indexes the templates the registry added or changed since the last index."""
+        if (plan := self._plan_index()) is None:
+            return
+        response, error = None, None
+        try:
+            if plan.missing:
+                response = litellm.embedding(model=self.model_name, input=[text for _, text in plan.missing])
+        except Exception as e:
+            error = e
+        finally:
+            self._finish_index(plan, response, error)
+
+    async def _aupdate_index(self):
+        """Like `_update_index`, but embeds without blocking the event loop."""
+        if (plan := self._plan_index()) is None:
+            return
+        response, error = None, None
+        try:
+            if plan.missing:
+                response = await litellm.aembedding(model=self.model_name, input=[text for _, text in plan.missing])
+        except Exception as e:
+            error = e
+        finally:
+            self._finish_index(plan, response, error)
+
+    def _plan_index(self) -> "_IndexPlan | None":
+        """Plans an index update, or returns None if the index is current or another search is updating it."""
+        # Reading the templates rescans the directory if due
+        templates = self.registry.templates()
+        version = self.registry.version
+        with self._lock:
+            if version == self._indexed_version or self._indexing:
+                return None
+            self._indexing = True
+
+        texts = {}
+        for key, data in templates.items():
             # Skip SIMPLE_MESSAGE as it's always included as a fallback
             if key == "SIMPLE_MESSAGE":
                 continue
-                
-            text_to_embed = f"{data.get('description', '')} {data.get('keywords', '')}"
-            try:
-                # Synchronous embedding call for startup simplicity
-                response = litellm.embedding(model=self.model_name, input=[text_to_embed])
-                embedding = response.data[0]["embedding"]
-                
-                self.templates.append({
-                    "id": key,
-                    "description": data.get("description", ""),
-                    "full_data": data
-                })
-                self.embeddings.append(embedding)
-            except Exception as e:
-                logger.error(f"Failed to embed template {key}: {e}")
-
-        self.embeddings = np.array(self.embeddings)
-        logger.info(f"Indexed {len(self.templates)} templates.")
+            texts[key] = f"{data.get('description', '')} {data.get('keywords', '')}"
+        hashes = {key: hashlib.sha256(text.encode()).hexdigest() for key, text in texts.items()}
+
+        known = set(self._hashes)
+        missing = [(key, text) for key, text in texts.items() if hashes[key] not in known]
+        if missing:
+            logger.info(f"Embedding {len(missing)} new or changed templates.")
+        return _IndexPlan(version, templates, hashes, missing)
+
+    def _finish_index(self, plan: "_IndexPlan", response, error: Exception | None):
+        """Builds the index from a plan and the embedding response for its missing templates.
+
+        If the templates could not be embedded, the ones that were already embedded are
+        still indexed, but the version isn't marked as indexed, so the next search retries.
+        """
+        try:
+            new_embeddings = {}
+            if response is not None:
+                new_embeddings = _embeddings_by_key(plan.missing, response)
+            elif plan.missing:
+                logger.error(f"Failed to embed templates {[key for key, _ in plan.missing]}: {error}")
+            self._build_index(plan.templates, plan.hashes, self._hashes, self.embeddings, new_embeddings)
+            if response is not None or not plan.missing:
+                self._indexed_version = plan.version
+        finally:
+            with self._lock:
+                self._indexing = False
+
+    def _build_index(self, templates: dict, hashes: dict, known_hashes: list, known_embeddings: np.ndarray, new_embeddings: dict):
+        known_rows = {text_hash: row for row, text_hash in enumerate(known_hashes)}
+        keys = [key for key in hashes if hashes[key] in known_rows or key in new_embeddings]
+        index_hashes = [hashes[key] for key in keys]
+        if index_hashes == known_hashes:
+            # Nothing changed: keep searching the current (possibly memory-mapped) matrix.
+            self.embeddings = known_embeddings
+        elif keys:
+            self.embeddings = np.stack([
+                new_embeddings[key] if key in new_embeddings else known_embeddings[known_rows[hashes[key]]]
+                for key in keys
+            ])
+            self._save_cache(index_hashes, self.embeddings)
+        else:
+            self.embeddings = np.empty((0, 0), dtype=np.float32)
+
+        self._hashes = index_hashes
+        self.templates = [
+            {
+                "id": key,
+                "description": templates[key].get("description", ""),
+                "full_data": templates[key],
+            }
+            for key in keys
+        ]
+        logger.info(f"Indexed {len(self.templates)} templates ({len(new_embeddings)} embedded).")
+
+    def _cache_paths(self) -> tuple[str, str]:
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.model_name)
+        base = os.path.join(self.cache_dir, name)
+        return f"{base}.npy", f"{base}.json"
+
+    def _load_cache(self) -> tuple[list, np.ndarray]:
+        embeddings_path, hashes_path = self._cache_paths()
+        try:
+            with open(hashes_path) as f:
+                hashes = json.load(f)
+            embeddings = np.load(embeddings_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.info(f"No usable template embedding cache: {e}")
+            return [], np.empty((0, 0), dtype=np.float32)
+        if len(hashes) != len(embeddings):
+            logger.warning("Template embedding cache is inconsistent, ignoring it.")
+            return [], np.empty((0, 0), dtype=np.float32)
+        return hashes, embeddings
+
+    def _save_cache(self, hashes: list, embeddings: np.ndarray):
+        embeddings_path, hashes_path = self._cache_paths()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write both files under temporary names first, so a crash never
+            # leaves a cache whose hashes don't match its rows.
+            with open(f"{embeddings_path}.tmp", "wb") as f:
+                np.save(f, embeddings)
+            with open(f"{hashes_path}.tmp", "w") as f:
+                json.dump(hashes, f)
+            os.replace(f"{embeddings_path}.tmp", embeddings_path)
+            os.replace(f"{hashes_path}.tmp", hashes_path)
+        except OSError as e:
+            logger.error(f"Failed to save template embedding cache: {e}")
 
     def search(self, query: str, top_k: int = 3) -> list:
         """
         Retrieves top_k most relevant templates for the query.
         Always returns the candidate list, which should be used to filter the prompt.
         """
+        self._update_index()
         if not self.templates:
             return []
 
         try:
-            response = litellm.embedding(model=self.model_name, input=[query])
-            query_embedding = np.array(response.data[0]["embedding"])
-            
-            # Cosine similarity
-            similarities = np.dot(self.embeddings, query_embedding) / (
-                np.linalg.norm(self.embeddings, axis=1) * np.linalg.norm(query_embedding)
-            )
-            
-            # Get top K indices
-            top_indices = np.argsort(similarities)[-top_k:][::-1]
-            
-            results = [self.templates[i]["id"] for i in top_indices]
-            logger.info(f"Search results for '{query}': {results}")
-            return results
-            
+            key = _normalize_query(query)
+            query_embedding = self._get_cached_query(key)
+            if query_embedding is None:
+                response = litellm.embedding(model=self.model_name, input=[query])
+                query_embedding = self._cache_query(key, response.data[0]["embedding"])
+            return [template_id for template_id, _ in self._rank(query, query_embedding, top_k)]
         except Exception as e:
             logger.error(f"Search failed: {e}")
             # Fallback: return empty list or some default
             return []
+
+    async def asearch(self, query: str, top_k: int = 3) -> list:
+        """Like `search`, but embeds the query without blocking the event loop."""
+        return [template_id for template_id, _ in await self.asearch_scored(query, top_k)]
+
+    async def asearch_scored(self, query: str, top_k: int = 3, query_embedding: np.ndarray = None) -> list:
+        """Like `asearch`, but returns (template ID, cosine similarity) pairs.
+
+        Pass `query_embedding` if the query was already embedded with `aembed_query`.
+        """
+        await self._aupdate_index()
+        if not self.templates:
+            return []
+
+        if query_embedding is None:
+            query_embedding = await self.aembed_query(query)
+            if query_embedding is None:
+                return []
+        try:
+            return self._rank(query, query_embedding, top_k)
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            return []
+
+    async def aembed_query(self, query: str):
+        """Returns the normalized embedding of the query, or None if embedding failed."""
+        try:
+            key = _normalize_query(query)
+            query_embedding = self._get_cached_query(key)
+            if query_embedding is None:
+                response = await litellm.aembedding(model=self.model_name, input=[query])
+                query_embedding = self._cache_query(key, response.data[0]["embedding"])
+            return query_embedding
+        except Exception as e:
+            logger.error(f"Failed to embed query: {e}")
+            return None
+
+    def _get_cached_query(self, key: str):
+        with self._lock:
+            entry = self._query_cache.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            embedding, cached_at = entry
+            if time.monotonic() - cached_at > self._query_cache_ttl:
+                del self._query_cache[key]
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._query_cache.move_to_end(key)
+            self._counters["hits"] += 1
+            return embedding
+
+    def _cache_query(self, key: str, embedding) -> np.ndarray:
+        embedding = _normalize(np.asarray(embedding, dtype=np.float32))
+        with self._lock:
+            self._query_cache[key] = (embedding, time.monotonic())
+            self._query_cache.move_to_end(key)
+            while len(self._query_cache) > self._query_cache_size:
+                self._query_cache.popitem(last=False)
+                self._counters["evicted"] += 1
+        return embedding
+
+    def _rank(self, query: str, query_embedding: np.ndarray, top_k: int) -> list:
+        # Cosine similarity; both sides are already normalized.
+        similarities = self.embeddings @ query_embedding
+
+        # Get top K indices
+        top_k = min(top_k, len(similarities))
+        top_indices = np.argpartition(similarities, -top_k)[-top_k:]
+        top_indices = top_indices[np.argsort(similarities[top_indices])[::-1]]
+
+        results = [(self.templates[i]["id"], float(similarities[i])) for i in top_indices]
+        logger.info(f"Search results for '{query}': {results}")
+        return results
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", query.lower()).split())
+
+
+class _IndexPlan(NamedTuple):
+    """An index update: the registry version and templates it is for, the hash of each
+    template's text, and the (key, text) pairs that need embedding."""
+    version: int
+    templates: dict
+    hashes: dict
+    missing: list
+
+
+def _embeddings_by_key(missing: list, response) -> dict:
+    return {
+        key: _normalize(np.asarray(item["embedding"], dtype=np.float32))
+        for (key, _), item in zip(missing, response.data)
+    }
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
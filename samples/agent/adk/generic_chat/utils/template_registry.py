@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import threading
+import time
+from ..templates import TEMPLATES, TEMPLATES_DIR
+from .generator import validate_template
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateRegistry:
+    """The UI templates available to the agent: the built-in `TEMPLATES` plus the JSON files in the templates directory.
+
+    Templates are loaded on first use and validated once against the A2UI schema;
+    invalid ones are skipped with a warning. Each entry's "json" is stored ready to
+    be pasted into a prompt, with the doubled braces of the built-in templates
+    already de-escaped.
+
+    The directory is rescanned at most every `poll_interval` seconds when the
+    registry is read, so templates written by `scripts/generate_templates.py`
+    become available without a restart. Only new or modified files are reloaded,
+    and `version` changes whenever the set of templates does.
+    """
+
+    def __init__(self, builtin_templates: dict = TEMPLATES, templates_dir: str = TEMPLATES_DIR, poll_interval: float = 2.0):
+        self.templates_dir = templates_dir
+        self.poll_interval = poll_interval
+        self.version = 0
+        self._builtin_templates = builtin_templates
+        self._templates = None
+        # File name -> (modification time, template ID) for the templates loaded from disk
+        self._files = {}
+        self._last_scan = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, template_id: str) -> dict:
+        return self.templates().get(template_id)
+
+    def __contains__(self, template_id: str) -> bool:
+        return template_id in self.templates()
+
+    def templates(self) -> dict:
+        """Returns a snapshot of all templates by ID, rescanning the directory if due."""
+        if self._templates is None or time.monotonic() - self._last_scan >= self.poll_interval:
+            self.refresh()
+        return self._templates
+
+    def refresh(self) -> bool:
+        """Loads new and modified template files and drops deleted ones. Returns whether anything changed."""
+        with self._lock:
+            if self._templates is None:
+                templates = {}
+                for template_id, data in self._builtin_templates.items():
+                    # Built-in templates double their braces for use in f-strings
+                    template = {**data, "json": data["json"].replace("{{", "{").replace("}}", "}")}
+                    if self._is_valid(template_id, template):
+                        templates[template_id] = template
+            else:
+                templates = dict(self._templates)
+            changed = self._templates is None
+
+            files = self._scan()
+            for filename in self._files.keys() - files.keys():
+                _, template_id = self._files.pop(filename)
+                if template_id:
+                    templates.pop(template_id, None)
+                    logger.info(f"Removed template {template_id} ({filename} was deleted)")
+                    changed = True
+            for filename, mtime in files.items():
+                if filename in self._files and self._files[filename][0] == mtime:
+                    continue
+                _, previous_id = self._files.get(filename, (None, None))
+                if previous_id:
+                    templates.pop(previous_id, None)
+                template_id, template = self._load_file(filename)
+                self._files[filename] = (mtime, template_id)
+                if template_id:
+                    templates[template_id] = template
+                changed = changed or template_id is not None or previous_id is not None
+
+            self._last_scan = time.monotonic()
+            if changed:
+                self._templates = templates
+                self.version += 1
+                logger.info(f"Template registry now has {len(templates)} templates (version {self.version}).")
+            return changed
+
+    def _scan(self) -> dict:
+        try:
+            return {
+                entry.name: entry.stat().st_mtime
+                for entry in os.scandir(self.templates_dir)
+                if entry.name.endswith(".json") and entry.is_file()
+            }
+        except FileNotFoundError:
+            return {}
+
+    def _load_file(self, filename: str) -> tuple:
+        try:
+            with open(os.path.join(self.templates_dir, filename), 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Failed to load template {filename}: {e}")
+            return None, None
+
+        # Validate required fields
+        if not ("id" in data and "description" in data and "template_json" in data):
+            logger.warning(f"Skipping invalid template file: {filename}")
+            return None, None
+        template = {
+            "description": data["description"],
+            "keywords": data.get("keywords", ""),
+            "json": data["template_json"]
+        }
+        if not self._is_valid(data["id"], template):
+            return None, None
+        logger.info(f"Loaded dynamic template: {data['id']}")
+        return data["id"], template
+
+    def _is_valid(self, template_id: str, template: dict) -> bool:
+        error = validate_template(template["json"])
+        if error:
+            logger.warning(f"Skipping template {template_id}, it does not match the A2UI schema: {error}")
+        return error is None
+
+
+# Shared by the prompt builder and the template searcher
+TEMPLATE_REGISTRY = TemplateRegistry()
@@ -23,7 +23,11 @@ from a2a.server.tasks import InMemoryTaskStore
 from agent import OrchestratorAgent
 from agent_executor import OrchestratorAgentExecutor
 from dotenv import load_dotenv
+from google.adk.agents.remote_a2a_agent import DEFAULT_TIMEOUT
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
+from subagent_card_cache import SubagentCardCache
+from subagent_connection_pool import SubagentConnectionPool
 
 load_dotenv()
 
@@ -39,7 +43,12 @@ class MissingAPIKeyError(Exception):
 @click.option("--host", default="localhost", type=str)
 @click.option("--port", default=10002, type=int)
 @click.option("--subagent_urls", multiple=True, type=str, required=True)
-def main(host, port, subagent_urls):
+@click.option("--max_connections", default=100, type=int, help="Connections to subagents kept open at most.")
+@click.option("--max_connections_per_host", default=20, type=int, help="Concurrent requests to any one subagent.")
+@click.option("--max_keepalive_connections", default=20, type=int, help="Idle connections to subagents kept alive.")
+@click.option("--http2/--no-http2", default=True, help="Use HTTP/2 to subagents when the h2 package is installed.")
+@click.option("--stream_subagents/--no-stream_subagents", default=True, help="Forward A2UI messages from subagents as they stream in.")
+def main(host, port, subagent_urls, max_connections, max_connections_per_host, max_keepalive_connections, http2, stream_subagents):
     try:
         # Check for API key only if Vertex AI is not configured
         if not os.getenv("GOOGLE_GENAI_USE_VERTEXAI") == "TRUE":
@@ -50,7 +59,22 @@ def main(host, port, subagent_urls):
 
         base_url = f"http://{host}:{port}"
         
-        orchestrator_agent = asyncio.run(OrchestratorAgent.build_agent(subagent_urls=subagent_urls))
+        connection_pool = SubagentConnectionPool(
+            timeout=DEFAULT_TIMEOUT,
+            max_connections=max_connections,
+            max_connections_per_host=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_connections,
+            http2=http2,
+        )
+        card_cache = SubagentCardCache()
+        orchestrator_agent, unreachable_urls = asyncio.run(
+            OrchestratorAgent.build_agent(
+                subagent_urls=subagent_urls,
+                card_cache=card_cache,
+                connection_pool=connection_pool,
+                streaming=stream_subagents,
+            )
+        )
         agent_executor = OrchestratorAgentExecutor(base_url=base_url, agent=orchestrator_agent)
 
         request_handler = DefaultRequestHandler(
@@ -64,6 +88,32 @@ def main(host, port, subagent_urls):
 
         app = server.build()
 
+        async def connection_pool_stats(request):
+            return JSONResponse(connection_pool.stats())
+
+        # Active, idle and waiting connections to the subagents, for capacity planning
+        app.add_route("/connection-pool", connection_pool_stats, methods=["GET"])
+
+        registration_tasks = set()
+
+        async def register_unreachable_subagents():
+            # Runs on the serving event loop, the only one that touches the agent's subagents
+            if unreachable_urls:
+                task = asyncio.create_task(
+                    OrchestratorAgent.register_subagents_when_up(
+                        orchestrator_agent, unreachable_urls, card_cache, connection_pool, stream_subagents
+                    )
+                )
+                registration_tasks.add(task)
+                task.add_done_callback(registration_tasks.discard)
+
+        async def stop_registering_subagents():
+            for task in list(registration_tasks):
+                task.cancel()
+
+        app.add_event_handler("startup", register_unreachable_subagents)
+        app.add_event_handler("shutdown", stop_registering_subagents)
+
         app.add_middleware(
             CORSMiddleware,
             allow_origins=["http://localhost:5173"],
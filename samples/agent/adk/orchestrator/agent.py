@@ -12,10 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import json
 import logging
 import os
-from typing import List
+from typing import List, Optional
 from a2a.client import A2ACardResolver
 from a2a.extensions.common import HTTP_EXTENSION_HEADER
 from google.adk.models.lite_llm import LiteLlm
@@ -29,10 +30,12 @@ import part_converters
 from google.adk.agents.callback_context import  CallbackContext
 from google.adk.models.llm_request import LlmRequest
 from google.adk.models.llm_response import LlmResponse
-from subagent_route_manager import SubagentRouteManager
-from a2ui.a2ui_extension import is_a2ui_part, A2UI_EXTENSION_URI
+from subagent_card_cache import SubagentCardCache
+from subagent_connection_pool import SubagentConnectionPool
+from subagent_route_manager import SUBAGENT_ROUTE_MANAGER
+from a2ui.a2ui_extension import get_a2ui_datapart, A2UI_EXTENSION_URI
 from typing import override
-from a2a.types import TransportProtocol as A2ATransport
+from a2a.types import AgentCard, TransportProtocol as A2ATransport
 
 logger = logging.getLogger(__name__)
 from a2a.client.middleware import ClientCallInterceptor
@@ -93,11 +96,16 @@ class OrchestratorAgent:
             llm_request.contents
             and (last_content := llm_request.contents[-1]).parts
             and (a2a_part := part_converters.convert_genai_part_to_a2a_part(last_content.parts[-1]))
-            and is_a2ui_part(a2a_part)
-            and (user_action := a2a_part.root.data.get("userAction"))
+            and (a2ui_datapart := get_a2ui_datapart(a2a_part))
+            and (user_action := a2ui_datapart.data.get("userAction"))
             and (surface_id := user_action.get("surfaceId"))
-            and (target_agent := await SubagentRouteManager.get_route_to_subagent_name(surface_id, callback_context.state))
+            and (target_agent := SUBAGENT_ROUTE_MANAGER.get_route_to_subagent_name(callback_context.session.id, surface_id))
         ):
+            # The subagent may have been removed since the route was recorded
+            if not callback_context._invocation_context.agent.find_sub_agent(target_agent):
+                logger.info(f"Subagent '{target_agent}' for surfaceId '{surface_id}' no longer exists, routing with the LLM")
+                return None
+
             logger.info(f"Programmatically routing userAction for surfaceId '{surface_id}' to subagent '{target_agent}'")
             return LlmResponse(
                 content=genai_types.Content(
@@ -115,64 +123,44 @@ class OrchestratorAgent:
         return None
 
     @classmethod
-    async def build_agent(cls, subagent_urls: List[str]) -> LlmAgent:
-        """Builds the LLM agent for the orchestrator_agent agent."""
+    async def build_agent(
+        cls,
+        subagent_urls: List[str],
+        card_cache: Optional[SubagentCardCache] = None,
+        connection_pool: Optional[SubagentConnectionPool] = None,
+        streaming: bool = True,
+    ) -> tuple[LlmAgent, List[str]]:
+        """Builds the LLM agent for the orchestrator_agent agent.
+
+        Subagent cards are fetched concurrently. Subagents that can't be reached and
+        have no cached card are left out, and their URLs are returned with the agent
+        so they can be registered with `register_subagents_when_up` once the server
+        is running. All subagents send their requests through `connection_pool`.
+
+        With `streaming`, subagents that support it stream their task updates, and
+        the A2UI messages in them are forwarded to the client as they arrive.
+        """
+        card_cache = card_cache or SubagentCardCache()
+        connection_pool = connection_pool or SubagentConnectionPool(timeout=DEFAULT_TIMEOUT)
+        # Cards are fetched with a short-lived client, since the pool's connections
+        # must not be opened on this event loop
+        async with httpx.AsyncClient() as httpx_client:
+            subagent_cards = await asyncio.gather(
+                *[card_cache.fetch(httpx_client, subagent_url) for subagent_url in subagent_urls],
+                return_exceptions=True,
+            )
 
         subagents = []
-        for subagent_url in subagent_urls:
-            async with httpx.AsyncClient() as httpx_client:
-                resolver = A2ACardResolver(
-                    httpx_client=httpx_client,
-                    base_url=subagent_url,
-                )
-                
-                subagent_card =  await resolver.get_agent_card()
-                logger.info('Successfully fetched public agent card:' + subagent_card.model_dump_json(indent=2, exclude_none=True))
-                
-                # clean name for adk
-                clean_name = re.sub(r'[^0-9a-zA-Z_]+', '_', subagent_card.name)                
-                if clean_name == "":
-                    clean_name = "_"
-                if clean_name[0].isdigit():
-                    clean_name = f"_{clean_name}"
-                
-                # make remote agent
-                description = json.dumps({
-                    "id": clean_name,
-                    "name": subagent_card.name,
-                    "description": subagent_card.description,
-                    "skills": [
-                        {
-                            "name": skill.name, 
-                            "description": skill.description, 
-                            "examples": skill.examples, 
-                            "tags": skill.tags
-                        } for skill in subagent_card.skills
-                    ]
-                }, indent=2)
-                remote_a2a_agent = RemoteA2aAgent(
-                    clean_name, 
-                    subagent_card, 
-                    description=description, # This will be appended to system instructions
-                    a2a_part_converter=part_converters.convert_a2a_part_to_genai_part,
-                    genai_part_converter=part_converters.convert_genai_part_to_a2a_part,                      
-                    a2a_client_factory=A2AClientFactoryWithA2UIMetadata(
-                        config=A2AClientConfig(
-                            httpx_client=httpx.AsyncClient(
-                                timeout=httpx.Timeout(timeout=DEFAULT_TIMEOUT),
-                            ),
-                            streaming=False,
-                            polling=False,
-                            supported_transports=[A2ATransport.jsonrpc],
-                        )
-                    )
-                )
-                subagents.append(remote_a2a_agent)
-                
-                logger.info(f'Created remote agent with description: {description}')
+        unreachable_urls = []
+        for subagent_url, subagent_card in zip(subagent_urls, subagent_cards):
+            if isinstance(subagent_card, Exception):
+                logger.warning(f"Subagent at {subagent_url} is unreachable ({subagent_card!r}), will register it when it is up")
+                unreachable_urls.append(subagent_url)
+            else:
+                subagents.append(cls._create_remote_agent(subagent_card, connection_pool.client, streaming))
 
         LITELLM_MODEL = os.getenv("LITELLM_MODEL", "gemini/gemini-2.5-flash")
-        return LlmAgent(
+        agent = LlmAgent(
             model=LiteLlm(model=LITELLM_MODEL),
             name="orchestrator_agent",
             description="An agent that orchestrates requests to multiple other agents",
@@ -186,3 +174,86 @@ class OrchestratorAgent:
             sub_agents=subagents,
             before_model_callback=cls.programmtically_route_user_action_to_subagent,
         )
+        return agent, unreachable_urls
+
+    @classmethod
+    def _create_remote_agent(cls, subagent_card: AgentCard, httpx_client: httpx.AsyncClient, streaming: bool) -> RemoteA2aAgent:
+        logger.info('Successfully fetched public agent card:' + subagent_card.model_dump_json(indent=2, exclude_none=True))
+
+        # clean name for adk
+        clean_name = re.sub(r'[^0-9a-zA-Z_]+', '_', subagent_card.name)
+        if clean_name == "":
+            clean_name = "_"
+        if clean_name[0].isdigit():
+            clean_name = f"_{clean_name}"
+
+        # make remote agent
+        description = json.dumps({
+            "id": clean_name,
+            "name": subagent_card.name,
+            "description": subagent_card.description,
+            "skills": [
+                {
+                    "name": skill.name,
+                    "description": skill.description,
+                    "examples": skill.examples,
+                    "tags": skill.tags
+                } for skill in subagent_card.skills
+            ]
+        }, indent=2)
+        remote_a2a_agent = RemoteA2aAgent(
+            clean_name,
+            subagent_card,
+            description=description, # This will be appended to system instructions
+            a2a_part_converter=part_converters.convert_a2a_part_to_genai_part,
+            genai_part_converter=part_converters.convert_genai_part_to_a2a_part,
+            a2a_client_factory=A2AClientFactoryWithA2UIMetadata(
+                config=A2AClientConfig(
+                    httpx_client=httpx_client,
+                    # Only used if the subagent's card says it supports streaming
+                    streaming=streaming,
+                    polling=False,
+                    supported_transports=[A2ATransport.jsonrpc],
+                )
+            )
+        )
+        logger.info(f'Created remote agent with description: {description}')
+        return remote_a2a_agent
+
+    @classmethod
+    async def register_subagents_when_up(
+        cls,
+        agent: LlmAgent,
+        subagent_urls: List[str],
+        card_cache: SubagentCardCache,
+        connection_pool: SubagentConnectionPool,
+        streaming: bool = True,
+        max_retry_interval: float = 60.0,
+    ):
+        """Keeps fetching the cards of unreachable subagents and adds each one to the agent once it is up.
+
+        Must run on the event loop serving requests, which also reads the agent's subagents.
+        """
+        pending_urls = list(subagent_urls)
+        retry_interval = 1.0
+        while pending_urls:
+            await asyncio.sleep(retry_interval)
+            retry_interval = min(retry_interval * 2, max_retry_interval)
+            subagent_cards = await asyncio.gather(
+                *[card_cache.fetch(connection_pool.client, subagent_url) for subagent_url in pending_urls],
+                return_exceptions=True,
+            )
+            still_pending_urls = []
+            new_subagents = []
+            for subagent_url, subagent_card in zip(pending_urls, subagent_cards):
+                if isinstance(subagent_card, Exception):
+                    still_pending_urls.append(subagent_url)
+                    continue
+                remote_a2a_agent = cls._create_remote_agent(subagent_card, connection_pool.client, streaming)
+                remote_a2a_agent.parent_agent = agent
+                new_subagents.append(remote_a2a_agent)
+                logger.info(f"Registered subagent {remote_a2a_agent.name} from {subagent_url}")
+            if new_subagents:
+                # Replaced rather than appended to, so a request never sees a list being changed
+                agent.sub_agents = [*agent.sub_agents, *new_subagents]
+            pending_urls = still_pending_urls
@@ -12,14 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import asyncio
 import logging
 import json
+from collections import OrderedDict
 from typing import List, Optional, override
 from google.adk.agents.invocation_context import new_invocation_context_id
 from google.adk.events.event_actions import EventActions
 
 from a2a.server.agent_execution import RequestContext
+from google.adk.agents.base_agent import BaseAgent
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.artifacts import InMemoryArtifactService
 from a2a.server.events.event_queue import EventQueue
@@ -30,14 +31,15 @@ from google.adk.a2a.executor.a2a_agent_executor import (
     A2aAgentExecutorConfig,
     A2aAgentExecutor,
 )
-from a2a.types import AgentCapabilities, AgentCard, AgentExtension
-from a2ui.a2ui_extension import is_a2ui_part, try_activate_a2ui_extension, A2UI_EXTENSION_URI, STANDARD_CATALOG_ID, SUPPORTED_CATALOG_IDS_KEY, get_a2ui_agent_extension, A2UI_CLIENT_CAPABILITIES_KEY
+from a2a.types import AgentCapabilities, AgentCard, AgentExtension, TaskState
+from google.adk.agents.remote_a2a_agent import A2A_METADATA_PREFIX
+from a2ui.a2ui_extension import get_a2ui_datapart, try_activate_a2ui_extension, A2UI_EXTENSION_URI, STANDARD_CATALOG_ID, SUPPORTED_CATALOG_IDS_KEY, get_a2ui_agent_extension, A2UI_CLIENT_CAPABILITIES_KEY
 from google.adk.a2a.converters import event_converter
 from a2a.server.events import Event as A2AEvent
 from google.adk.events.event import Event
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.a2a.converters import part_converter
-from subagent_route_manager import SubagentRouteManager
+from subagent_route_manager import SUBAGENT_ROUTE_MANAGER
 
 from agent import OrchestratorAgent
 import part_converters
@@ -48,8 +50,17 @@ logger = logging.getLogger(__name__)
 class OrchestratorAgentExecutor(A2aAgentExecutor):
     """Contact AgentExecutor Example."""
 
+    # Subagent tasks remembered as streaming
+    MAX_TRACKED_TASKS = 1024
+
     def __init__(self, base_url: str, agent: LlmAgent):
         self._base_url = base_url
+        # IDs of the subagent tasks that streamed working updates, least recently used first
+        self._streaming_task_ids: OrderedDict[str, None] = OrderedDict()
+        # Subagent name -> its parsed description, or None for authors that aren't subagents
+        self._subagent_cards: dict[str, Optional[dict]] = {
+            subagent.name: self._parse_subagent_card(subagent) for subagent in agent.sub_agents
+        }
 
         config = A2aAgentExecutorConfig(
             gen_ai_part_converter=part_converters.convert_genai_part_to_a2a_part,
@@ -67,15 +78,32 @@ class OrchestratorAgentExecutor(A2aAgentExecutor):
 
         super().__init__(runner=runner, config=config)
 
-    @classmethod
     def convert_event_to_a2a_events_and_save_surface_id_to_subagent_name(
-        cls,
+        self,
         event: Event,
         invocation_context: InvocationContext,
         task_id: Optional[str] = None,
         context_id: Optional[str] = None,
         part_converter: part_converter.GenAIPartToA2APartConverter = part_converter.convert_genai_part_to_a2a_part,
     ) -> List[A2AEvent]:
+        subagent_response = (event.custom_metadata or {}).get(A2A_METADATA_PREFIX + "response")
+        if isinstance(subagent_response, dict) and subagent_response.get("kind") == "task":
+            subagent_task_id = subagent_response.get("id")
+            subagent_task_state = subagent_response.get("status", {}).get("state")
+            if subagent_task_state == TaskState.submitted.value:
+                # The task a streaming subagent starts with only echoes the request back
+                return []
+            if subagent_response.get("artifacts") and subagent_task_id in self._streaming_task_ids:
+                # ADK-based subagents end a stream with an artifact repeating the parts
+                # they streamed, and events from artifacts carry the task's artifacts
+                self._streaming_task_ids.pop(subagent_task_id)
+                return []
+            if subagent_task_state == TaskState.working.value:
+                self._streaming_task_ids[subagent_task_id] = None
+                self._streaming_task_ids.move_to_end(subagent_task_id)
+                if len(self._streaming_task_ids) > self.MAX_TRACKED_TASKS:
+                    self._streaming_task_ids.popitem(last=False)
+
         a2a_events = event_converter.convert_event_to_a2a_events(
             event,
             invocation_context,
@@ -84,39 +112,48 @@ class OrchestratorAgentExecutor(A2aAgentExecutor):
             part_converter,
         )
 
+        subagent_card = self._get_subagent_card(event.author, invocation_context) if event.author else None
+        # Surface ID -> subagent name, or None for deleted surfaces
+        surface_routes = {}
         for a2a_event in a2a_events:
-            # Try to populate subagent agent card if available.
-            subagent_card = None
-            if (active_subagent_name := event.author):
-                # We need to find the subagent by name
-                if (subagent := next((sub for sub in invocation_context.agent.sub_agents if sub.name == active_subagent_name), None)):
-                    try:
-                        subagent_card = json.loads(subagent.description)
-                    except Exception:
-                        logger.warning(f"Failed to parse agent description for {active_subagent_name}")
             if subagent_card:
                 if a2a_event.metadata is None:
                     a2a_event.metadata = {}
                 a2a_event.metadata["a2a_subagent"] = subagent_card
-                        
-            for a2a_part in a2a_event.status.message.parts:
+
+            for a2a_part in a2a_event.status.message.parts if a2a_event.status.message else []:
+                if not (a2ui_datapart := get_a2ui_datapart(a2a_part)):
+                    continue
                 if (
-                    is_a2ui_part(a2a_part)
-                    and (begin_rendering := a2a_part.root.data.get("beginRendering"))
+                    (begin_rendering := a2ui_datapart.data.get("beginRendering"))
                     and (surface_id := begin_rendering.get("surfaceId"))
-                ):                    
-                    asyncio.run_coroutine_threadsafe(
-                        SubagentRouteManager.set_route_to_subagent_name(
-                            surface_id,
-                            event.author,
-                            invocation_context.session_service,
-                            invocation_context.session,
-                        ),
-                        asyncio.get_event_loop(),
-                    )
+                ):
+                    surface_routes[surface_id] = event.author
+                elif (
+                    (delete_surface := a2ui_datapart.data.get("deleteSurface"))
+                    and (surface_id := delete_surface.get("surfaceId"))
+                ):
+                    surface_routes[surface_id] = None
 
+        if surface_routes:
+            SUBAGENT_ROUTE_MANAGER.update_routes(invocation_context.session.id, surface_routes)
         return a2a_events
 
+    def _get_subagent_card(self, name: str, invocation_context: InvocationContext) -> Optional[dict]:
+        if name not in self._subagent_cards:
+            # Subagents registered after startup are parsed on their first event
+            subagent = invocation_context.agent.find_sub_agent(name)
+            self._subagent_cards[name] = self._parse_subagent_card(subagent) if subagent else None
+        return self._subagent_cards[name]
+
+    @staticmethod
+    def _parse_subagent_card(subagent: BaseAgent) -> Optional[dict]:
+        try:
+            return json.loads(subagent.description)
+        except Exception:
+            logger.warning(f"Failed to parse agent description for {subagent.name}")
+            return None
+
     def get_agent_card(self) -> AgentCard:
         return AgentCard(
             name="Orchestrator Agent",
@@ -19,9 +19,7 @@ from a2a import types as a2a_types
 from google.genai import types as genai_types
 
 from google.adk.a2a.converters import part_converter
-from a2ui.a2ui_extension import is_a2ui_part
-
-import pydantic
+from a2ui.a2ui_extension import is_a2ui_part, parse_a2ui_part_json
 
 logger = logging.getLogger(__name__)
 
@@ -38,14 +36,8 @@ def convert_a2a_part_to_genai_part(
 def convert_genai_part_to_a2a_part(    
     part: genai_types.Part,
 ) -> Optional[a2a_types.Part]:
-    if part.text:
-        try:
-            a2a_part = a2a_types.Part.model_validate_json(part.text)
-            if is_a2ui_part(a2a_part):           
-                logger.info(f'Converted A2UI part from GenAI: {part.model_dump_json(exclude_none=True)} to A2A: {a2a_part.model_dump_json(exclude_none=True)}'[:200] + "...")    
-                return a2a_part        
-        except pydantic.ValidationError:
-            # Expected for normal text input
-            pass
-        
+    if part.text and (a2a_part := parse_a2ui_part_json(part.text)):
+        logger.info(f'Converted A2UI part from GenAI: {part.model_dump_json(exclude_none=True)} to A2A: {a2a_part.model_dump_json(exclude_none=True)}'[:200] + "...")
+        return a2a_part
+
     return part_converter.convert_genai_part_to_a2a_part(part)
\ No newline at end of file
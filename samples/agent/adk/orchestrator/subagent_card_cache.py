@@ -0,0 +1,103 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Optional
+
+import httpx
+from a2a.types import AgentCard
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), ".agent_card_cache")
+
+
+class SubagentCardCache:
+    """Fetches subagent cards, keeping the last good copy of each on disk.
+
+    Each fetch is a conditional request using the cached card's ETag and
+    Last-Modified headers, so an unchanged card costs a 304 response. When a
+    subagent can't be reached, its cached card is used instead.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, timeout: float = 5.0):
+        self._cache_dir = cache_dir
+        self._timeout = timeout
+
+    async def fetch(self, httpx_client: httpx.AsyncClient, base_url: str) -> AgentCard:
+        """Fetches the agent card of a subagent.
+
+        Raises:
+            httpx.HTTPError, asyncio.TimeoutError or ValueError if the card could
+            not be fetched within the timeout and is not cached.
+        """
+        entry = self._read(base_url)
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        target_url = base_url.rstrip("/") + AGENT_CARD_WELL_KNOWN_PATH
+        try:
+            response = await asyncio.wait_for(
+                httpx_client.get(target_url, headers=headers), self._timeout
+            )
+            if response.status_code == 304 and entry:
+                logger.info(f"Agent card for {base_url} is unchanged, using cached copy")
+                return AgentCard.model_validate(entry["card"])
+            response.raise_for_status()
+            card_data = response.json()
+            card = AgentCard.model_validate(card_data)
+        except (httpx.HTTPError, asyncio.TimeoutError, ValueError) as e:
+            if not entry:
+                raise
+            logger.warning(f"Failed to fetch agent card from {target_url} ({e!r}), using cached copy")
+            return AgentCard.model_validate(entry["card"])
+
+        self._write(base_url, {
+            "card": card_data,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        })
+        logger.info(f"Fetched agent card from {target_url}")
+        return card
+
+    def _path(self, base_url: str) -> str:
+        return os.path.join(self._cache_dir, hashlib.sha256(base_url.encode()).hexdigest() + ".json")
+
+    def _read(self, base_url: str) -> Optional[dict[str, Any]]:
+        try:
+            with open(self._path(base_url)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached agent card for {base_url}: {e}")
+            return None
+
+    def _write(self, base_url: str, entry: dict[str, Any]) -> None:
+        path = self._path(base_url)
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(entry, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as e:
+            logger.warning(f"Failed to cache agent card for {base_url}: {e}")
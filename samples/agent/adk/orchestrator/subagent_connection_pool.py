@@ -0,0 +1,188 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import importlib.util
+import logging
+from typing import Any, Callable
+
+import httpcore
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class SubagentConnectionPool:
+    """The HTTP connection pool shared by all of the orchestrator's subagents.
+
+    Connections are kept alive between requests and, when the `h2` package is
+    installed, negotiated as HTTP/2 so concurrent requests to a subagent share one
+    connection. `max_connections_per_host` caps the concurrent requests to any one
+    subagent, so a slow subagent can't take every connection in the pool.
+
+    The client must only be used from a single event loop, the one serving
+    requests, since its connections are bound to the loop they were opened on.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        max_connections: int = 100,
+        max_connections_per_host: int = 20,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+    ):
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 needs the h2 package (pip install 'httpx[http2]'), falling back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self._pool_transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+        self._transport = _HostLimitedTransport(self._pool_transport, max_connections_per_host)
+        self.client = httpx.AsyncClient(
+            transport=self._transport,
+            timeout=httpx.Timeout(timeout=timeout),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the number of active, idle and waiting connections, in total and per host.
+
+        Requests are waiting when they are queued behind `max_connections_per_host`
+        or `max_connections`. If httpcore's pool can't be inspected, connections are
+        counted from the requests in flight instead, and idle ones aren't reported.
+        """
+        hosts: dict[str, dict[str, int]] = {}
+
+        def host_stats(host: str) -> dict[str, int]:
+            return hosts.setdefault(host, {"active": 0, "idle": 0, "waiting": 0})
+
+        if not self._add_pool_stats(host_stats):
+            hosts.clear()
+            for host, active in self._transport.active.items():
+                host_stats(host)["active"] += active
+        for host, waiting in self._transport.waiting.items():
+            host_stats(host)["waiting"] += waiting
+
+        return {
+            "http2": self.http2,
+            **{key: sum(stats[key] for stats in hosts.values()) for key in ("active", "idle", "waiting")},
+            "hosts": hosts,
+        }
+
+    def _add_pool_stats(self, host_stats: Callable[[str], dict[str, int]]) -> bool:
+        """Counts connections from httpcore's connection pool. Returns False if it can't be read.
+
+        httpx doesn't expose its pool, and the attributes read here aren't public
+        httpcore API, so any of them may be missing in another httpcore version.
+        """
+        try:
+            pool = getattr(self._pool_transport, "_pool", None)
+            connections = getattr(pool, "connections", None)
+            if connections is None:
+                return False
+            for connection in connections:
+                origin = getattr(connection, "_origin", None)
+                if origin is None:
+                    return False
+                if connection.is_closed():
+                    continue
+                host_stats(_host(origin))["idle" if connection.is_idle() else "active"] += 1
+            for pool_request in getattr(pool, "_requests", ()):
+                if pool_request.is_queued():
+                    host_stats(_host(pool_request.request.url.origin))["waiting"] += 1
+        except Exception:
+            logger.debug("Failed to read httpcore's connection pool", exc_info=True)
+            return False
+        return True
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def _host(origin: httpcore.Origin) -> str:
+    return f"{origin.host.decode('ascii')}:{origin.port}"
+
+
+class _HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Lets at most `max_per_host` requests to each host hold a connection at a time.
+
+    A request keeps its slot until its response has been read and closed.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        # Host -> number of requests holding a slot
+        self.active: dict[str, int] = {}
+        # Host -> number of requests waiting for a slot
+        self.waiting: dict[str, int] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = _host(httpcore.URL(str(request.url)).origin)
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self._max_per_host)
+
+        if semaphore.locked():
+            self.waiting[host] = self.waiting.get(host, 0) + 1
+            try:
+                await semaphore.acquire()
+            finally:
+                self.waiting[host] -= 1
+        else:
+            await semaphore.acquire()
+        self.active[host] = self.active.get(host, 0) + 1
+
+        def release():
+            self.active[host] -= 1
+            semaphore.release()
+
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """A response stream that calls `release` once, when it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release:
+                self._release, release = None, self._release
+                release()
@@ -13,52 +13,91 @@
 # limitations under the License.
 
 import logging
+import time
+from collections import OrderedDict
 from typing import Optional
-from google.adk.agents.invocation_context import new_invocation_context_id
-from google.adk.events.event import Event
-from google.adk.events.event_actions import EventActions
-from google.adk.sessions.base_session_service import BaseSessionService
-from google.adk.sessions.session import Session
-from google.adk.sessions.state import State
+
+logger = logging.getLogger(__name__)
 
 
 class SubagentRouteManager:
-  """Manages routing of tasks to sub-agents."""
+  """Manages routing of A2UI surfaces to the subagents that created them.
 
-  ROUTING_KEY_PREFIX = "route_to_subagent_name_for_surface_id_"
+  Routes are kept in a bounded in-memory table rather than in session state, so
+  recording or reading a route never appends a session event. A route expires
+  `ttl` seconds after it was last set or used, the least recently used routes
+  are evicted beyond `max_routes`, and a route is removed when its surface is
+  deleted. A missing route only means the orchestrator LLM picks the subagent.
+  """
 
-  @classmethod
-  def _get_routing_key(cls, surface_id: str) -> str:
-    return cls.ROUTING_KEY_PREFIX + surface_id
+  def __init__(self, max_routes: int = 10000, ttl: float = 3600.0):
+    self.max_routes = max_routes
+    self.ttl = ttl
+    # (session ID, surface ID) -> (subagent name, expiry time), least recently used first
+    self._routes: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
 
-  @classmethod
-  async def get_route_to_subagent_name(
-      cls, surface_id: str, state: State
+  def get_route_to_subagent_name(
+      self, session_id: str, surface_id: str
   ) -> Optional[str]:
-    """Gets the subagent route for the given tool call id."""
-    subagent_name = state.get(cls._get_routing_key(surface_id), None)
-    logging.info("Got subagent route for surface_id %s to subagent_name %s", surface_id, subagent_name)    
+    """Gets the subagent route for the given surface, if it hasn't expired."""
+    key = (session_id, surface_id)
+    route = self._routes.get(key)
+    if route is None:
+      return None
+    subagent_name, expiry = route
+    now = time.monotonic()
+    if expiry <= now:
+      del self._routes[key]
+      logger.info("Subagent route for surface_id %s expired", surface_id)
+      return None
+    self._routes[key] = (subagent_name, now + self.ttl)
+    self._routes.move_to_end(key)
     return subagent_name
 
-  @classmethod
-  async def set_route_to_subagent_name(
-      cls,
-      surface_id: str,
-      subagent_name: str,
-      session_service: BaseSessionService,
-      session: Session,
+  def set_route_to_subagent_name(
+      self, session_id: str, surface_id: str, subagent_name: str
+  ):
+    """Sets the subagent route for the given surface."""
+    self.update_routes(session_id, {surface_id: subagent_name})
+
+  def remove_route(self, session_id: str, surface_id: str):
+    """Removes the route of a deleted surface."""
+    self.update_routes(session_id, {surface_id: None})
+
+  def update_routes(
+      self, session_id: str, routes: dict[str, Optional[str]]
   ):
-    """Sets the subagent route for the given tool call id."""
-    key = cls._get_routing_key(surface_id)    
+    """Sets the routes of several surfaces of a session at once.
+
+    Args:
+      session_id: The session the surfaces belong to.
+      routes: Surface ID -> subagent name, or None to remove the surface's route.
+    """
+    now = time.monotonic()
+    for surface_id, subagent_name in routes.items():
+      key = (session_id, surface_id)
+      if subagent_name is None:
+        if self._routes.pop(key, None):
+          logger.info("Removed subagent route for surface_id %s", surface_id)
+        continue
+      previous = self._routes.get(key)
+      self._routes[key] = (subagent_name, now + self.ttl)
+      self._routes.move_to_end(key)
+      if previous is None or previous[0] != subagent_name:
+        logger.info("Set subagent route for surface_id %s to subagent_name %s", surface_id, subagent_name)
+    self._evict(now)
+
+  def __len__(self) -> int:
+    return len(self._routes)
+
+  def _evict(self, now: float):
+    # Every route gets the same TTL on use, so expired routes are the least recently used
+    while self._routes:
+      key, (_, expiry) = next(iter(self._routes.items()))
+      if expiry > now and len(self._routes) <= self.max_routes:
+        break
+      del self._routes[key]
 
-    if session.state.get(key) != subagent_name:
-      await session_service.append_event(
-          session,
-          Event(
-              invocation_id=new_invocation_context_id(),
-              author="system",
-              actions=EventActions(state_delta={key: subagent_name}),
-          ),
-      )
 
-      logging.info("Set subagent route for surface_id %s to subagent_name %s", surface_id, subagent_name)
\ No newline at end of file
+# Shared by the orchestrator agent, which reads routes, and its executor, which records them
+SUBAGENT_ROUTE_MANAGER = SubagentRouteManager()
@@ -40,7 +40,13 @@ class MissingAPIKeyError(Exception):
 @click.command()
 @click.option("--host", default="localhost")
 @click.option("--port", default=10002)
-def main(host, port):
+@click.option(
+    "--minimize-surface-updates",
+    is_flag=True,
+    default=False,
+    help="Only resend changed components and data. Use with clients that keep surfaces between responses.",
+)
+def main(host, port, minimize_surface_updates):
     try:
         # Check for API key only if Vertex AI is not configured
         if not os.getenv("GOOGLE_GENAI_USE_VERTEXAI") == "TRUE":
@@ -74,7 +80,9 @@ def main(host, port):
             skills=[skill],
         )
 
-        agent_executor = RestaurantAgentExecutor(base_url=base_url)
+        agent_executor = RestaurantAgentExecutor(
+            base_url=base_url, minimize_surface_updates=minimize_surface_updates
+        )
 
         request_handler = DefaultRequestHandler(
             agent_executor=agent_executor,
@@ -0,0 +1,49 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from a2ui.templates import A2uiTemplate, extract_examples
+from a2ui_examples import RESTAURANT_UI_EXAMPLES
+
+
+def build_action_templates() -> dict[str, A2uiTemplate]:
+    """Compiles the templates for user actions that always render the same UI.
+
+    Returns:
+        The templates by action name.
+    """
+    examples = extract_examples(RESTAURANT_UI_EXAMPLES)
+    return {
+        "book_restaurant": A2uiTemplate.from_example(
+            examples["BOOKING_FORM_EXAMPLE"],
+            data={
+                "title": "Book a Table at {restaurantName}",
+                "address": "{address}",
+                "restaurantName": "{restaurantName}",
+                "imageUrl": "{imageUrl}",
+            },
+            defaults={"address": "Address not provided", "imageUrl": ""},
+            text="Please fill in your booking details for {restaurantName}.",
+        ),
+        "submit_booking": A2uiTemplate.from_example(
+            examples["CONFIRMATION_EXAMPLE"],
+            data={
+                "title": "Booking at {restaurantName}",
+                "bookingDetails": "{partySize} people at {reservationTime}",
+                "dietaryRequirements": "Dietary Requirements: {dietary}",
+                "imageUrl": "{imageUrl}",
+            },
+            defaults={"dietary": "None", "imageUrl": ""},
+            text="Your table at {restaurantName} is booked.",
+        ),
+    }
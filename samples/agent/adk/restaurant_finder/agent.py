@@ -19,6 +19,9 @@ from collections.abc import AsyncIterable
 from typing import Any
 
 import jsonschema
+from a2ui.integrity import check_integrity
+from a2ui.json_repair import JsonRepairer
+from a2ui.validator import get_validator
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
@@ -79,15 +82,19 @@ class RestaurantAgent:
 
             # The prompt instructs the LLM to return a *list* of messages.
             # Therefore, our validation schema must be an *array* of the single message schema.
-            self.a2ui_schema_object = {"type": "array", "items": single_message_schema}
+            # The validator is compiled once and shared through the process-wide cache.
+            self.a2ui_validator = get_validator(single_message_schema, as_array=True)
             logger.info(
                 "A2UI_SCHEMA successfully loaded and wrapped in an array validator."
             )
         except json.JSONDecodeError as e:
             logger.error(f"CRITICAL: Failed to parse A2UI_SCHEMA: {e}")
-            self.a2ui_schema_object = None
+            self.a2ui_validator = None
         # --- END MODIFICATION ---
 
+        # Repairs common LLM JSON syntax errors before falling back to a retry.
+        self.json_repairer = JsonRepairer()
+
     def get_processing_message(self) -> str:
         return "Finding restaurants that match your criteria..."
 
@@ -135,7 +142,7 @@ class RestaurantAgent:
         current_query_text = query
 
         # Ensure schema was loaded
-        if self.use_ui and self.a2ui_schema_object is None:
+        if self.use_ui and self.a2ui_validator is None:
             logger.error(
                 "--- RestaurantAgent.stream: A2UI_SCHEMA is not loaded. "
                 "Cannot perform UI validation. ---"
@@ -219,27 +226,35 @@ class RestaurantAgent:
                     if not json_string.strip():
                         raise ValueError("JSON part is empty.")
 
-                    json_string_cleaned = (
-                        json_string.strip().lstrip("```json").rstrip("```").strip()
-                    )
-
-                    if not json_string_cleaned:
-                        raise ValueError("Cleaned JSON string is empty.")
-
                     # --- New Validation Steps ---
-                    # 1. Check if it's parsable JSON
-                    parsed_json_data = json.loads(json_string_cleaned)
+                    # 1. Check if it's parsable JSON, repairing trailing commas, truncated output
+                    # and similar syntax errors locally before asking the LLM again
+                    parsed_json_data, repairs = self.json_repairer.parse(
+                        json_string, expect_array=True
+                    )
 
                     # 2. Check if it validates against the A2UI_SCHEMA
                     # This will raise jsonschema.exceptions.ValidationError if it fails
                     logger.info(
                         "--- RestaurantAgent.stream: Validating against A2UI_SCHEMA... ---"
                     )
-                    jsonschema.validate(
-                        instance=parsed_json_data, schema=self.a2ui_schema_object
-                    )
+                    self.a2ui_validator.validate(parsed_json_data)
+
+                    # 3. Check that the component tree can render (e.g. no dangling child IDs)
+                    # This will raise A2uiIntegrityError, a ValueError, listing every problem found
+                    check_integrity(parsed_json_data)
                     # --- End New Validation Steps ---
 
+                    if repairs:
+                        # Send the repaired JSON, which the client can parse
+                        logger.info(
+                            f"--- RestaurantAgent.stream: Repaired UI JSON locally: {repairs}. "
+                            f"Repair counters: {self.json_repairer.counters} ---"
+                        )
+                        final_response_content = (
+                            f"{text_part}---a2ui_JSON---\n{json.dumps(parsed_json_data)}"
+                        )
+
                     logger.info(
                         f"--- RestaurantAgent.stream: UI JSON successfully parsed AND validated against schema. "
                         f"Validation OK (Attempt {attempt}). ---"
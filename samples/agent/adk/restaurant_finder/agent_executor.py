@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
+import functools
 import logging
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
@@ -20,7 +20,6 @@ from a2a.server.events import EventQueue
 from a2a.server.tasks import TaskUpdater
 from a2a.types import (
     DataPart,
-    Part,
     Task,
     TaskState,
     TextPart,
@@ -32,7 +31,15 @@ from a2a.utils import (
     new_task,
 )
 from a2a.utils.errors import ServerError
-from a2ui.a2ui_extension import create_a2ui_part, try_activate_a2ui_extension
+from a2ui.a2ui_extension import (
+    A2UI_CLIENT_CAPABILITIES_KEY,
+    get_a2ui_mime_type,
+    try_activate_a2ui_extension,
+)
+from a2ui.data_model_delta import DataModelDeltaEngine
+from a2ui.response_assembler import A2uiResponseAssembler, A2uiTransformFn
+from a2ui.surface_state import SurfaceStateStore
+from action_templates import build_action_templates
 from agent import RestaurantAgent
 
 logger = logging.getLogger(__name__)
@@ -41,11 +48,21 @@ logger = logging.getLogger(__name__)
 class RestaurantAgentExecutor(AgentExecutor):
     """Restaurant AgentExecutor Example."""
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, minimize_surface_updates: bool = False):
         # Instantiate two agents: one for UI and one for text-only.
         # The appropriate one will be chosen at execution time.
         self.ui_agent = RestaurantAgent(base_url=base_url, use_ui=True)
         self.text_agent = RestaurantAgent(base_url=base_url, use_ui=False)
+        # Only resend changed components and data for clients that keep surfaces between responses.
+        self._surface_state = SurfaceStateStore() if minimize_surface_updates else None
+        self._data_model_delta = DataModelDeltaEngine() if minimize_surface_updates else None
+        # Actions that always render the same UI skip the LLM.
+        self._action_templates = build_action_templates()
+        for name, template in self._action_templates.items():
+            if self.ui_agent.a2ui_validator:
+                _, messages = template.render({field: "" for field in template.fields})
+                self.ui_agent.a2ui_validator.validate(messages)
+            logger.info(f"Compiled A2UI template for action '{name}'.")
 
     async def execute(
         self,
@@ -116,6 +133,13 @@ class RestaurantAgentExecutor(AgentExecutor):
 
         logger.info(f"--- AGENT_EXECUTOR: Final query for LLM: '{query}' ---")
 
+        # Use the compact A2UI encoding for clients that support it
+        a2ui_mime_type = get_a2ui_mime_type(
+            context.message.metadata.get(A2UI_CLIENT_CAPABILITIES_KEY)
+            if context.message and context.message.metadata
+            else None
+        )
+
         task = context.current_task
 
         if not task:
@@ -123,6 +147,31 @@ class RestaurantAgentExecutor(AgentExecutor):
             await event_queue.enqueue_event(task)
         updater = TaskUpdater(event_queue, task.id, task.context_id)
 
+        if use_ui and action in self._action_templates:
+            try:
+                text, messages = self._action_templates[action].render(ctx)
+            except KeyError as e:
+                logger.warning(
+                    f"Action '{action}' is missing context {e}, falling back to the LLM."
+                )
+            else:
+                logger.info(f"--- AGENT_EXECUTOR: Rendering template for '{action}' ---")
+                final_state = (
+                    TaskState.completed
+                    if action == "submit_booking"
+                    else TaskState.input_required
+                )
+                final_parts = A2uiResponseAssembler(
+                    transforms=self._get_transforms(task.context_id),
+                    mime_type=a2ui_mime_type,
+                ).finish_messages(text, messages)
+                await updater.update_status(
+                    final_state,
+                    new_agent_parts_message(final_parts, task.context_id, task.id),
+                    final=(final_state == TaskState.completed),
+                )
+                return
+
         async for item in agent.stream(query, task.context_id):
             is_task_complete = item["is_task_complete"]
             if not is_task_complete:
@@ -138,51 +187,10 @@ class RestaurantAgentExecutor(AgentExecutor):
                 else TaskState.input_required
             )
 
-            content = item["content"]
-            final_parts = []
-            if "---a2ui_JSON---" in content:
-                logger.info("Splitting final response into text and UI parts.")
-                text_content, json_string = content.split("---a2ui_JSON---", 1)
-
-                if text_content.strip():
-                    final_parts.append(Part(root=TextPart(text=text_content.strip())))
-
-                if json_string.strip():
-                    try:
-                        json_string_cleaned = (
-                            json_string.strip().lstrip("```json").rstrip("```").strip()
-                        )
-                        # The new protocol sends a stream of JSON objects.
-                        # For this example, we'll assume they are sent as a list in the final response.
-                        json_data = json.loads(json_string_cleaned)
-
-                        if isinstance(json_data, list):
-                            logger.info(
-                                f"Found {len(json_data)} messages. Creating individual DataParts."
-                            )
-                            for message in json_data:
-                                final_parts.append(create_a2ui_part(message))
-                        else:
-                            # Handle the case where a single JSON object is returned
-                            logger.info(
-                                "Received a single JSON object. Creating a DataPart."
-                            )
-                            final_parts.append(create_a2ui_part(json_data))
-
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse UI JSON: {e}")
-                        final_parts.append(Part(root=TextPart(text=json_string)))
-            else:
-                final_parts.append(Part(root=TextPart(text=content.strip())))
-
-            logger.info("--- FINAL PARTS TO BE SENT ---")
-            for i, part in enumerate(final_parts):
-                logger.info(f"  - Part {i}: Type = {type(part.root)}")
-                if isinstance(part.root, TextPart):
-                    logger.info(f"    - Text: {part.root.text[:200]}...")
-                elif isinstance(part.root, DataPart):
-                    logger.info(f"    - Data: {str(part.root.data)[:200]}...")
-            logger.info("-----------------------------")
+            final_parts = A2uiResponseAssembler(
+                transforms=self._get_transforms(task.context_id),
+                mime_type=a2ui_mime_type,
+            ).finish(item["content"])
 
             await updater.update_status(
                 final_state,
@@ -191,6 +199,18 @@ class RestaurantAgentExecutor(AgentExecutor):
             )
             break
 
+    def _get_transforms(self, context_id: str) -> list[A2uiTransformFn]:
+        transforms = []
+        if self._surface_state:
+            transforms.append(
+                functools.partial(self._surface_state.minimize_messages, context_id)
+            )
+        if self._data_model_delta:
+            transforms.append(
+                functools.partial(self._data_model_delta.diff_messages, context_id)
+            )
+        return transforms
+
     async def cancel(
         self, request: RequestContext, event_queue: EventQueue
     ) -> Task | None:
@@ -0,0 +1,190 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# The base URL the image URLs in the data file are written with.
+DEFAULT_BASE_URL = "http://localhost:10002"
+
+# Location spellings that refer to the same place.
+_LOCATION_ALIASES = {
+    "ny": "new york",
+    "nyc": "new york",
+    "new york city": "new york",
+    "manhattan": "new york",
+}
+# The longest location key, in words, that a query is matched against.
+_MAX_LOCATION_WORDS = 4
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+_ZIP_CODE_RE = re.compile(r"\b\d{5}(?:-\d{4})?\b")
+
+
+def normalize_location(location: str) -> set[str]:
+    """Returns the index keys for a location, e.g. "New York, NY" -> {"new york"}."""
+    keys = set()
+    for part in _ZIP_CODE_RE.sub("", location.lower()).split(","):
+        key = _NON_WORD_RE.sub(" ", part).strip()
+        if key:
+            keys.add(_LOCATION_ALIASES.get(key, key))
+    return keys
+
+
+def location_query_keys(location: str) -> set[str]:
+    """Returns the keys a location query can match: every run of up to
+    `_MAX_LOCATION_WORDS` words within each comma-separated part, so
+    "Chinatown NY" matches "ny" and "Midtown, New York" matches "new york".
+    """
+    keys = set()
+    for part in _ZIP_CODE_RE.sub("", location.lower()).split(","):
+        words = _NON_WORD_RE.sub(" ", part).split()
+        for start in range(len(words)):
+            for end in range(start + 1, min(start + _MAX_LOCATION_WORDS, len(words)) + 1):
+                key = " ".join(words[start:end])
+                keys.add(_LOCATION_ALIASES.get(key, key))
+    return keys
+
+
+def _normalize_cuisine(cuisine: str) -> str:
+    return _NON_WORD_RE.sub(" ", cuisine.lower()).strip()
+
+
+class RestaurantCatalog:
+    """An in-memory, indexed view of `restaurant_data.json`.
+
+    The file is loaded once and indexed by cuisine and by the locations in
+    each address (city and state), so queries only touch the matching entries.
+    A location query matches if any of its words or phrases is one of those
+    locations, e.g. "Chinatown NY".
+    Entries without a `cuisine` match every cuisine. Results keep the file's
+    order. The file is reloaded when its modification time changes.
+
+    Image URLs are rewritten for the agent's base URL once per base URL, and
+    the serialized entries are cached with them, so a query only joins
+    precomputed JSON strings.
+
+    Instances are thread safe.
+    """
+
+    def __init__(self, file_path: str):
+        self._file_path = file_path
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._entries: list[dict[str, Any]] = []
+        self._by_cuisine: dict[str, set[int]] = {}
+        self._any_cuisine: set[int] = set()
+        self._by_location: dict[str, set[int]] = {}
+        # Serialized entries by base URL.
+        self._serialized: dict[str, list[str]] = {}
+        self._reload_if_changed()
+
+    def __len__(self) -> int:
+        self._reload_if_changed()
+        return len(self._entries)
+
+    def find(
+        self,
+        cuisine: str,
+        location: str,
+        count: int = 5,
+        base_url: Optional[str] = None,
+    ) -> list[dict[str, Any]]:
+        """Returns the first `count` restaurants matching the cuisine and location."""
+        return [json.loads(item) for item in self._find(cuisine, location, count, base_url)]
+
+    def find_json(
+        self,
+        cuisine: str,
+        location: str,
+        count: int = 5,
+        base_url: Optional[str] = None,
+    ) -> str:
+        """Like `find`, but returns the restaurants as a JSON list."""
+        return "[" + ", ".join(self._find(cuisine, location, count, base_url)) + "]"
+
+    def _find(
+        self, cuisine: str, location: str, count: int, base_url: Optional[str]
+    ) -> list[str]:
+        self._reload_if_changed()
+        with self._lock:
+            matches: set[int] = set()
+            for key in location_query_keys(location):
+                matches |= self._by_location.get(key, set())
+            if cuisine and matches:
+                matches &= self._by_cuisine.get(
+                    _normalize_cuisine(cuisine), set()
+                ) | self._any_cuisine
+            indices = heapq.nsmallest(max(count, 0), matches)
+            serialized = self._get_serialized(base_url or DEFAULT_BASE_URL)
+            return [serialized[index] for index in indices]
+
+    def _get_serialized(self, base_url: str) -> list[str]:
+        serialized = self._serialized.get(base_url)
+        if serialized is None:
+            serialized = [
+                json.dumps(entry).replace(DEFAULT_BASE_URL, base_url)
+                for entry in self._entries
+            ]
+            self._serialized[base_url] = serialized
+            logger.info(f"Resolved restaurant image URLs for base URL: {base_url}")
+        return serialized
+
+    def _reload_if_changed(self) -> None:
+        try:
+            mtime = os.stat(self._file_path).st_mtime
+        except FileNotFoundError:
+            logger.error(f"  - Error: restaurant_data.json not found at {self._file_path}")
+            return
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            try:
+                with open(self._file_path) as f:
+                    entries = json.load(f)
+            except json.JSONDecodeError:
+                logger.error(f"  - Error: Failed to decode JSON from {self._file_path}")
+                return
+            self._index(entries)
+            self._mtime = mtime
+        logger.info(f"Loaded {len(entries)} restaurants from {self._file_path}")
+
+    def _index(self, entries: list[dict[str, Any]]) -> None:
+        by_cuisine: dict[str, set[int]] = {}
+        any_cuisine: set[int] = set()
+        by_location: dict[str, set[int]] = {}
+        for index, entry in enumerate(entries):
+            if cuisine := entry.get("cuisine"):
+                by_cuisine.setdefault(_normalize_cuisine(cuisine), set()).add(index)
+            else:
+                any_cuisine.add(index)
+            # The street is the first part of the address; the rest are places.
+            _, _, places = entry.get("address", "").partition(",")
+            for key in normalize_location(places):
+                by_location.setdefault(key, set()).add(index)
+
+        self._entries = entries
+        self._by_cuisine = by_cuisine
+        self._any_cuisine = any_cuisine
+        self._by_location = by_location
+        self._serialized = {}
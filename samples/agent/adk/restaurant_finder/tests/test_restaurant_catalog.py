@@ -0,0 +1,43 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import pytest
+
+from restaurant_catalog import RestaurantCatalog
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "restaurant_data.json")
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return RestaurantCatalog(DATA_FILE)
+
+
+@pytest.mark.parametrize(
+    "location",
+    ["New York", "New York, NY", "NYC", "Chinatown NY", "Midtown NYC", "Manhattan NY"],
+)
+def test_new_york_locations_match(catalog, location):
+    assert len(catalog.find("Chinese", location, count=100)) == len(catalog)
+
+
+@pytest.mark.parametrize("location", ["New Jersey", "San Francisco, CA", "10013"])
+def test_other_locations_do_not_match(catalog, location):
+    assert catalog.find("Chinese", location) == []
+
+
+def test_count_limits_results(catalog):
+    assert len(catalog.find("Chinese", "NYC", count=2)) == 2
@@ -12,14 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
 import logging
 import os
 
 from google.adk.tools.tool_context import ToolContext
+from restaurant_catalog import RestaurantCatalog
 
 logger = logging.getLogger(__name__)
 
+# Loaded once at startup; reloaded when the file changes.
+_catalog = RestaurantCatalog(
+    os.path.join(os.path.dirname(__file__), "restaurant_data.json")
+)
+
 
 def get_restaurants(cuisine: str, location: str,  tool_context: ToolContext, count: int = 5) -> str:
     """Call this tool to get a list of restaurants based on a cuisine and location.
@@ -29,27 +34,7 @@ def get_restaurants(cuisine: str, location: str,  tool_context: ToolContext, cou
     logger.info(f"  - Cuisine: {cuisine}")
     logger.info(f"  - Location: {location}")
 
-    items = []
-    if "new york" in location.lower() or "ny" in location.lower():
-        try:
-            script_dir = os.path.dirname(__file__)
-            file_path = os.path.join(script_dir, "restaurant_data.json")
-            with open(file_path) as f:
-                restaurant_data_str = f.read()
-                if base_url := tool_context.state.get("base_url"):                    
-                    restaurant_data_str = restaurant_data_str.replace("http://localhost:10002", base_url)
-                    logger.info(f'Updated base URL from tool context: {base_url}')
-                all_items = json.loads(restaurant_data_str)        
-
-            # Slice the list to return only the requested number of items
-            items = all_items[:count]
-            logger.info(
-                f"  - Success: Found {len(all_items)} restaurants, returning {len(items)}."
-            )
-
-        except FileNotFoundError:
-            logger.error(f"  - Error: restaurant_data.json not found at {file_path}")
-        except json.JSONDecodeError:
-            logger.error(f"  - Error: Failed to decode JSON from {file_path}")
-
-    return json.dumps(items)
+    base_url = tool_context.state.get("base_url")
+    items = _catalog.find_json(cuisine, location, count=count, base_url=base_url)
+    logger.info(f"  - Success: Searched {len(_catalog)} restaurants.")
+    return items
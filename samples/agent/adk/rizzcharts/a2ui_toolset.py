@@ -13,7 +13,6 @@
 # limitations under the License.
 
 import json
-import jsonschema
 import logging
 from typing import Any, List, Optional
 
@@ -24,7 +23,9 @@ from google.adk.tools.base_tool import BaseTool
 from google.adk.tools import base_toolset
 from google.adk.tools.tool_context import ToolContext
 from google.adk.agents.readonly_context import ReadonlyContext
-from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2UI_SCHEMA_STATE_KEY
+from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2UI_CATALOG_URI_STATE_KEY, A2UI_SCHEMA_STATE_KEY
+from a2ui.integrity import check_integrity
+from a2ui.validator import get_validator
 
 logger = logging.getLogger(__name__)
 
@@ -77,10 +78,14 @@ class SendA2uiJsonToClientTool(BaseTool):
             ),
         )
 
-    def get_a2ui_schema(self, tool_context: ToolContext) -> dict[str, Any]:
+    def get_a2ui_message_schema(self, tool_context: ToolContext) -> dict[str, Any]:
         a2ui_schema = tool_context.state.get(A2UI_SCHEMA_STATE_KEY)
         if not a2ui_schema:
             raise ValueError("A2UI schema is empty")
+        return a2ui_schema
+
+    def get_a2ui_schema(self, tool_context: ToolContext) -> dict[str, Any]:
+        a2ui_schema = self.get_a2ui_message_schema(tool_context)
         a2ui_schema_object = {"type": "array", "items": a2ui_schema} # Make a list since we support multiple parts in this tool call
         return a2ui_schema_object 
 
@@ -116,10 +121,13 @@ class SendA2uiJsonToClientTool(BaseTool):
                 )
 
             a2ui_json_payload = json.loads(a2ui_json)
-            a2ui_schema = self.get_a2ui_schema(tool_context)
-            jsonschema.validate(
-                instance=a2ui_json_payload, schema=a2ui_schema
+            a2ui_validator = get_validator(
+                self.get_a2ui_message_schema(tool_context),
+                catalog_id=tool_context.state.get(A2UI_CATALOG_URI_STATE_KEY),
+                as_array=True,
             )
+            a2ui_validator.validate(a2ui_json_payload)
+            check_integrity(a2ui_json_payload)
 
             logger.info(
                 f"Validated call to tool {self.TOOL_NAME} with {self.A2UI_JSON_ARG_NAME}"
@@ -17,7 +17,6 @@ import logging
 import os
 from pathlib import Path
 from typing import Any
-import jsonschema
 
 from google.adk.models.lite_llm import LiteLlm
 from google.adk.agents.llm_agent import LlmAgent
@@ -28,6 +27,8 @@ from tools import get_store_sales, get_sales_data
 from a2ui_toolset import A2uiToolset
 from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2UI_CATALOG_URI_STATE_KEY, A2UI_SCHEMA_STATE_KEY
 from a2ui.a2ui_extension import STANDARD_CATALOG_ID
+from a2ui.validator import A2uiValidator, get_validator
+from a2ui.integrity import check_integrity
 
 logger = logging.getLogger(__name__)
 
@@ -39,20 +40,24 @@ class rizzchartsAgent:
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
     
     @classmethod
-    def get_a2ui_schema(cls, readonly_context: ReadonlyContext) -> dict[str, Any]:
+    def get_a2ui_validator(cls, readonly_context: ReadonlyContext) -> A2uiValidator:
         a2ui_schema = readonly_context.state.get(A2UI_SCHEMA_STATE_KEY)
         if not a2ui_schema:
             raise ValueError("A2UI schema is empty")
-        a2ui_schema_object = {"type": "array", "items": a2ui_schema} # Make a list since we support multiple parts in this tool call
-        return a2ui_schema_object 
+        # Validate as a list since we support multiple parts in this tool call
+        return get_validator(
+            a2ui_schema,
+            catalog_id=readonly_context.state.get(A2UI_CATALOG_URI_STATE_KEY),
+            as_array=True,
+        )
 
     @classmethod
-    def load_example(cls, path: str, a2ui_schema: dict[str, Any]) -> dict[str, Any]:
+    def load_example(cls, path: str, a2ui_validator: A2uiValidator) -> dict[str, Any]:
         example_str = Path(path).read_text()
         example_json = json.loads(example_str)
-        jsonschema.validate(
-            instance=example_json, schema=a2ui_schema
-        )
+        a2ui_validator.validate(example_json)
+        # The toolset rejects output that fails this check, so examples must pass it too
+        check_integrity(example_json)
         return example_json
 
     @classmethod
@@ -61,14 +66,14 @@ class rizzchartsAgent:
         if not use_ui:
             raise ValueError("A2UI must be enabled to run rizzcharts agent")
 
-        a2ui_schema = cls.get_a2ui_schema(readonly_context)
+        a2ui_validator = cls.get_a2ui_validator(readonly_context)
         catalog_uri = readonly_context.state.get(A2UI_CATALOG_URI_STATE_KEY)
         if catalog_uri == RIZZCHARTS_CATALOG_URI:
-            map_example = cls.load_example("examples/rizzcharts_catalog/map.json", a2ui_schema)
-            chart_example = cls.load_example("examples/rizzcharts_catalog/chart.json", a2ui_schema)
+            map_example = cls.load_example("examples/rizzcharts_catalog/map.json", a2ui_validator)
+            chart_example = cls.load_example("examples/rizzcharts_catalog/chart.json", a2ui_validator)
         elif catalog_uri == STANDARD_CATALOG_ID:
-            map_example = cls.load_example("examples/standard_catalog/map.json", a2ui_schema)
-            chart_example = cls.load_example("examples/standard_catalog/chart.json", a2ui_schema)
+            map_example = cls.load_example("examples/standard_catalog/map.json", a2ui_validator)
+            chart_example = cls.load_example("examples/standard_catalog/chart.json", a2ui_validator)
         else:
             raise ValueError(f"Unsupported catalog uri: {catalog_uri if catalog_uri else 'None'}")
 
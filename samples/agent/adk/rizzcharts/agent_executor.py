@@ -128,7 +128,7 @@ class RizzchartsAgentExecutor(A2aAgentExecutor):
         if use_ui:
             a2ui_schema, catalog_uri = self._component_catalog_builder.load_a2ui_schema(client_ui_capabilities=context.message.metadata.get(A2UI_CLIENT_CAPABILITIES_KEY) if context.message and context.message.metadata else None)
 
-            self._part_converter.set_a2ui_schema(a2ui_schema)
+            self._part_converter.set_a2ui_schema(a2ui_schema, catalog_uri)
         
             await runner.session_service.append_event(
                 session,
@@ -13,15 +13,15 @@
 # limitations under the License.
 
 import json
-import jsonschema
 import logging
-from typing import Any, List
+from typing import Any, List, Optional
 
 from a2a import types as a2a_types
 from google.genai import types as genai_types
 
 from google.adk.a2a.converters import part_converter
 from a2ui.a2ui_extension import create_a2ui_part
+from a2ui.validator import get_validator
 from a2ui_toolset import SendA2uiJsonToClientTool
 
 logger = logging.getLogger(__name__)
@@ -30,9 +30,11 @@ class A2uiPartConverter:
 
   def __init__(self):
       self._a2ui_schema = None
+      self._a2ui_catalog_uri = None
 
-  def set_a2ui_schema(self, a2ui_schema: dict[str, Any]):
-      self._a2ui_schema = a2ui_schema    
+  def set_a2ui_schema(self, a2ui_schema: dict[str, Any], catalog_uri: Optional[str] = None):
+      self._a2ui_schema = a2ui_schema
+      self._a2ui_catalog_uri = catalog_uri
       
   def convert_genai_part_to_a2a_part(self, part: genai_types.Part) -> List[a2a_types.Part]:
       if (function_call := part.function_call) and function_call.name == SendA2uiJsonToClientTool.TOOL_NAME:
@@ -49,11 +51,10 @@ class A2uiPartConverter:
             
             logger.info(f"Converting a2ui json: {a2ui_json}")
 
-            json_data = json.loads(a2ui_json)            
-            a2ui_schema_object = {"type": "array", "items": self._a2ui_schema} # Make a list since we support multiple parts in this tool call
-            jsonschema.validate(
-                  instance=json_data, schema=a2ui_schema_object
-              )          
+            json_data = json.loads(a2ui_json)
+            # Validate as a list since we support multiple parts in this tool call
+            a2ui_validator = get_validator(self._a2ui_schema, catalog_id=self._a2ui_catalog_uri, as_array=True)
+            a2ui_validator.validate(json_data)
 
             final_parts = []
             if isinstance(json_data, list):